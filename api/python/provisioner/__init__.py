@@ -35,6 +35,7 @@ from .api import (  # noqa: F401
     get_result,
     pillar_get,
     pillar_set,
+    pillar_set_bulk,
     get_params,
     set_params,
     set_ntp,
@@ -72,6 +73,7 @@ __all__ = [
     'get_result',
     'pillar_get',
     'pillar_set',
+    'pillar_set_bulk',
     'get_params',
     'set_params',
     'set_ntp',
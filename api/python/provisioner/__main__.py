@@ -28,27 +28,35 @@ import threading
 from datetime import datetime
 from typing import Union, Any
 
-from .vendor import attr
-from . import (
+from .profiling import ImportProfiler
+
+# Note. should be installed before the rest of modules are imported
+import_profiler = ImportProfiler()
+if '--profile-startup' in sys.argv[1:]:
+    import_profiler.install()
+
+from .vendor import attr  # noqa: E402
+from . import (  # noqa: E402
     __version__,
     config,
     auth_init,
     serialize,
-    _api,
     runner,
-    log
+    log,
+    metrics
 )
-from .commands import commands
-from .base import prvsnr_config
+from .base import prvsnr_config  # noqa: E402
 
-from . import cli_parser
+from . import cli_parser  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
 output_type = prvsnr_config.env['PRVSNR_OUTPUT']
 log_args = None
 
-GeneralArgs = attr.make_class("GeneralArgs", ('version',))
+GeneralArgs = attr.make_class(
+    "GeneralArgs", ('version', 'profile_startup')
+)
 AuthArgs = attr.make_class("AuthArgs", ('username', 'password', 'eauth'))
 
 
@@ -73,6 +81,8 @@ def _prepare_output(output_type, res):
         return yaml.dump(res, default_flow_style=False, canonical=False)
     elif output_type == 'json':
         return serialize.dumps(res, sort_keys=True, indent=4)
+    elif output_type == 'msgpack':
+        return serialize.packs(res)
     else:
         logger.error(
             "Unexpected output type {}".format(output_type)
@@ -91,6 +101,7 @@ def output_res(output_type, res):
 def _run_cmd(cmd: Union[str, Any], *args, **kwargs):
     logger.debug("Executing {}..".format(cmd))
     if type(cmd) is str:
+        from . import _api
         return _api.run(cmd, *args, **kwargs)
     else:
         return cmd.run(*args, **kwargs)
@@ -103,6 +114,11 @@ def _generate_logfile_filename(cmd):
     return (config.LOG_ROOT_DIR / f'{cmd}.{ts}.{pid}.{threadid}.log')
 
 
+def _dump_startup_profile():
+    import_profiler.uninstall()
+    sys.stderr.write(import_profiler.report() + '\n')
+
+
 def _set_logging(output_type, log_args=None):
     if log_args is None:
         log_args = log.LogArgs()
@@ -165,6 +181,8 @@ def _main():
     )
 
     if general_args.version:
+        if general_args.profile_startup:
+            _dump_startup_profile()
         return __version__
 
     if parsed_args.cmd is None:
@@ -191,6 +209,7 @@ def _main():
 
     # TODO IMPROVE
     # TODO TEST
+    from .commands import commands
     cmd_obj = commands[parsed_args.cmd]
     _args = list(parsed_args.args)
     args, kwargs = runner.SimpleRunner.extract_positional_args(
@@ -202,6 +221,9 @@ def _main():
     args, kwargs = cmd_obj.input_type.extract_positional_args(kwargs)
     _args[0:0] = args
 
+    if general_args.profile_startup:
+        _dump_startup_profile()
+
     return _run_cmd(parsed_args.cmd, *_args, **kwargs)
 
 
@@ -249,6 +271,10 @@ def main():
                 prepare_res(output_type, ret=ret, exc=exc)
             )
 
+        metrics.registry.dump()
+        # the queued log records (if any) are flushed before the exit
+        log.stop_queue_logging()
+
 
 if __name__ == "__main__":
     main()
@@ -17,6 +17,7 @@
 
 import sys
 import os
+import socket
 import subprocess
 import logging
 from typing import List, Dict, Optional
@@ -24,12 +25,15 @@ from typing import List, Dict, Optional
 import provisioner
 from provisioner import errors
 from provisioner import serialize
+from provisioner.base import prvsnr_config
+from provisioner.daemon import recv_all
 
 logger = logging.getLogger(__name__)
 
 _eauth = 'pam'
 _username = None
 _password = None
+_daemon_socket = prvsnr_config.env['PRVSNR_API_SOCKET']
 
 
 def value_to_str(v):
@@ -113,6 +117,38 @@ def _run_cmd(cmd, env: Optional[Dict] = None, **kwargs):
         return process_cli_result(res.stdout, res.stderr)
 
 
+def _daemon_connect() -> Optional[socket.socket]:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(_daemon_socket))
+    except OSError as exc:
+        # e.g. not running daemon or no access to the socket
+        sock.close()
+        logger.warning(
+            f"API daemon is not available on '{_daemon_socket}': "
+            f"{exc!r}, falling back to CLI"
+        )
+        return None
+    return sock
+
+
+def _daemon_call(sock: socket.socket, fun, *args, **kwargs):
+    request = dict(fun=fun, args=list(args), kwargs=kwargs)
+    if _username and _password:
+        request.update(
+            username=_username, password=_password, eauth=_eauth
+        )
+
+    try:
+        sock.sendall(serialize.dumps(request).encode())
+        sock.shutdown(socket.SHUT_WR)
+        stdout = recv_all(sock).decode()
+    finally:
+        sock.close()
+
+    return process_cli_result(stdout)
+
+
 # TODO test args preparation
 def _api_call(fun, *args, **kwargs):
     # do not expect ad-hoc credentials here
@@ -120,6 +156,13 @@ def _api_call(fun, *args, **kwargs):
     kwargs.pop('username', None)
     kwargs.pop('eauth', None)
 
+    if _daemon_socket and os.path.exists(str(_daemon_socket)):
+        # Note. only connection errors lead to the fallback,
+        #       the request might be already processed otherwise
+        sock = _daemon_connect()
+        if sock is not None:
+            return _daemon_call(sock, fun, *args, **kwargs)
+
     _input = None
     if _username and _password:
         _input = _password
@@ -138,7 +181,7 @@ def _api_call(fun, *args, **kwargs):
 
     return _run_cmd(
         cmd,
-        env={'PRVSNR_OUTPUT': 'json'},
+        env={'PRVSNR_OUTPUT': _cli_output()},
         input=_input,
         check=True,
         universal_newlines=True,
@@ -147,6 +190,16 @@ def _api_call(fun, *args, **kwargs):
     )
 
 
+def _cli_output():
+    # yaml and plain outputs can't be decoded back
+    if (
+        prvsnr_config.env['PRVSNR_OUTPUT'] == 'msgpack'
+        and serialize.msgpack is not None
+    ):
+        return 'msgpack'
+    return 'json'
+
+
 def _api_wrapper(fun):
     def f(*args, **kwargs):
         return _api_call(fun, *args, **kwargs)
@@ -168,6 +221,7 @@ for fun in [
     'get_result',
     'pillar_get',
     'pillar_set',
+    'pillar_set_bulk',
     'get_params',
     'set_params',
     'set_ntp',
@@ -17,6 +17,7 @@
 
 import importlib
 
+from . import metrics
 from .config import ALL_MINIONS, CONTROLLER_BOTH
 
 _api = None
@@ -45,7 +46,10 @@ def set_api(api_type=DEFAULT_API_TYPE):
 def _api_call(fun, *args, **kwargs):
     if _api is None:
         set_api()
-    return getattr(_api, fun)(*args, **kwargs)
+    with metrics.track(
+        metrics.api_calls, metrics.api_call_duration, cmd=fun
+    ):
+        return getattr(_api, fun)(*args, **kwargs)
 
 
 def auth_init(username, password, eauth='pam'):
@@ -65,14 +69,16 @@ def auth_init(username, password, eauth='pam'):
     return _api_call('auth_init', username, password, eauth='pam')
 
 
-def get_result(cmd_id: str):
+def get_result(cmd_id: str, timeout: int = 0):
     r"""Returns result of previously scheduled command
 
     :param cmd_id: Command id
+    :param timeout: (optional) Seconds to wait for the command to finish.
+        Default: 0 (no wait)
     """
 
     return _api_call(
-        'get_result', cmd_id
+        'get_result', cmd_id, timeout=timeout
     )
 
 
@@ -89,6 +95,26 @@ def pillar_set(keypath, value, fpath=None, targets=ALL_MINIONS, nowait=False):
     )
 
 
+def pillar_set_bulk(
+    *items, targets=ALL_MINIONS, dry_run=False, nowait=False
+):
+    r"""Sets multiple pillar values as a single update.
+
+    All the pillar files are dumped once and pillar is refreshed once
+    at the end, on any failure all the changes are rolled back.
+
+    :param items: Dicts ``{keypath: value}`` and / or
+        ``(keypath, value[, fpath])`` tuples (dicts only for pycli api).
+    :param targets: (optional) Host targets. Default: ``ALL_MINIONS``
+    :param dry_run: (optional) Validate only. Default: False
+    :param nowait: (optional) Run asynchronously. Default: False
+    """
+    return _api_call(
+        'pillar_set_bulk', *items,
+        targets=targets, dry_run=dry_run, nowait=nowait
+    )
+
+
 def get_params(*params, targets=ALL_MINIONS, nowait=False):
     return _api_call(
         'get_params', *params, targets=targets, nowait=nowait
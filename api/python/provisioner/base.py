@@ -85,6 +85,7 @@ class _Config(_Singletone):
         self._env = {}
         for env, default_v in (
             ('PRVSNR_OUTPUT', 'PRVSNR_CLI_OUTPUT_DEFAULT'),
+            ('PRVSNR_API_SOCKET', 'PRVSNR_API_SOCKET'),
         ):
             self._env[env] = os.getenv(env, getattr(config, default_v))
 
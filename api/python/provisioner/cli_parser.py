@@ -18,19 +18,26 @@
 #
 
 
+import os
 import sys
+import pickle
+import hashlib
 import argparse
 import logging
+from pathlib import Path
+from typing import Dict, List, Optional
 
 from .vendor import attr
-from . import config, errors, runner, log
+from . import __version__, config, errors, runner, log
 from .base import prvsnr_config
-from .commands import commands
+from .api_spec import api_spec
 
 logger = logging.getLogger(__name__)
 
 ParseRes = attr.make_class("ParseRes", ('cmd', 'args', 'kwargs'))
 
+parser_cache_path = config.PRVSNR_CLI_PARSER_CACHE
+
 
 # TODO TEST EOS-7495
 class ErrorHandlingArgumentParser(argparse.ArgumentParser):
@@ -60,7 +67,103 @@ class ErrorHandlingArgumentParser(argparse.ArgumentParser):
             super().print_help(*args, **kwargs)
 
 
+class _ArgsRecorder:
+    def __init__(self):
+        self.calls = []
+
+    def add_argument(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+
+
+def _parser_spec_key() -> str:
+    # sources of the commands parser arguments
+    pkg_dir = Path(__file__).resolve().parent
+    paths = sorted(
+        list(pkg_dir.glob('*.py')) + list(pkg_dir.glob('*.yaml')) +
+        list((pkg_dir / 'commands').glob('*.py'))
+    )
+    key = hashlib.sha1(f'{__version__}:{pkg_dir}'.encode())
+    for path in paths:
+        key.update(f'{path.name}:{path.stat().st_mtime_ns};'.encode())
+    return key.hexdigest()
+
+
+def _build_parser_spec() -> Dict[str, List]:
+    from .commands import commands
+
+    spec = {}
+    for cmd_name in api_spec:
+        recorder = _ArgsRecorder()
+        cmd = commands[cmd_name]
+        cmd.fill_parser(recorder)
+        cmd.input_type.fill_parser(recorder)
+        spec[cmd_name] = recorder.calls
+    return spec
+
+
+def _load_parser_spec(key: str) -> Optional[Dict[str, List]]:
+    try:
+        path = Path(parser_cache_path)
+        # Note. pickle is trusted only if nobody else can change the file
+        st = path.stat()
+        if st.st_uid != os.getuid() or (st.st_mode & 0o022):
+            logger.warning(f"Ignoring insecure parser cache '{path}'")
+            return None
+        with path.open('rb') as f:
+            data = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        logger.debug(f"Failed to load parser cache: {exc!r}")
+        return None
+
+    return data['spec'] if data.get('key') == key else None
+
+
+def _dump_parser_spec(key: str, spec: Dict[str, List]):
+    path = Path(parser_cache_path)
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}')
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(
+            str(tmp_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+        )
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump({'key': key, 'spec': spec}, f)
+        os.replace(str(tmp_path), str(path))
+    except Exception as exc:
+        logger.debug(f"Failed to dump parser cache: {exc!r}")
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def parser_spec() -> Dict[str, List]:
+    """Returns commands parser arguments as recorded add_argument calls.
+
+    The spec is built once (it requires all the commands to be loaded)
+    and cached on disk till the package sources are changed.
+    """
+    key = _parser_spec_key()
+    spec = _load_parser_spec(key)
+    if spec is None:
+        spec = _build_parser_spec()
+        _dump_parser_spec(key, spec)
+    return spec
+
+
+def _requested_command(args):
+    # Note. it is a heuristic: options values are not expected
+    #       to match commands names
+    for arg in args:
+        if arg in api_spec:
+            return arg
+    return None
+
+
 def parse_args(args=None):
+    if args is None:
+        args = sys.argv[1:]
+
     parser_common = argparse.ArgumentParser(add_help=False)
 
     general_group = parser_common.add_argument_group('general')
@@ -68,6 +171,10 @@ def parse_args(args=None):
         "--version", action='store_true',
         help="show version and quit"
     )
+    general_group.add_argument(
+        "--profile-startup", action='store_true',
+        help="dump modules import time breakdown to stderr"
+    )
 
     auth_group = parser_common.add_argument_group('authentication')
     auth_group.add_argument(
@@ -115,15 +222,26 @@ def parse_args(args=None):
         description='valid subcommands'
     )
 
+    # only the requested command parser is filled,
+    # all of them are needed for the help only
+    cmd_requested = _requested_command(args)
+    help_requested = ('-h' in args or '--help' in args)
+    spec = (
+        parser_spec() if (cmd_requested or help_requested) else {}
+    )
+
     # TODO description and help strings
-    for cmd_name, cmd in commands.items():
+    for cmd_name in api_spec:
         subparser = subparsers.add_parser(
             cmd_name, description='{} configuration'.format(cmd_name),
             help='{} help'.format(cmd_name), parents=[parser_common],
             formatter_class=argparse.ArgumentDefaultsHelpFormatter
         )
-        cmd.fill_parser(subparser)
-        cmd.input_type.fill_parser(subparser)
+        if cmd_name == cmd_requested or (
+            cmd_requested is None and help_requested
+        ):
+            for _args, _kwargs in spec[cmd_name]:
+                subparser.add_argument(*_args, **_kwargs)
 
     kwargs = vars(parser.parse_args(args=args))
     cmd = kwargs.pop('command')
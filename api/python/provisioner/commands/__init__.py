@@ -16,8 +16,10 @@
 #
 
 import sys
+from collections.abc import Mapping
 from typing import List, Dict, Type, Union
 from copy import deepcopy
+import functools
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -47,7 +49,8 @@ from ..config import (
     PRVSNR_CLI_DIR,
     CONTROLLER_BOTH,
     SSL_CERTS_FILE,
-    SEAGATE_USER_HOME_DIR, SEAGATE_USER_FILEROOT_DIR_TMPL
+    SEAGATE_USER_HOME_DIR, SEAGATE_USER_FILEROOT_DIR_TMPL,
+    SW_UPDATE_WORKERS, SW_UPDATE_ROLLBACK_TIMEOUT
 )
 from ..pillar import (
     KeyPath,
@@ -61,6 +64,7 @@ from ..utils import (
     dump_yaml_str,
 )
 from ..api_spec import api_spec
+from ..scheduler import DAGScheduler
 from ..salt import (
     StatesApplier,
     StateFunExecuter,
@@ -142,6 +146,17 @@ class RunArgsGetResult:
             }
         }
     )
+    timeout: int = attr.ib(
+        metadata={
+            inputs.METADATA_ARGPARSER: {
+                'help': "seconds to wait for the command to finish",
+                'type': int,
+                'metavar': 'SECONDS'
+            }
+        },
+        default=0,
+        converter=int
+    )
 
 
 @attr.s(auto_attribs=True)
@@ -284,7 +299,7 @@ class PillarGet(CommandParserFillerMixin):
 
     def run(self, *args, targets: str = ALL_MINIONS, **kwargs):
         pi_keys = self.input_type.from_args(*args, **kwargs)
-        pillar_resolver = PillarResolver(targets=targets)
+        pillar_resolver = PillarResolver(targets=targets, subtrees=True)
 
         if len(pi_keys):
             res_raw = pillar_resolver.get(pi_keys)
@@ -369,7 +384,7 @@ class Get(CommandParserFillerMixin):
     def run(self, *args, targets=ALL_MINIONS, **kwargs):
         # TODO tests
         params = self.input_type.from_args(*args, **kwargs)
-        pillar_resolver = PillarResolver(targets=targets)
+        pillar_resolver = PillarResolver(targets=targets, subtrees=True)
         res_raw = pillar_resolver.get(params)
         res = {}
         for minion_id, data in res_raw.items():
@@ -504,13 +519,39 @@ def _pre_yum_rollback(
             raise ClusterMaintenanceEnableError(exc) from exc
 
 
-def _update_component(component, targets=ALL_MINIONS):
+# SW stack components updated after the provisioner itself
+sw_update_components = [
+    'motr',
+    's3server',
+    'hare',
+    'ha.cortx-ha',
+    'sspl',
+    'csm',
+    'uds'
+]
+
+
+# ordering relations between the components updates,
+# components not listed here are updated independently
+sw_update_components_requires = {
+    's3server': ['motr'],
+    'hare': ['motr', 's3server'],
+    'ha.cortx-ha': ['hare']
+}
+
+
+def _update_component(component, targets=ALL_MINIONS, concurrent=False):
     state_name = "components.{}.update".format(component)
+    kwargs = {}
+    # salt refuses to run states on a minion in parallel
+    # unless it is explicitly allowed
+    if concurrent:
+        kwargs['fun_kwargs'] = dict(concurrent=True)
     try:
         logger.info(
             "Updating {} on {}".format(component, targets)
         )
-        StatesApplier.apply([state_name], targets)
+        StatesApplier.apply([state_name], targets, **kwargs)
     except Exception:
         logger.exception(
             "Failed to update {} on {}".format(component, targets)
@@ -518,6 +559,37 @@ def _update_component(component, targets=ALL_MINIONS):
         raise
 
 
+def _update_components(
+    components: List[str],
+    targets=ALL_MINIONS,
+    workers: int = SW_UPDATE_WORKERS
+):
+    # Note. the first failure stops scheduling of the rest of updates,
+    #       already started ones are waited for
+    scheduler = DAGScheduler(max_workers=workers)
+    for component in components:
+        scheduler.add(
+            component,
+            functools.partial(
+                _update_component, component, targets,
+                concurrent=(workers > 1)
+            ),
+            requires=[
+                _component for _component
+                in sw_update_components_requires.get(component, [])
+                if _component in components
+            ]
+        )
+
+    logger.info(
+        "Updating components {} on {} using {} workers"
+        .format(components, targets, workers)
+    )
+    report = scheduler.run()
+    logger.info("Components update timings:\n{}".format(report))
+    return report
+
+
 def _apply_provisioner_config(targets=ALL_MINIONS):
     logger.info(f"Applying Provisioner config logic on {targets}")
     StatesApplier.apply(["components.provisioner.config"], targets)
@@ -548,7 +620,8 @@ class SWUpdate(CommandParserFillerMixin):
             with YumRollbackManager(
                 targets,
                 multiple_targets_ok=True,
-                pre_rollback_cb=_pre_yum_rollback
+                pre_rollback_cb=_pre_yum_rollback,
+                rollback_timeout=SW_UPDATE_ROLLBACK_TIMEOUT
             ) as rollback_ctx:
                 # enable "smart maintenance" mode
                 try:
@@ -564,16 +637,7 @@ class SWUpdate(CommandParserFillerMixin):
 
                     config_salt_minions()
 
-                    for component in (
-                        'motr',
-                        's3server',
-                        'hare',
-                        'ha.cortx-ha',
-                        'sspl',
-                        'csm',
-                        'uds'
-                    ):
-                        _update_component(component, targets)
+                    _update_components(sw_update_components, targets)
                 except Exception as exc:
                     raise SWStackUpdateError(exc) from exc
 
@@ -736,8 +800,8 @@ class GetResult(CommandParserFillerMixin):
     input_type: Type[inputs.NoParams] = inputs.NoParams
     _run_args_type = RunArgsGetResult
 
-    def run(self, cmd_id: str):
-        return SaltJobsRunner.prvsnr_job_result(cmd_id)
+    def run(self, cmd_id: str, timeout: int = 0):
+        return SaltJobsRunner.prvsnr_job_result(cmd_id, timeout=timeout)
 
 
 # TODO TEST
@@ -1228,19 +1292,49 @@ class CreateUser(CommandParserFillerMixin):
         _passwordless_ssh()
 
 
-commands = {}
-for cmd_name, spec in api_spec.items():
-    spec = deepcopy(api_spec[cmd_name])  # TODO
-    cmd_cls = spec.pop('type')
-    try:
-        command = getattr(_mod, cmd_cls)
-    except AttributeError:
+class Commands(Mapping):
+    """Registry of API commands built from the api spec.
+
+    A command (along with its module) is loaded on the first access
+    only, so CLI doesn't pay for the commands it won't run.
+    """
+
+    def __init__(self, spec: Dict):
+        self._spec = spec
+        self._commands = {}
+
+    def _load(self, cmd_name: str):
+        spec = deepcopy(self._spec[cmd_name])  # TODO
+        cmd_cls = spec.pop('type')
+        # used by the jobs registry only
+        spec.pop('secrets', None)
         try:
-            cmd_mod = importlib.import_module(
-                f'provisioner.commands.{cmd_name}'
-            )
-        except Exception:
-            logger.error(f"Failed to import provisioner.commands.{cmd_name}")
-            raise
-        command = getattr(cmd_mod, cmd_cls)
-    commands[cmd_name] = command.from_spec(**spec)
+            command = getattr(_mod, cmd_cls)
+        except AttributeError:
+            try:
+                cmd_mod = importlib.import_module(
+                    f'provisioner.commands.{cmd_name}'
+                )
+            except Exception:
+                logger.error(
+                    f"Failed to import provisioner.commands.{cmd_name}"
+                )
+                raise
+            command = getattr(cmd_mod, cmd_cls)
+        return command.from_spec(**spec)
+
+    def __getitem__(self, cmd_name: str):
+        if cmd_name not in self._commands:
+            if cmd_name not in self._spec:
+                raise KeyError(cmd_name)
+            self._commands[cmd_name] = self._load(cmd_name)
+        return self._commands[cmd_name]
+
+    def __iter__(self):
+        return iter(self._spec)
+
+    def __len__(self):
+        return len(self._spec)
+
+
+commands = Commands(api_spec)
@@ -29,11 +29,10 @@ from ..inputs import (
 from .. import inputs
 from ..vendor import attr
 
-from ..utils import run_subprocess_cmd
-
 from ..values import UNCHANGED
 from . import (
-    CommandParserFillerMixin
+    CommandParserFillerMixin,
+    PillarSet
 )
 
 
@@ -249,6 +248,7 @@ class ConfigureSetup(CommandParserFillerMixin):
         input_type = None
         pillar_type = None
         node_list = []
+        pillar_items = {}
         count = int(number_of_nodes)
 
         for section in content:
@@ -265,40 +265,33 @@ class ConfigureSetup(CommandParserFillerMixin):
 
             for pillar_key in content[section]:
                 key = f'{pillar_type}/{self._parse_pillar_key(pillar_key)}'
-                run_subprocess_cmd([
-                       "provisioner", "pillar_set",
-                       key, f"{content[section][pillar_key]}"])
+                pillar_items[key] = content[section][pillar_key]
+
+        if count > 0:
+            raise ValueError(f"Node information for {count} node missing")
 
         # Update cluster/node_list
-        run_subprocess_cmd([
-            "provisioner", "pillar_set",
-            "cluster/node_list", f"[{','.join(node_list)}]"])
+        pillar_items['cluster/node_list'] = f"[{','.join(node_list)}]"
 
         if content.get('cluster', None):
             if content.get('cluster').get('cluster_ip', None):
-                run_subprocess_cmd([
-                       "provisioner", "pillar_set",
-                       "s3clients/ip",
-                       f"{content.get('cluster').get('cluster_ip')}"])
+                pillar_items['s3clients/ip'] = (
+                    content.get('cluster').get('cluster_ip')
+                )
 
         if 3 == int(number_of_nodes):
-            run_subprocess_cmd([
-                "provisioner", "pillar_set",
-                "cluster/type", "\"3_node\""])
+            pillar_items['cluster/type'] = "\"3_node\""
         elif 2 == int(number_of_nodes):
-            run_subprocess_cmd([
-                "provisioner", "pillar_set",
-                "cluster/type", "\"dual\""])
+            pillar_items['cluster/type'] = "\"dual\""
         elif 1 == int(number_of_nodes):
-            run_subprocess_cmd([
-                "provisioner", "pillar_set",
-                "cluster/type", "\"single\""])
+            pillar_items['cluster/type'] = "\"single\""
         else:
-            run_subprocess_cmd([
-                "provisioner", "pillar_set",
-                "cluster/type", "\"generic\""])
+            pillar_items['cluster/type'] = "\"generic\""
 
-        if count > 0:
-            raise ValueError(f"Node information for {count} node missing")
+        # all the values are set in a single pillar update
+        # (the same values format as for 'provisioner pillar_set')
+        PillarSet(input_type=inputs.PillarItemsList).run(*[
+            f"{key}={value}" for key, value in pillar_items.items()
+        ])
 
         logger.info("Pillar data updated Successfully.")
@@ -17,6 +17,7 @@
 
 from typing import Type, Dict, List, Optional
 import logging
+import functools
 
 from .. import (
     config,
@@ -30,6 +31,8 @@ from ..salt import (
     local_minion_id,
     sls_exists
 )
+from ..pillar import pillar_cache
+from ..scheduler import DAGScheduler
 from ..vendor import attr
 # TODO IMPROVE EOS-8473
 
@@ -106,6 +109,75 @@ deploy_states = dict(
 )
 
 
+# ordering relations between the states of the same group,
+# additionally a state requires all the states of the previous groups
+deploy_states_requires = {
+    # system
+    "system.storage.multipath": ["system"],
+    "system.storage": ["system.storage.multipath"],
+    "system.network": ["system.storage"],
+    "system.network.data.public": ["system.network"],
+    "system.network.data.direct": ["system.network.data.public"],
+    "misc_pkgs.rsyslog": ["system.network.data.direct"],
+    "system.firewall": ["system.network.data.direct"],
+    "system.logrotate": ["misc_pkgs.rsyslog"],
+    "system.chrony": ["system.network.data.direct"],
+    # prereq
+    "ha.haproxy": ["misc_pkgs.ssl_certs"],
+    "misc_pkgs.kibana": ["misc_pkgs.elasticsearch"],
+    # iopath
+    "motr": ["misc_pkgs.lustre"],
+    "s3server": ["motr"],
+    # ha
+    "hare": ["ha.corosync-pacemaker"],
+    "ha.cortx-ha": ["hare"],
+    "ha.iostack-ha": ["ha.cortx-ha"],
+    # controlpath
+    "csm": ["sspl"],
+    "uds": ["csm"],
+    "ha.ctrlstack-ha": ["uds"],
+    "ha.cortx-ha.ha": ["ha.ctrlstack-ha"],
+    # backup
+    "s3server.backup": ["provisioner.backup"],
+    "hare.backup": ["provisioner.backup"],
+    "ha.iostack-ha.backup": ["provisioner.backup"],
+    "sspl.backup": ["provisioner.backup"],
+    "csm.backup": ["provisioner.backup"]
+}
+
+
+# FIXME EOS-12076 the following targeting rules are only
+#       for legacy dual node setup
+
+TARGETS_ALL = 'all'
+TARGETS_PRIMARY = 'primary'
+TARGETS_PRIMARY_FIRST = 'primary_first'
+TARGETS_SECONDARIES_FIRST = 'secondaries_first'
+
+deploy_states_targets = {
+    "system.storage": TARGETS_SECONDARIES_FIRST,
+    "sspl": TARGETS_SECONDARIES_FIRST,
+    "csm": TARGETS_SECONDARIES_FIRST,
+    "provisioner.backup": TARGETS_SECONDARIES_FIRST,
+    "sync.software.rabbitmq": TARGETS_PRIMARY_FIRST,
+    "sync.software.openldap": TARGETS_PRIMARY_FIRST,
+    "system.storage.multipath": TARGETS_PRIMARY_FIRST,
+    "sync.files": TARGETS_PRIMARY_FIRST
+}
+
+# states that are applied as a sequence of their sub-states
+deploy_states_steps = {
+    "ha.corosync-pacemaker": [
+        ("install", TARGETS_ALL),
+        ("config.base", TARGETS_ALL),
+        ("config.authorize", TARGETS_PRIMARY),
+        ("config.setup_cluster", TARGETS_PRIMARY),
+        ("config.cluster_ip", TARGETS_PRIMARY),
+        ("config.stonith", TARGETS_PRIMARY)
+    ]
+}
+
+
 def build_deploy_run_args(deploy_states: Dict):
     # TODO TEST EOS-12076
     @attr.s(auto_attribs=True)
@@ -157,11 +229,30 @@ def build_deploy_run_args(deploy_states: Dict):
 run_args_type = build_deploy_run_args(deploy_states)
 
 
+@attr.s(auto_attribs=True)
+class RunArgsDeploy(run_args_type):
+    workers: int = attr.ib(
+        metadata={
+            inputs.METADATA_ARGPARSER: {
+                'help': (
+                    "max number of independent states to apply "
+                    "concurrently, 1 means sequential deploy"
+                ),
+                'metavar': 'NUMBER',
+                'type': int
+            }
+        },
+        default=1,
+        converter=int
+    )
+
+
 @attr.s(auto_attribs=True)
 class Deploy(CommandParserFillerMixin):
     input_type: Type[inputs.NoParams] = inputs.NoParams
-    _run_args_type = run_args_type
+    _run_args_type = RunArgsDeploy
     setup_ctx: Optional[SetupCtx] = None
+    _concurrent: bool = attr.ib(init=False, default=False)
 
     def _primary_id(self):
         if self.setup_ctx:
@@ -231,15 +322,22 @@ class Deploy(CommandParserFillerMixin):
     ):
         if stages is None:
             logger.info(f"Applying '{state}' on {targets}")
+            # salt refuses to run states on a minion in parallel
+            # unless it is explicitly allowed
             if self.setup_ctx:
+                concurrent = ' concurrent=True' if self._concurrent else ''
                 return self.setup_ctx.ssh_client.cmd_run(
                     (
-                        f"salt -C '{targets}' state.apply {state} --out=json"
+                        f"salt -C '{targets}' state.apply {state}"
+                        f"{concurrent} --out=json"
                     ), targets=self._primary_id()
                 )
             else:
+                kwargs = {}
+                if self._concurrent:
+                    kwargs['fun_kwargs'] = dict(concurrent=True)
                 return StatesApplier.apply(
-                    [state], targets, tgt_type='compound'
+                    [state], targets, tgt_type='compound', **kwargs
                 )
         else:
             for stage in stages:
@@ -249,6 +347,60 @@ class Deploy(CommandParserFillerMixin):
                 else:
                     logger.warning(f"State {_state} is missed, ignored")
 
+    def _apply_states(
+        self, states: List, targets=config.ALL_MINIONS,
+        stages: Optional[List] = None
+    ):
+        if not states:
+            return
+
+        if stages is not None or len(states) == 1:
+            for state in states:
+                self._apply_state(state, targets, stages)
+            return
+
+        # one salt job for the whole list: the pillar is rendered
+        # and the job is published only once
+        logger.info(f"Applying {states} on {targets}")
+        if self.setup_ctx:
+            return self.setup_ctx.ssh_client.cmd_run(
+                (
+                    f"salt -C '{targets}' state.apply {','.join(states)} "
+                    "failhard=True --out=json"
+                ), targets=self._primary_id()
+            )
+        else:
+            return StatesApplier.apply(
+                states, targets, tgt_type='compound', batch=True
+            )
+
+    def _deploy_state(self, state: str, run_args: run_args_type):
+        targets = run_args.targets
+        stages = run_args.stages
+
+        if run_args.setup_type == SetupType.SINGLE:
+            self._apply_state(f"components.{state}", targets, stages)
+            return
+
+        primary = self._primary_id()
+        secondaries = f"not {primary}"
+
+        if state in deploy_states_steps:
+            for _state, _targets in deploy_states_steps[state]:
+                self._apply_state(
+                    f"components.{state}.{_state}",
+                    primary if _targets == TARGETS_PRIMARY else targets,
+                    stages
+                )
+        elif deploy_states_targets.get(state) == TARGETS_SECONDARIES_FIRST:
+            self._apply_state(f"components.{state}", secondaries, stages)
+            self._apply_state(f"components.{state}", primary, stages)
+        elif deploy_states_targets.get(state) == TARGETS_PRIMARY_FIRST:
+            self._apply_state(f"components.{state}", primary, stages)
+            self._apply_state(f"components.{state}", secondaries, stages)
+        else:
+            self._apply_state(f"components.{state}", targets, stages)
+
     def _run_states(self, states_group: str, run_args: run_args_type):
         # FIXME VERIFY EOS-12076 Mindfulness breaks in legacy version
         setup_type = run_args.setup_type
@@ -256,58 +408,59 @@ class Deploy(CommandParserFillerMixin):
         states = deploy_states[states_group]
         stages = run_args.stages
 
-        primary = self._primary_id()
-        secondaries = f"not {primary}"
-
         # apply states
         if setup_type == SetupType.SINGLE:
             # TODO use salt orchestration
-            for state in states:
-                self._apply_state(f"components.{state}", targets, stages)
+            self._apply_states(
+                [f"components.{state}" for state in states], targets, stages
+            )
         else:
-            # FIXME EOS-12076 the following logic is only
-            #       for legacy dual node setup
+            # states without special targeting rules are applied
+            # in batches between the special ones
+            batch = []
             for state in states:
-                if state == "ha.corosync-pacemaker":
-                    for _state, target in (
-                        ("install", targets),
-                        ("config.base", targets),
-                        ("config.authorize", primary),
-                        ("config.setup_cluster", primary),
-                        ("config.cluster_ip", primary),
-                        ("config.stonith", primary)
-                    ):
-                        self._apply_state(
-                            f"components.ha.corosync-pacemaker.{_state}",
-                            target,
-                            stages
-                        )
-
-                elif state in (
-                    "system.storage",
-                    "sspl",
-                    "csm",
-                    "provisioner.backup"
-                ):
-                    # Execute first on secondaries then on primary.
-                    self._apply_state(
-                        f"components.{state}", secondaries, stages
-                    )
-                    self._apply_state(f"components.{state}", primary, stages)
-
-                elif state in (
-                    "sync.software.rabbitmq",
-                    "sync.software.openldap",
-                    "system.storage.multipath",
-                    "sync.files"
+                if (
+                    state in deploy_states_steps or
+                    state in deploy_states_targets
                 ):
-                    # Execute first on primary then on secondaries.
-                    self._apply_state(f"components.{state}", primary, stages)
-                    self._apply_state(
-                        f"components.{state}", secondaries, stages
-                    )
+                    self._apply_states(batch, targets, stages)
+                    batch.clear()
+                    self._deploy_state(state, run_args)
                 else:
-                    self._apply_state(f"components.{state}", targets, stages)
+                    batch.append(f"components.{state}")
+
+            self._apply_states(batch, targets, stages)
+
+    def _run_states_dag(self, states_groups: List[str], run_args):
+        scheduler = DAGScheduler(max_workers=run_args.workers)
+
+        prev_states = []
+        for states_group in states_groups:
+            states = deploy_states[states_group]
+            for state in states:
+                requires = [
+                    _state for _state in deploy_states_requires.get(state, [])
+                    if _state in states
+                ]
+                scheduler.add(
+                    state,
+                    functools.partial(self._deploy_state, state, run_args),
+                    requires=(requires + prev_states)
+                )
+            prev_states = list(states)
+
+        logger.info(
+            f"Deploying {states_groups} states using "
+            f"{run_args.workers} workers"
+        )
+        self._concurrent = True
+        try:
+            report = scheduler.run()
+        finally:
+            self._concurrent = False
+
+        logger.info(f"Deploy states timings:\n{report}")
+        return report
 
     def _update_salt(self, targets=config.ALL_MINIONS):
         # TODO IMPROVE why do we need that
@@ -319,6 +472,7 @@ class Deploy(CommandParserFillerMixin):
 
         logger.info("Refreshing pillars")
         self._function_run('saltutil.refresh_pillar', targets=targets)
+        pillar_cache.invalidate(targets)
 
         logger.info("Refreshing grains")
         self._function_run('saltutil.refresh_grains', targets=targets)
@@ -370,7 +524,18 @@ class Deploy(CommandParserFillerMixin):
                 'no partial stages appliance is supported for now'
             )
 
-        if run_args.states is None:  # all states
+        if run_args.workers > 1:
+            states_groups = [
+                states_group for states_group in deploy_states
+                if (
+                    run_args.states is None or
+                    states_group in run_args.states
+                )
+            ]
+            if 'system' in states_groups:
+                self._rescan_scsi_bus()
+            self._run_states_dag(states_groups, run_args)
+        elif run_args.states is None:  # all states
 
             self._rescan_scsi_bus()
             self._run_states('system', run_args)
@@ -19,6 +19,7 @@ from typing import List, Dict, Type, Optional, Iterable
 # import socket
 import logging
 import uuid
+import shlex
 from pathlib import Path
 
 from .. import (
@@ -44,6 +45,7 @@ from ..utils import (
     repo_tgz,
     run_subprocess_cmd
 )
+from .. import ssh
 from ..ssh import keygen
 from ..salt import SaltSSHClient
 
@@ -56,6 +58,9 @@ logger = logging.getLogger(__name__)
 
 add_pillar_merge_prefix = PillarUpdater.add_merge_prefix
 
+REACHABLE = 'reachable'
+UNREACHABLE = 'unreachable'
+
 
 # TODO TEST EOS-8473
 # TODO IMPROVE EOS-8473 converters and validators
@@ -349,6 +354,20 @@ class RunArgsSetup:
         },
         default=False
     )
+    ssh_persist: int = attr.ib(
+        metadata={
+            inputs.METADATA_ARGPARSER: {
+                'help': (
+                    "seconds to keep idle multiplexed ssh connections "
+                    "to the nodes open, 0 disables ssh multiplexing"
+                ),
+                'metavar': 'SECONDS',
+                'type': int
+            }
+        },
+        default=config.SSH_CONTROL_PERSIST,
+        converter=int
+    )
 
 
 # TODO TEST EOS-8473
@@ -370,6 +389,7 @@ class RunArgsSetupProvisionerBase:
     update: bool = RunArgsSetup.update
     rediscover: bool = RunArgsSetup.rediscover
     field_setup: bool = RunArgsSetup.field_setup
+    ssh_persist: int = RunArgsSetup.ssh_persist
 
 
 @attr.s(auto_attribs=True)
@@ -509,17 +529,79 @@ class SetupProvisioner(CommandParserFillerMixin):
         }
         dump_yaml(profile_paths['salt_roster_file'], roster)
 
-    def _create_ssh_client(self, c_path, roster_file):
+    def _create_ssh_client(
+        self, c_path, roster_file, control_dir=None, control_persist=0
+    ):
         # TODO IMPROVE EOS-8473 optional support for known hosts
         ssh_options = [
             'UserKnownHostsFile=/dev/null',
             'StrictHostKeyChecking=no'
         ]
-        return SaltSSHClient(
+        ssh_client = SaltSSHClient(
             c_path=c_path,
             roster_file=roster_file,
-            ssh_options=ssh_options
+            ssh_options=ssh_options,
+            control_dir=(
+                ssh.control_dir(control_dir)
+                if (control_dir and control_persist) else None
+            ),
+            control_persist=control_persist
         )
+        return ssh_client
+
+    @staticmethod
+    def _reachability_cmd(addrs: Iterable[str]) -> str:
+        # pings are run in background so the whole probe takes
+        # about a ping timeout regardless of the number of addresses
+        checks = [
+            f"(ping -c 1 -W 1 {addr} >/dev/null 2>&1"
+            f" && echo {addr} {REACHABLE}"
+            f" || echo {addr} {UNREACHABLE}) &"
+            for addr in (shlex.quote(addr) for addr in sorted(addrs))
+        ]
+        return ' '.join(checks + ['wait'])
+
+    def _probe_reachability(
+        self, nodes: List[Node], addrs: Iterable[str], ssh_client
+    ) -> Dict[str, Dict[str, bool]]:
+        """Checks reachability of the addresses from each of the nodes.
+
+        Uses a single salt-ssh call for all the nodes.
+
+        :returns: a matrix {<minion_id>: {<addr>: <is reachable>}}
+        """
+        res = {
+            node.minion_id: {addr: False for addr in addrs} for node in nodes
+        }
+
+        if not addrs:
+            return res
+
+        try:
+            salt_ret = ssh_client.cmd_run(
+                self._reachability_cmd(addrs),
+                targets='|'.join([node.minion_id for node in nodes]),
+                tgt_type='pcre'
+            )
+        except SaltCmdResultError as exc:
+            # the probe itself never fails, so some nodes are not
+            # accessible at all and none of the addresses can be
+            # considered as reachable from all the nodes
+            logger.warning(f"Reachability probe failed: {exc}")
+            salt_ret = {}
+
+        for minion_id, output in salt_ret.items():
+            if minion_id not in res or type(output) is not str:
+                continue
+            for line in output.splitlines():
+                try:
+                    addr, status = line.split()
+                except ValueError:
+                    continue
+                if addr in res[minion_id]:
+                    res[minion_id][addr] = (status == REACHABLE)
+
+        return res
 
     def _resolve_connections(self, nodes: List[Node], ssh_client):
         addrs = {}
@@ -542,28 +624,32 @@ class SetupProvisioner(CommandParserFillerMixin):
                 ]
             )
 
+        candidates = {}
         for node in nodes:
-            pings = set()
-            candidates = set(addrs[node.minion_id])
+            candidates[node.minion_id] = set(addrs[node.minion_id])
             for _node in nodes:
                 if _node is not node:
-                    candidates -= addrs[_node.minion_id]
+                    candidates[node.minion_id] -= addrs[_node.minion_id]
 
-            targets = '|'.join(
-                [_node.minion_id for _node in nodes if _node is not node]
+        reachability = {}
+        if len(nodes) > 1:
+            reachability = self._probe_reachability(
+                nodes, set().union(*candidates.values()), ssh_client
             )
 
-            for addr in candidates:
-                try:
-                    ssh_client.cmd_run(
-                        f"ping -c 1 -W 1 {addr}", targets=targets,
-                        tgt_type='pcre'
-                    )
-                except SaltCmdResultError as exc:
+        for node in nodes:
+            pings = set()
+            for addr in candidates[node.minion_id]:
+                unreachable_from = [
+                    _node.minion_id for _node in nodes
+                    if _node is not node
+                    and not reachability[_node.minion_id][addr]
+                ]
+                if unreachable_from:
                     logger.debug(
                         f"Possible address '{addr}' "
                         f"of {node.minion_id} is not reachable "
-                        f"from some nodes: {exc}"
+                        f"from {unreachable_from}"
                     )
                 else:
                     pings.add(addr)
@@ -576,7 +662,7 @@ class SetupProvisioner(CommandParserFillerMixin):
             else:
                 raise ProvisionerError(
                     f"{node.minion_id} is not reachable"
-                    f"from other nodes by any of {candidates}"
+                    f"from other nodes by any of {candidates[node.minion_id]}"
                 )
 
             node.ping_addrs = list(pings)
@@ -990,7 +1076,9 @@ class SetupProvisioner(CommandParserFillerMixin):
         self._prepare_roster(run_args.nodes, paths)
 
         ssh_client = self._create_ssh_client(
-            paths['salt_master_file'], paths['salt_roster_file']
+            paths['salt_master_file'], paths['salt_roster_file'],
+            control_dir=paths['ssh_control_dir'],
+            control_persist=run_args.ssh_persist
         )
 
         setup_ctx = SetupCtx(run_args, paths, ssh_client)
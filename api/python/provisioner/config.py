@@ -62,6 +62,14 @@ PRVSNR_PILLAR_CONFIG_INI = str(
     PRVSNR_FACTORY_PROFILE_DIR / 'srv/salt/provisioner/files/minions/all/config.ini'  # noqa: E501
 )
 
+# registry of provisioner commands scheduled as salt jobs
+PRVSNR_JOBS_DIR = PRVSNR_DATA_LOCAL_DIR / 'jobs'
+PRVSNR_JOBS_MAX = 1000
+PRVSNR_JOBS_MAX_AGE = 7 * 24 * 3600  # seconds
+
+# how long multiplexed ssh connections are kept open being idle
+SSH_CONTROL_PERSIST = 300  # seconds
+
 # TODO EOS-12076 EOS-12334
 PRVSNR_CORTX_REPOS_BASE_DIR = (
     PRVSNR_DATA_LOCAL_DIR / 'cortx_repos'
@@ -139,12 +147,24 @@ CONTROLLER_BOTH = 'both'
 
 PRVSNRUSERS_GROUP = 'prvsnrusers'
 
-PRVSNR_CLI_MACHINE_OUTPUT = ('json', 'yaml')
+PRVSNR_CLI_MACHINE_OUTPUT = ('json', 'yaml', 'msgpack')
 PRVSNR_CLI_OUTPUT = tuple(list(PRVSNR_CLI_MACHINE_OUTPUT) + ['plain'])
 PRVSNR_CLI_OUTPUT_DEFAULT = 'plain'
 
 PRVSNR_CONFIG_FILE = 'provisioner.conf'
 
+# API daemon socket (used by pycli API if exists)
+PRVSNR_API_SOCKET = Path('/var/run/seagate/provisioner/api.sock')
+# API daemon request limits: seconds to wait for a client to send
+# (or receive) data and max size of a request in bytes
+PRVSNR_API_REQUEST_TIMEOUT = 30
+PRVSNR_API_REQUEST_SIZE_MAX = 1024 * 1024
+
+# CLI commands parser arguments cache (per user)
+PRVSNR_CLI_PARSER_CACHE = (
+    Path.home() / '.cache' / 'provisioner' / 'cli_parser.pickle'
+)
+
 # logging
 PRVSNR_LOG_ROOT_DIR = Path('/var/log/seagate/provisioner')
 LOG_ROOT_DIR = (
@@ -179,6 +199,34 @@ LOG_FORCED_LOGFILE_CMDS = [
 
 LOG_TRUNC_MSG_TMPL = "<TRUNCATED> {} ..."
 LOG_TRUNC_MSG_SIZE_MAX = 4096 - len(LOG_TRUNC_MSG_TMPL)
+# max number of records in the logging queue (if enabled)
+LOG_QUEUE_SIZE = 10000
+# full salt results that are too big for the logs (if enabled)
+LOG_RESULTS_DIR = LOG_ROOT_DIR / 'results'
+# max number of the results files kept
+LOG_RESULTS_KEEP = 10
+
+# max number of parsed YAML files kept in memory
+YAML_CACHE_SIZE = 128
+
+# seconds a resolved pillar snapshot is reused for
+PILLAR_CACHE_TTL = 30
+
+# pillar updates don't refresh minions' pillar immediately,
+# pending refreshes are coalesced and issued before the next
+# salt call that might need the pillar data or at command exit
+PILLAR_REFRESH_DEFERRED = True
+
+# max number of independent components updated concurrently
+# during SW update, 1 means sequential update
+# Note. components states install packages, parallel states on the same
+#       minions contend on the yum / rpm lock, so concurrent update
+#       is opt-in and makes sense only for states that don't wait for it
+SW_UPDATE_WORKERS = 1
+
+# seconds to wait for yum rollback on SW update failure, the rollback
+# is not interrupted on timeout and is reported as still running
+SW_UPDATE_ROLLBACK_TIMEOUT = 1800
 
 # bundled salt roots dirs
 BUNDLED_SALT_DIR = CONFIG_MODULE_DIR / 'srv'
@@ -219,6 +267,7 @@ def profile_paths(
 
     setup_key_file = ssh_dir / 'setup.id_rsa'
     setup_key_pub_file = ssh_dir / 'setup.id_rsa.pub'
+    ssh_control_dir = ssh_dir / 'cm'
     salt_master_file = salt_config_dir / 'master'
     salt_minion_file = salt_config_dir / 'minion'
     salt_salt_file = salt_config_dir / 'Saltfile'
@@ -241,6 +290,7 @@ def profile_paths(
 
         'setup_key_file': setup_key_file,
         'setup_key_pub_file': setup_key_pub_file,
+        'ssh_control_dir': ssh_control_dir,
         'salt_master_file': salt_master_file,
         'salt_minion_file': salt_minion_file,
         'salt_salt_file': salt_salt_file,
@@ -0,0 +1,242 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+# Long-lived provisioner API worker.
+#
+# Serves API calls over a local UNIX socket using the same JSON protocol
+# as the provisioner CLI machine output (serialize.dumps / loads), so
+# pycli API clients can skip the interpreter startup per call.
+#
+# Protocol: a client sends a serialized dict
+#   {fun: <str>, args: <list>, kwargs: <dict>,
+#    username: <str>, password: <str>, eauth: <str>}
+# and closes its write side, the daemon responds with
+#   {ret: <command return>} or {exc: <exception>}
+# and closes the connection.
+
+import os
+import sys
+import grp
+import socket
+import struct
+import argparse
+import logging
+import threading
+import socketserver
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from . import config, serialize, metrics
+
+logger = logging.getLogger(__name__)
+
+_PEERCRED_FMT = '3i'  # pid, uid, gid
+
+
+def recv_all(
+    sock: socket.socket, bufsize: int = 65536, max_size: Optional[int] = None
+) -> bytes:
+    chunks = []
+    size = 0
+    while True:
+        chunk = sock.recv(bufsize)
+        if not chunk:
+            break
+        size += len(chunk)
+        if max_size is not None and size > max_size:
+            raise ValueError(f"Data size exceeds {max_size} bytes")
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+def peer_uid(sock: socket.socket) -> int:
+    creds = sock.getsockopt(
+        socket.SOL_SOCKET, socket.SO_PEERCRED,
+        struct.calcsize(_PEERCRED_FMT)
+    )
+    return struct.unpack(_PEERCRED_FMT, creds)[1]
+
+
+class ApiRequestHandler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        ret = None
+        exc = None
+
+        try:
+            # a client that doesn't close its write side
+            # shouldn't hold the handler forever
+            self.request.settimeout(self.server.request_timeout)
+            request = serialize.loads(
+                recv_all(
+                    self.request, max_size=self.server.request_size_max
+                ).decode()
+            )
+            ret = self.server.call(request, peer_uid(self.request))
+        except Exception as _exc:
+            logger.exception('API call failed')
+            exc = _exc
+
+        # the same output format as the CLI one
+        res = {'ret': '' if ret is None else ret} if exc is None else {
+            'exc': exc
+        }
+
+        try:
+            try:
+                data = serialize.dumps(res)
+            except Exception as _exc:
+                logger.exception('Failed to serialize API call result')
+                data = serialize.dumps({'exc': _exc})
+            self.request.sendall(data.encode())
+        except Exception:
+            logger.exception('Failed to send API call result')
+
+
+class ApiServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_timeout = config.PRVSNR_API_REQUEST_TIMEOUT
+    request_size_max = config.PRVSNR_API_REQUEST_SIZE_MAX
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(str(path))
+        # Note. salt auth credentials are process global
+        #       so calls are serialized
+        # TODO IMPROVE EOS-12076 pass credentials per call
+        self._call_lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            self.path.unlink()
+
+        super().__init__(str(self.path), ApiRequestHandler)
+        self._set_permissions()
+
+    def _set_permissions(self):
+        try:
+            gid = grp.getgrnam(config.PRVSNRUSERS_GROUP).gr_gid
+        except KeyError:
+            os.chmod(str(self.path), 0o600)
+        else:
+            os.chown(str(self.path), -1, gid)
+            os.chmod(str(self.path), 0o660)
+
+    def server_close(self):
+        super().server_close()
+        if self.path.exists():
+            self.path.unlink()
+
+    def call(self, request: Dict, uid: int):
+        from . import _api
+        from .api_spec import api_spec
+
+        fun = request['fun']
+        args = request.get('args') or []
+        kwargs = request.get('kwargs') or {}
+        username = request.get('username')
+
+        if fun not in api_spec or fun == 'auth_init':
+            raise ValueError(f"Unknown API function '{fun}'")
+
+        # the daemon works with root privileges, so non-root clients
+        # should authenticate, the credentials are checked by salt
+        if uid != 0 and not username:
+            raise PermissionError(
+                f"Authentication credentials are required, uid: {uid}"
+            )
+
+        logger.debug(
+            f"API call '{fun}' from uid {uid}, args: {args}, kwargs: {kwargs}"
+        )
+
+        with self._call_lock:
+            _api.auth_init(
+                username, request.get('password'),
+                eauth=request.get('eauth') or 'pam'
+            )
+            try:
+                with metrics.track(
+                    metrics.api_calls, metrics.api_call_duration, cmd=fun
+                ):
+                    return self._run(fun, args, kwargs, uid)
+            finally:
+                _api.auth_init(None, None)
+
+    @staticmethod
+    def _run(fun: str, args: List, kwargs: Dict, uid: int):
+        from . import _api
+        from .runner import SimpleRunner
+
+        if uid == 0:
+            return _api.run(fun, *args, **kwargs)
+
+        # Note. running in-process would have root side effects
+        #       (e.g. pillar files updates) before salt checks
+        #       the credentials, so the command is delegated to salt
+        #       as a salt job: salt master authenticates the user first
+        for k in ('password', 'username', 'eauth'):
+            kwargs.pop(k, None)
+        nowait = kwargs.pop('nowait', False)
+        return SimpleRunner(nowait=nowait).run_salt_job(fun, *args, **kwargs)
+
+
+def main():
+    from . import log
+
+    parser = argparse.ArgumentParser(
+        description='Provisioner API daemon',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        '--socket', default=str(config.PRVSNR_API_SOCKET),
+        help='UNIX socket path to listen on'
+    )
+    parser.add_argument(
+        '--metrics-port', type=int,
+        help='local HTTP port to serve metrics on, disabled if not set'
+    )
+    args = parser.parse_args()
+
+    log.set_logging()
+
+    metrics_server = None
+    if args.metrics_port:
+        # Note. imported here since http.server is heavy for the CLI
+        #       that imports the daemon module for the client helpers
+        from .metrics_server import MetricsServer
+        metrics_server = MetricsServer(args.metrics_port)
+        metrics_server.start()
+        logger.info(f"Serving metrics on port {args.metrics_port}")
+
+    server = ApiServer(args.socket)
+    logger.info(f"Serving provisioner API on '{server.path}'")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if metrics_server is not None:
+            metrics_server.shutdown()
+            metrics_server.server_close()
+        metrics.registry.dump()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
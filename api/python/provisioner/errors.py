@@ -15,7 +15,7 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
 
-from typing import Dict, Union, Any
+from typing import Dict, Union, Any, Optional
 
 
 class ProvisionerError(Exception):
@@ -151,6 +151,41 @@ class PillarSetError(ProvisionerError):
         )
 
 
+class YumRollbackError(ProvisionerError):
+    _prvsnr_type_ = True
+
+    def __init__(
+        self, reasons: Dict[str, Union[str, Exception]],
+        running: Optional[Dict[str, str]] = None
+    ):
+        self.reasons = reasons
+        # targets where the rollback is still running: jids
+        self.running = running or {}
+
+    def __str__(self):
+        msgs = []
+        if self.reasons:
+            msgs.append(
+                'yum rollback failed on targets {}'
+                .format(sorted(self.reasons))
+            )
+        if self.running:
+            msgs.append(
+                'yum rollback is still running on targets {}'
+                .format(', '.join(
+                    '{} (jid {})'.format(target, jid)
+                    for target, jid in sorted(self.running.items())
+                ))
+            )
+        return '{}: {!r}'.format(', '.join(msgs), self)
+
+    def __repr__(self):
+        return (
+            "{}(reasons={!r}, running={!r})"
+            .format(self.__class__.__name__, self.reasons, self.running)
+        )
+
+
 class ClusterMaintenanceError(ProvisionerError):
     _prvsnr_type_ = True
 
@@ -214,6 +249,20 @@ class ClusterNotHealthyError(ProvisionerError):
         )
 
 
+class ClusterHealthWaitError(ProvisionerError):
+    _prvsnr_type_ = True
+
+    def __init__(self, reason: Union[Exception, str], health=None):
+        self.reason = reason
+        self.health = health
+
+    def __str__(self):
+        return (
+            'cluster is not healthy, reason: {!r}, last health status: {!r}'
+            .format(self.reason, self.health)
+        )
+
+
 class SWUpdateError(ProvisionerError):
     _prvsnr_type_ = True
 
@@ -15,11 +15,16 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
 
+import json
+import time
 import logging
+from typing import Dict, Optional
 
+from .vendor import attr
 from .config import LOCAL_MINION, ALL_MINIONS, PRVSNR_ROOT_DIR
+from .errors import ClusterHealthWaitError, SaltCmdResultError
 from .salt import cmd_run, StatesApplier
-from .utils import ensure
+from .utils import backoff_delays
 
 logger = logging.getLogger(__name__)
 
@@ -109,19 +114,122 @@ def check_cluster_is_online():
     return next(iter(res.values()))
 
 
+@attr.s(auto_attribs=True)
+class ClusterHealth:
+    # node name -> online
+    nodes: Dict[str, bool] = attr.Factory(dict)
+    resources_stopped: int = 0
+    resources_failed: int = 0
+
+    @classmethod
+    def from_hctl_status(cls, status: Dict) -> 'ClusterHealth':
+        stats = status.get('resources', {}).get('statistics', {})
+        return cls(
+            nodes={
+                node['name']: bool(node.get('online'))
+                for node in status.get('nodes', [])
+            },
+            resources_stopped=int(stats.get('stopped') or 0),
+            resources_failed=int(stats.get('failed') or 0)
+        )
+
+    @property
+    def online(self):
+        return bool(self.nodes) and all(self.nodes.values())
+
+    @property
+    def healthy(self):
+        return self.online and not (
+            self.resources_stopped or self.resources_failed
+        )
+
+    @property
+    def failed(self):
+        # failed resources are not recovered by pacemaker
+        # on its own, so no sense to wait more
+        return self.resources_failed > 0
+
+
+# TODO IMPROVE EOS-8940 the same logic as ensure_healthy_cluster
+#      from utility_scripts.sh has but without disabled resources
+#      accounting
+def cluster_health() -> ClusterHealth:
+    res = cmd_run('hctl node status --full', targets=LOCAL_MINION)
+    return ClusterHealth.from_hctl_status(
+        json.loads(next(iter(res.values())))
+    )
+
+
+@attr.s(auto_attribs=True)
+class HealthWaitStats:
+    tries: int = 0
+    elapsed: float = 0
+    health: Optional[ClusterHealth] = None
+
+
+def wait_cluster_is_healthy(
+    timeout: float = 600,
+    wait_min: float = 1,
+    wait_max: float = 30,
+    online_only: bool = False
+) -> HealthWaitStats:
+    """Polls the cluster health until it is good or the deadline comes.
+
+    Polling interval grows exponentially from ``wait_min`` up
+    to ``wait_max`` seconds. Failed resources stop the waiting
+    immediately.
+    """
+    stats = HealthWaitStats()
+    start = time.monotonic()
+    deadline = start + timeout
+    delays = backoff_delays(wait_min, wait_max)
+
+    while True:
+        stats.tries += 1
+        try:
+            stats.health = cluster_health()
+        # hctl fails (or responds with garbage) while the cluster
+        # is being started
+        except (SaltCmdResultError, ValueError) as exc:
+            logger.debug(
+                f"Try #{stats.tries} to get cluster health failed: {exc!r}"
+            )
+        else:
+            health = stats.health
+            if health.online if online_only else health.healthy:
+                break
+            if health.failed:
+                raise ClusterHealthWaitError(
+                    'some resources are failed', attr.asdict(health)
+                )
+
+        now = time.monotonic()
+        if now >= deadline:
+            raise ClusterHealthWaitError(
+                f"timeout {timeout}s is exceeded",
+                None if stats.health is None else attr.asdict(stats.health)
+            )
+        time.sleep(min(next(delays), deadline - now))
+
+    stats.elapsed = time.monotonic() - start
+    logger.info(
+        f"Cluster is {'online' if online_only else 'healthy'} "
+        f"in {stats.elapsed:.1f}s, tries: {stats.tries}"
+    )
+    return stats
+
+
 def ensure_cluster_is_stopped(tries=30, wait=1):
     cluster_stop()
     # no additional checks are needed since
     # cluster stop is a sync operation
 
 
-def ensure_cluster_is_started(tries=30, wait=10):
+def ensure_cluster_is_started(timeout=300):
     cluster_start()
-    ensure(check_cluster_is_online, tries=tries, wait=wait)
+    return wait_cluster_is_healthy(timeout=timeout)
 
 
-# TODO IMPROVE EOS-8940 currently we rely on utility_scripts.sh as it
-#      has its own looping logic, so only one try here
-def ensure_cluster_is_healthy(tries=1, wait=10):
+def ensure_cluster_is_healthy(timeout=120):
     logger.info("Ensuring cluster is online and healthy")
-    ensure(check_cluster_is_online, tries=tries, wait=wait)
+    return wait_cluster_is_healthy(timeout=timeout)
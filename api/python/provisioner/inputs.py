@@ -262,6 +262,70 @@ class PillarKeysList:
         return (), kwargs
 
 
+@attr.s(auto_attribs=True, frozen=True)
+class PillarItemsList(PillarItemsAPI):
+    _items: List[Tuple[PillarKey, Any]] = attr.Factory(list)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def pillar_items(self) -> Iterable[Tuple[PillarKeyAPI, Any]]:
+        return iter(self._items)
+
+    @classmethod
+    def from_args(
+        cls,
+        *args: Tuple[Union[str, dict, Tuple], ...]
+    ):
+        """Accepts any mix of
+
+        - dicts ``{keypath: value}``
+        - tuples ``(keypath, value[, fpath])``
+        - strings ``'keypath=value'`` with a value in JSON format
+        - JSON objects strings ``'{"keypath": value}'``
+        """
+        items = []
+        for arg in args:
+            if type(arg) is str and arg.startswith('{'):
+                arg = loads(arg)
+
+            if isinstance(arg, dict):
+                items.extend(
+                    (PillarKey(keypath), value)
+                    for keypath, value in arg.items()
+                )
+            elif type(arg) in (tuple, list):
+                # TODO IMPROVE more checks for tuple types and len
+                items.append((PillarKey(arg[0], *arg[2:]), arg[1]))
+            elif type(arg) is str:
+                keypath, sep, value = arg.partition('=')
+                if not sep:
+                    raise ValueError(
+                        f"'keypath=value' is expected, provided '{arg}'"
+                    )
+                items.append((
+                    PillarKey(keypath),
+                    AttrParserArgs.value_from_str(value, v_type='json')
+                ))
+            else:
+                raise TypeError(f"Unexpected type {type(arg)} of args {arg}")
+        return cls(items)
+
+    @classmethod
+    def fill_parser(cls, parser):
+        parser.add_argument(
+            'args', metavar='keypath=value', type=str, nargs='+',
+            help='a pillar key path and a value in JSON format'
+        )
+
+    @classmethod
+    def extract_positional_args(cls, kwargs):
+        return (), kwargs
+
+
 @attr.s(auto_attribs=True, frozen=True)
 class PillarInputBase(PillarItemsAPI):
     keypath: str = attr.ib(
@@ -0,0 +1,162 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+import os
+import time
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .vendor import attr
+from . import config, serialize
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUS_RUNNING = 'running'
+JOB_STATUS_FINISHED = 'finished'
+
+# api spec key: command args not to store (names, positions or '*'
+# for all positional args)
+SECRETS_SPEC_KEY = 'secrets'
+REDACTED = '<REDACTED>'
+
+
+def redact_args(cmd: str, args: List, kwargs: Dict):
+    # Note. imported here to avoid circular imports
+    from .api_spec import api_spec
+
+    secrets = (api_spec.get(cmd) or {}).get(SECRETS_SPEC_KEY) or []
+    if not secrets:
+        return list(args), dict(kwargs)
+    return (
+        [
+            REDACTED if (i in secrets or '*' in secrets) else v
+            for i, v in enumerate(args)
+        ],
+        {k: (REDACTED if k in secrets else v) for k, v in kwargs.items()}
+    )
+
+
+@attr.s(auto_attribs=True)
+class JobRecord:
+    jid: str
+    cmd: str
+    args: List = attr.Factory(list)
+    kwargs: Dict = attr.Factory(dict)
+    submitted: float = attr.Factory(time.time)
+    status: str = JOB_STATUS_RUNNING
+    # raw salt job result: provisioner cli output per minion
+    result: Any = None
+
+    @property
+    def finished(self):
+        return self.status == JOB_STATUS_FINISHED
+
+
+# TODO IMPROVE EOS-12076 share the registry between nodes
+@attr.s(auto_attribs=True)
+class JobsRegistry:
+    """Local registry of provisioner commands scheduled as salt jobs.
+
+    A job is kept as a separate file named by the jid, so a lookup
+    doesn't depend on the number of jobs. The registry keeps not more
+    than ``max_jobs`` records not older than ``max_age`` seconds.
+
+    The registry is an optimization only: any storage errors are logged
+    and the callers are expected to fall back to the salt job cache.
+
+    The records are accessible by the owner only since they keep
+    the commands results, the secret args are not stored at all.
+    """
+    path: Path = attr.ib(
+        converter=Path, default=config.PRVSNR_JOBS_DIR
+    )
+    max_jobs: int = config.PRVSNR_JOBS_MAX
+    max_age: float = config.PRVSNR_JOBS_MAX_AGE
+
+    def _job_path(self, jid: str) -> Path:
+        jid = str(jid)
+        # jids are used as file names
+        if not jid.isalnum():
+            raise ValueError(f"Unexpected job id '{jid}'")
+        return self.path / f'{jid}.json'
+
+    def _dump(self, record: JobRecord):
+        path = self._job_path(record.jid)
+        tmp_path = path.with_name(f'.{path.name}.{os.getpid()}')
+        self.path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # might be created by a previous version
+        os.chmod(str(self.path), 0o700)
+        fd = os.open(
+            str(tmp_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+        )
+        with os.fdopen(fd, 'w') as f:
+            f.write(serialize.dumps(attr.asdict(record)))
+        os.replace(str(tmp_path), str(path))
+
+    def add(
+        self, jid: str, cmd: str, args=None, kwargs=None
+    ) -> Optional[JobRecord]:
+        args, kwargs = redact_args(cmd, args or [], kwargs or {})
+        record = JobRecord(str(jid), cmd, args, kwargs)
+        try:
+            self._dump(record)
+            self.prune()
+        except Exception as exc:
+            logger.warning(f"Failed to register job {jid}: {exc!r}")
+            return None
+        return record
+
+    def get(self, jid: str) -> Optional[JobRecord]:
+        try:
+            data = serialize.loads(self._job_path(jid).read_text())
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            logger.warning(f"Failed to load job {jid} record: {exc!r}")
+            return None
+        return JobRecord(**data)
+
+    def set_result(self, jid: str, result: Any) -> Optional[JobRecord]:
+        record = self.get(jid)
+        if record is None:
+            return None
+
+        record.result = result
+        record.status = JOB_STATUS_FINISHED
+        try:
+            self._dump(record)
+        except Exception as exc:
+            logger.warning(f"Failed to update job {jid} record: {exc!r}")
+        return record
+
+    def prune(self):
+        if not self.path.exists():
+            return
+
+        paths = sorted(
+            self.path.glob('*.json'), key=lambda p: p.stat().st_mtime
+        )
+        expired_ts = time.time() - self.max_age
+        excess = len(paths) - self.max_jobs
+        for i, path in enumerate(paths):
+            if i < excess or path.stat().st_mtime < expired_ts:
+                logger.debug(f"Removing job record {path}")
+                path.unlink()
+
+
+jobs_registry = JobsRegistry()
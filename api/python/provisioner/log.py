@@ -20,7 +20,11 @@
 
 
 import sys
-from typing import Dict, Union
+import copy
+import queue
+import atexit
+from collections.abc import MutableMapping, MutableSequence, MutableSet
+from typing import Any, Dict, Optional, Union
 from copy import deepcopy
 
 import logging
@@ -29,6 +33,7 @@ import logging.handlers
 
 from .vendor import attr
 from . import inputs
+from . import log_results
 from .errors import LogMsgTooLong
 from .base import prvsnr_config
 from .config import (
@@ -38,7 +43,9 @@ from .config import (
     LOG_CMD_FILTER as cmd_filter,
     LOG_HUMAN_FORMATTER,
     LOG_TRUNC_MSG_TMPL,
-    LOG_TRUNC_MSG_SIZE_MAX
+    LOG_TRUNC_MSG_SIZE_MAX,
+    LOG_QUEUE_SIZE,
+    LOG_RESULTS_KEEP
 )
 
 logger = logging.getLogger(__name__)
@@ -100,6 +107,116 @@ class NoErrorSysLogHandler(logging.handlers.SysLogHandler):
             super().handleError(record)
 
 
+def _is_mutable(obj: Any) -> bool:
+    if isinstance(obj, tuple):
+        return any(_is_mutable(item) for item in obj)
+    return isinstance(obj, (MutableMapping, MutableSequence, MutableSet))
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that never blocks a caller.
+
+    The records are dropped and counted when the queue is full.
+    """
+
+    def __init__(self, records_queue: queue.Queue):
+        super().__init__(records_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        # the message with mutable containers is built here since they
+        # might be changed later by a caller, immutable and lazy
+        # (e.g. LazyResult) arguments are formatted by the listener,
+        # the rest is up to the target handlers
+        record = copy.copy(record)
+        if _is_mutable(record.msg) or _is_mutable(record.args):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class BoundedQueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # blocking put: the listener drains the queue
+        self.queue.put(self._sentinel)
+
+
+@attr.s(auto_attribs=True)
+class QueueLogging:
+    handler: DroppingQueueHandler
+    listener: BoundedQueueListener
+
+    @classmethod
+    def start(cls, size: int = LOG_QUEUE_SIZE) -> 'QueueLogging':
+        """Moves the root handlers behind a queue and a listener thread."""
+        handlers = [
+            h for h in logging.root.handlers
+            if not isinstance(h, logging.NullHandler)
+        ]
+        handler = DroppingQueueHandler(queue.Queue(size))
+        # no need to queue the records none of the handlers accepts
+        handler.setLevel(min((h.level for h in handlers), default=0))
+        listener = BoundedQueueListener(
+            handler.queue, *handlers, respect_handler_level=True
+        )
+        for _handler in handlers:
+            logging.root.removeHandler(_handler)
+        logging.root.addHandler(handler)
+        listener.start()
+        return cls(handler, listener)
+
+    def stop(self):
+        """Flushes the queue and returns the handlers to the root logger."""
+        logging.root.removeHandler(self.handler)
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            logging.root.addHandler(handler)
+        if self.handler.dropped:
+            logger.warning(
+                f"{self.handler.dropped} log records were dropped"
+                " due to the logging queue overflow"
+            )
+
+
+_queue_logging: Optional[QueueLogging] = None
+
+
+def queue_logging_config() -> Dict:
+    try:
+        return dict(prvsnr_config.logging_queue or {})
+    except AttributeError:
+        return {}
+
+
+def results_logging_config() -> Dict:
+    try:
+        return dict(prvsnr_config.logging_results or {})
+    except AttributeError:
+        return {}
+
+
+def start_queue_logging(size: int = LOG_QUEUE_SIZE):
+    global _queue_logging
+    stop_queue_logging()
+    _queue_logging = QueueLogging.start(size)
+
+
+def stop_queue_logging():
+    global _queue_logging
+    if _queue_logging is not None:
+        _queue_logging, _ql = None, _queue_logging
+        _ql.stop()
+
+
+atexit.register(stop_queue_logging)
+
+
 def build_log_args_cls(log_config=None):  # noqa: C901 FIXME
     if log_config is None:
         log_config = prvsnr_config.logging
@@ -306,6 +423,7 @@ LogArgs = build_log_args_cls()
 
 
 def reset_logging():
+    stop_queue_logging()
     for handler in logging.root.handlers[:]:
         handler.flush()
         logging.root.removeHandler(handler)
@@ -317,3 +435,13 @@ def set_logging(log_args: Union[LogArgs, None] = None):
     logging.config.dictConfig(
         prvsnr_config.logging if log_args is None else log_args.config()
     )
+    results_config = results_logging_config()
+    log_results.results_spill.setup(
+        getattr(log_args, 'cmd', None),
+        enabled=bool(results_config.get('enabled')),
+        keep=results_config.get('keep', LOG_RESULTS_KEEP)
+    )
+
+    queue_config = queue_logging_config()
+    if queue_config.get('enabled'):
+        start_queue_logging(queue_config.get('size', LOG_QUEUE_SIZE))
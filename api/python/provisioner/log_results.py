@@ -0,0 +1,170 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+import os
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from .vendor import attr
+from .config import (
+    LOG_RESULTS_DIR,
+    LOG_RESULTS_KEEP,
+    LOG_TRUNC_MSG_TMPL,
+    LOG_TRUNC_MSG_SIZE_MAX
+)
+
+logger = logging.getLogger(__name__)
+
+
+def result_jid(res: Any) -> Optional[str]:
+    """Returns a jid of a raw salt result if it is known."""
+    if not isinstance(res, dict):
+        return None
+    if 'jid' in res:
+        return str(res['jid'])
+    for ret in res.values():
+        if isinstance(ret, dict) and 'jid' in ret:
+            return str(ret['jid'])
+    return None
+
+
+@attr.s(auto_attribs=True)
+class ResultsSpill:
+    """Side file for the results that are too big for the logs.
+
+    The file is per command, the results are appended as JSON lines
+    along with their jids. It is created on the first spill only,
+    only the ``keep`` newest files are kept.
+
+    The results might include sensitive data, so spilling is opt-in
+    and the files are readable by the owner only.
+    """
+    path_dir: Path = attr.ib(converter=Path, default=LOG_RESULTS_DIR)
+    cmd: Optional[str] = None
+    enabled: bool = False
+    keep: int = LOG_RESULTS_KEEP
+    _path: Optional[Path] = attr.ib(init=False, default=None)
+    _lock: threading.Lock = attr.ib(init=False, factory=threading.Lock)
+
+    @property
+    def path(self) -> Path:
+        if self._path is None:
+            self._path = self.path_dir / '{}.{}.{}.results.jsonl'.format(
+                self.cmd or 'provisioner',
+                time.strftime('%Y%m%d-%H%M%S'),
+                os.getpid()
+            )
+        return self._path
+
+    def setup(
+        self, cmd: Optional[str] = None, enabled: bool = False,
+        keep: int = LOG_RESULTS_KEEP
+    ):
+        with self._lock:
+            self.cmd = cmd
+            self.enabled = enabled
+            self.keep = keep
+            self._path = None
+
+    def prune(self):
+        """Removes the oldest files except the current one."""
+        paths = sorted(
+            (
+                path for path in self.path_dir.glob('*.results.jsonl')
+                if path != self.path
+            ),
+            key=lambda p: p.stat().st_mtime
+        )
+        for path in paths[:max(len(paths) - self.keep + 1, 0)]:
+            logger.debug(f"Removing results file {path}")
+            path.unlink()
+
+    def _write(self, line: str):
+        self.path_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # might be created by a previous version
+        os.chmod(str(self.path_dir), 0o700)
+        created = not self.path.exists()
+        fd = os.open(
+            str(self.path), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600
+        )
+        with os.fdopen(fd, 'a') as f:
+            f.write(line)
+            f.write('\n')
+        if created:
+            try:
+                self.prune()
+            except Exception as exc:
+                logger.warning(f"Failed to prune results files: {exc!r}")
+
+    def dump(self, res: Any, **meta) -> Optional[Path]:
+        if not self.enabled:
+            return None
+
+        line = json.dumps(dict(meta, ts=time.time(), result=res), default=str)
+        with self._lock:
+            try:
+                self._write(line)
+            except Exception as exc:
+                logger.warning(f"Failed to spill a result: {exc!r}")
+                return None
+            return self.path
+
+
+results_spill = ResultsSpill()
+
+
+class LazyResult:
+    """Salt result as a logging argument.
+
+    Formatting happens only when a handler emits the record, so
+    disabled levels cost nothing. Results longer than
+    LOG_TRUNC_MSG_SIZE_MAX are truncated and dumped to the results
+    spill file in full if it is enabled.
+    """
+
+    __slots__ = ('res', 'fun', 'spill', '_text')
+
+    def __init__(
+        self, res: Any, fun: Optional[str] = None,
+        spill: Optional[ResultsSpill] = None
+    ):
+        self.res = res
+        self.fun = fun
+        self.spill = results_spill if spill is None else spill
+        self._text = None
+
+    def _format(self) -> str:
+        text = str(self.res)
+        if len(text) <= LOG_TRUNC_MSG_SIZE_MAX:
+            return text
+
+        jid = result_jid(self.res)
+        path = self.spill.dump(self.res, jid=jid, fun=self.fun)
+        text = LOG_TRUNC_MSG_TMPL.format(text[:LOG_TRUNC_MSG_SIZE_MAX])
+        if path is not None:
+            text += f" (full result: {path}, jid: {jid})"
+        return text
+
+    def __str__(self):
+        # the same record may be emitted by a number of handlers
+        if self._text is None:
+            self._text = self._format()
+        return self._text
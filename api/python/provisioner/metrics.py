@@ -0,0 +1,232 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .vendor import attr
+
+logger = logging.getLogger(__name__)
+
+METRICS_FILE_ENV = 'PRVSNR_METRICS_FILE'
+
+OUTCOME_SUCCESS = 'success'
+OUTCOME_FAILURE = 'failure'
+
+# provisioner operations take from seconds up to tens of minutes
+DURATION_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 300, 600, 1800)
+
+
+def _labels_str(names: Tuple, values: Tuple, **extra) -> str:
+    labels = list(zip(names, values)) + list(extra.items())
+    if not labels:
+        return ''
+    return '{{{}}}'.format(','.join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n')
+        ) for name, value in labels
+    ))
+
+
+@attr.s(auto_attribs=True)
+class Counter:
+    name: str
+    help: str
+    labels: Tuple = ()
+    _values: Dict[Tuple, float] = attr.ib(init=False, factory=dict)
+    _lock: threading.Lock = attr.ib(init=False, factory=threading.Lock)
+
+    _type = 'counter'
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_labels_str(self.labels, key)} {value}"
+            for key, value in values
+        ]
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+@attr.s(auto_attribs=True)
+class Histogram(Counter):
+    buckets: Tuple = DURATION_BUCKETS
+    # labels values -> [buckets counts..., sum, count]
+    _values: Dict[Tuple, List] = attr.ib(init=False, factory=dict)
+
+    _type = 'histogram'
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            data = self._values.setdefault(
+                key, [0] * (len(self.buckets) + 2)
+            )
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[i] += 1
+            data[-2] += value
+            data[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(time.monotonic() - start, **labels)
+
+    def value(self, **labels) -> Tuple[float, int]:
+        """Returns the sum and the count of observed values."""
+        data = self._values.get(self._key(labels))
+        return (0, 0) if data is None else (data[-2], data[-1])
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((k, list(v)) for k, v in self._values.items())
+        res = []
+        for key, data in values:
+            for bound, count in zip(self.buckets, data):
+                res.append(
+                    f"{self.name}_bucket"
+                    f"{_labels_str(self.labels, key, le=bound)} {count}"
+                )
+            res.extend([
+                f"{self.name}_bucket"
+                f"{_labels_str(self.labels, key, le='+Inf')} {data[-1]}",
+                f"{self.name}_sum{_labels_str(self.labels, key)} {data[-2]}",
+                f"{self.name}_count{_labels_str(self.labels, key)} {data[-1]}"
+            ])
+        return res
+
+
+@attr.s(auto_attribs=True)
+class MetricsRegistry:
+    """Process wide counters and histograms of provisioner operations.
+
+    Might be dumped in Prometheus text format to a file (e.g. for
+    the node exporter textfile collector) or served over HTTP
+    by the daemon.
+    """
+    path: Optional[Path] = attr.ib(
+        converter=attr.converters.optional(Path), default=None
+    )
+    metrics: Dict[str, Counter] = attr.ib(init=False, factory=dict)
+
+    def _add(self, metric: Counter) -> Counter:
+        return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labels: Tuple = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def histogram(
+        self, name: str, help: str, labels: Tuple = (),
+        buckets: Tuple = DURATION_BUCKETS
+    ) -> Histogram:
+        return self._add(Histogram(name, help, labels, buckets=buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend([
+                f"# HELP {metric.name} {metric.help}",
+                f"# TYPE {metric.name} {metric._type}"
+            ])
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path: Union[str, Path, None] = None):
+        path = self.path if path is None else Path(str(path))
+        if path is None:
+            return
+
+        # atomic replace since the file might be read by a collector
+        tmp_path = path.with_name(f'.{path.name}.{os.getpid()}')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(self.render())
+            os.replace(str(tmp_path), str(path))
+        except Exception as exc:
+            logger.warning(f"Failed to dump metrics to {path}: {exc!r}")
+
+    def reset(self):
+        for metric in self.metrics.values():
+            metric.reset()
+
+
+registry = MetricsRegistry(os.getenv(METRICS_FILE_ENV))
+
+api_calls = registry.counter(
+    'prvsnr_api_calls_total', 'Provisioner API calls', ('cmd', 'outcome')
+)
+api_call_duration = registry.histogram(
+    'prvsnr_api_call_duration_seconds', 'Provisioner API calls duration',
+    ('cmd',)
+)
+salt_calls = registry.counter(
+    'prvsnr_salt_calls_total', 'Salt function calls', ('fun', 'outcome')
+)
+salt_call_duration = registry.histogram(
+    'prvsnr_salt_call_duration_seconds', 'Salt function calls duration',
+    ('fun',)
+)
+state_apply_duration = registry.histogram(
+    'prvsnr_state_apply_duration_seconds', 'Salt states appliance duration',
+    ('state',)
+)
+pillar_updates = registry.counter(
+    'prvsnr_pillar_updates_total', 'Pillar updates', ('changed',)
+)
+pillar_refreshes = registry.counter(
+    'prvsnr_pillar_refreshes_total', 'Pillar refresh requests', ('deferred',)
+)
+ensure_tries = registry.counter(
+    'prvsnr_ensure_tries_total', 'Tries of ensure checks', ('name', 'outcome')
+)
+
+
+@contextmanager
+def track(counter: Counter, histogram: Histogram, **labels):
+    """Counts an operation by the outcome and observes its duration."""
+    outcome = OUTCOME_FAILURE
+    try:
+        with histogram.time(**labels):
+            yield
+        outcome = OUTCOME_SUCCESS
+    finally:
+        counter.inc(outcome=outcome, **labels)
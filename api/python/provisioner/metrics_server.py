@@ -0,0 +1,64 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+import logging
+import threading
+import socketserver
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Optional
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+
+        data = self.server.registry.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+class MetricsServer(socketserver.ThreadingMixIn, HTTPServer):
+    """Serves the metrics in Prometheus text format on ``/metrics``."""
+    daemon_threads = True
+
+    def __init__(
+        self, port: int, host: str = '127.0.0.1',
+        metrics_registry: Optional[metrics.MetricsRegistry] = None
+    ):
+        self.registry = (
+            metrics.registry if metrics_registry is None
+            else metrics_registry
+        )
+        super().__init__((host, port), MetricsRequestHandler)
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
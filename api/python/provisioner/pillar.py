@@ -15,17 +15,30 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
 
+import time
 import logging
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict, Tuple, Iterable, Union
+from typing import Any, List, Dict, Tuple, Iterable, Union, Optional
 from copy import deepcopy
 from pathlib import Path
 
 from .vendor import attr
-from .utils import load_yaml, dump_yaml
-from .salt import pillar_get, pillar_refresh
+from . import metrics
+from .utils import (
+    load_yaml, load_yaml_str, dump_yaml, dump_yaml_str,
+    write_text_atomic, text_digest
+)
+from .errors import SaltCmdResultError
+from .salt import (
+    pillar_get, pillar_keys_get, pillar_subtrees_get, pillar_refresh,
+    pillar_refresher
+)
 from .config import (
     ALL_MINIONS,
+    LOCAL_MINION,
+    PILLAR_CACHE_TTL,
+    PILLAR_REFRESH_DEFERRED,
     PRVSNR_PILLAR_DIR,
     PRVSNR_USER_PILLAR_PREFIX,
     PRVSNR_USER_PILLAR_ALL_HOSTS_DIR,
@@ -36,6 +49,9 @@ from .values import UNCHANGED, DEFAULT, MISSED, UNDEFINED
 
 logger = logging.getLogger(__name__)
 
+# a value salt returns for missed keys in targeted pillar queries
+_MISSED_KEY_MARKER = '__prvsnr_missed__'
+
 
 # TODO explore more options of hashing
 # (http://www.attrs.org/en/stable/hashing.html)
@@ -176,18 +192,112 @@ class PillarEntry:
             del parent_dict[self.key_path.leaf]
 
 
+# TODO IMPROVE EOS-12076 invalidate on pillar changes made by other processes
+@attr.s(auto_attribs=True)
+class PillarCache:
+    """Process-wide snapshots of the resolved pillar keyed by targets.
+
+    A snapshot is valid for ``ttl`` seconds or till it is invalidated
+    explicitly (e.g. on pillar refresh).
+    """
+    ttl: float = PILLAR_CACHE_TTL
+    _snapshots: Dict = attr.Factory(dict)
+    _lock: threading.Lock = attr.ib(init=False, factory=threading.Lock)
+
+    def get(self, targets: str) -> Optional[Dict]:
+        with self._lock:
+            snapshot = self._snapshots.get(targets)
+            if snapshot is None:
+                return None
+
+            created, pillar = snapshot
+            if time.monotonic() - created > self.ttl:
+                logger.debug(f"Pillar snapshot for '{targets}' is expired")
+                del self._snapshots[targets]
+                return None
+
+            # callers might change the pillar data
+            return deepcopy(pillar)
+
+    def set(self, targets: str, pillar: Dict) -> None:
+        pillar = deepcopy(pillar)
+        with self._lock:
+            self._snapshots[targets] = (time.monotonic(), pillar)
+
+    def invalidate(self, targets: Optional[str] = None) -> None:
+        with self._lock:
+            if targets in (None, ALL_MINIONS):
+                self._snapshots.clear()
+            else:
+                # TODO IMPROVE resolve targets to the minions list
+                #      to drop only affected snapshots
+                for _targets in (targets, LOCAL_MINION, ALL_MINIONS):
+                    self._snapshots.pop(_targets, None)
+
+
+pillar_cache = PillarCache()
+
+
 @attr.s(auto_attribs=True)
 class PillarResolver:
     targets: str = ALL_MINIONS
     _pillar: Dict = None
+    use_cache: bool = True
+    # query minions for the keys subtrees only
+    # (requires provisioner custom salt modules)
+    subtrees: bool = False
 
     @property
     def pillar(self):
         if self._pillar is None:
-            self._pillar = pillar_get(targets=self.targets)
+            if self.use_cache:
+                self._pillar = pillar_cache.get(self.targets)
+
+            if self._pillar is None:
+                self._pillar = pillar_get(targets=self.targets)
+                if self.use_cache:
+                    pillar_cache.set(self.targets, self._pillar)
+
         return self._pillar
 
+    def _get_targeted(self, pi_keys: List[PillarKeyAPI]):
+        res = {}
+        keypaths = {str(pk.keypath) for pk in pi_keys}
+
+        _res = None
+        if self.subtrees:
+            try:
+                _res = pillar_subtrees_get(keypaths, targets=self.targets)
+            except SaltCmdResultError:
+                # TODO IMPROVE EOS-12076 ensure modules are synced instead
+                logger.warning(
+                    "Pillar subtrees query failed, "
+                    "falling back to pillar.item"
+                )
+
+        if _res is None:
+            _res = pillar_keys_get(
+                keypaths, targets=self.targets, default=_MISSED_KEY_MARKER
+            )
+
+        for minion_id, values in _res.items():
+            res[minion_id] = {}
+            for pk in pi_keys:
+                value = values.get(str(pk.keypath), _MISSED_KEY_MARKER)
+                res[minion_id][pk] = (
+                    MISSED if value == _MISSED_KEY_MARKER else value
+                )
+        return res
+
     def get(self, pi_keys: Iterable[PillarKeyAPI]):  # TODO return value
+        pi_keys = list(pi_keys)
+
+        # no need to fetch the whole pillar if it is not in hands yet
+        if self._pillar is None and (
+            not self.use_cache or pillar_cache.get(self.targets) is None
+        ):
+            return self._get_targeted(pi_keys)
+
         # TODO provide results per target
         # - for now just use the first target's pillar value
         res = {}
@@ -208,6 +318,8 @@ class PillarUpdater:
     targets: str = ALL_MINIONS
     _pillars: Dict = attr.Factory(dict)
     _p_entries: List[PillarEntry] = attr.Factory(list)
+    # digests of the files content as it's on the disk
+    _digests: Dict = attr.Factory(dict)
 
     @staticmethod
     def ensure_exists(path: Path):
@@ -294,7 +406,13 @@ class PillarUpdater:
         _path = self.add_merge_prefix(_path)
 
         if _path not in self._pillars:
-            self._pillars[_path] = load_yaml(_path) if _path.exists() else {}
+            if _path.exists():
+                text = _path.read_text()
+                self._pillars[_path] = load_yaml_str(text) or {}
+                self._digests[_path] = text_digest(text)
+            else:
+                self._pillars[_path] = {}
+                self._digests[_path] = None
         return self._pillars[_path]
 
     # TODO IMPROVE add option to verify updated pillar
@@ -352,19 +470,45 @@ class PillarUpdater:
             p_entry.rollback()
             self._p_entries.pop()
 
-    def dump(self) -> None:
+    def dump(self) -> List[Path]:
+        """Writes the pillar files which content has been changed.
+
+        :returns: a list of the changed files
+        """
+        changed = []
         for path, pillar in self._pillars.items():
-            self.ensure_exists(path)
-            dump_yaml(path, pillar)
+            text = dump_yaml_str(pillar)
+            digest = text_digest(text)
+            if digest == self._digests.get(path):
+                logger.debug(f"Pillar file {path} is not changed")
+                continue
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_text_atomic(path, text)
+            self._digests[path] = digest
+            changed.append(path)
+        return changed
 
     # TODO test
-    def apply(self) -> None:
-        self.dump()
-        self.refresh(self.targets)
+    def apply(self) -> List[Path]:
+        changed = self.dump()
+        metrics.pillar_updates.inc(changed=bool(changed))
+        if changed:
+            self.refresh(self.targets, deferred=PILLAR_REFRESH_DEFERRED)
+        else:
+            logger.debug('Pillar is not changed, refresh is skipped')
+        return changed
 
     @staticmethod
-    def refresh(targets: str = ALL_MINIONS):
-        return pillar_refresh(targets=targets)
+    def refresh(targets: str = ALL_MINIONS, deferred: bool = False):
+        metrics.pillar_refreshes.inc(deferred=deferred)
+        try:
+            if deferred:
+                pillar_refresher.request(targets)
+            else:
+                return pillar_refresh(targets=targets)
+        finally:
+            pillar_cache.invalidate(targets)
 
     @classmethod
     def component_pillar(
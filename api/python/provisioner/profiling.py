@@ -0,0 +1,124 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+import sys
+import time
+from importlib.abc import MetaPathFinder
+from typing import Dict, List
+
+from .vendor import attr
+
+
+@attr.s(auto_attribs=True)
+class ImportTiming:
+    name: str
+    self_time: float = 0
+    total: float = 0
+
+
+class _TimedLoader:
+    """Proxy for a module loader that measures the module execution."""
+
+    def __init__(self, loader, profiler: 'ImportProfiler'):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler._enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(module.__name__)
+
+
+# TODO IMPROVE consider to merge with scheduler timings reporting
+class ImportProfiler(MetaPathFinder):
+    """Collects import time of modules imported after the install.
+
+    The same numbers as ``python -X importtime`` provides but
+    for the modules of interest only and available as a CLI switch.
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, ImportTiming] = {}
+        self._stack: List[List] = []
+        self._finding = set()
+        self._start = None
+
+    def install(self):
+        self._start = time.perf_counter()
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        # delegate to the rest of finders preventing recursion
+        if fullname in self._finding:
+            return None
+
+        self._finding.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(
+                        spec.loader, 'exec_module'
+                    ):
+                        spec.loader = _TimedLoader(spec.loader, self)
+                    return spec
+            return None
+        finally:
+            self._finding.discard(fullname)
+
+    def _enter(self, name):
+        # [name, start, nested modules time]
+        self._stack.append([name, time.perf_counter(), 0])
+
+    def _exit(self, name):
+        _name, start, nested = self._stack.pop()
+        total = time.perf_counter() - start
+        self.timings[name] = ImportTiming(name, total - nested, total)
+        if self._stack:
+            self._stack[-1][2] += total
+
+    def report(self, limit: int = 30) -> str:
+        elapsed = (
+            0 if self._start is None else time.perf_counter() - self._start
+        )
+        lines = [
+            f"startup: {elapsed * 1000:.1f} ms, "
+            f"modules imported: {len(self.timings)}",
+            f"{'self, ms':>10} | {'cumulative, ms':>14} | module"
+        ]
+        for timing in sorted(
+            self.timings.values(), key=lambda t: t.total, reverse=True
+        )[:limit]:
+            lines.append(
+                f"{timing.self_time * 1000:>10.1f} | "
+                f"{timing.total * 1000:>14.1f} | {timing.name}"
+            )
+        return '\n'.join(lines)
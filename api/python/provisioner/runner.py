@@ -16,14 +16,18 @@
 #
 
 import os
+import logging
 from typing import Union, Any
 
 from .vendor import attr
 from . import inputs
-from .salt import provisioner_cmd
-from .commands import commands
+from .salt import provisioner_cmd, pillar_refresher
+from .jobs import jobs_registry
+from .tracing import tracer
 from .errors import ProvisionerError
 
+logger = logging.getLogger(__name__)
+
 
 # TODO TESTS
 @attr.s(auto_attribs=True)
@@ -44,6 +48,29 @@ class SimpleRunner:
     def extract_positional_args(cls, kwargs):
         return inputs.ParserFiller.extract_positional_args(cls, kwargs)
 
+    def run_salt_job(self, command: str, *args, **kwargs):
+        """Runs the command by the local salt minion.
+
+        Salt authenticates the caller (if credentials are set)
+        before the command is started.
+        """
+        try:
+            res = provisioner_cmd(
+                command,
+                fun_args=args,
+                fun_kwargs=kwargs,
+                nowait=self.nowait
+            )
+        except ProvisionerError:
+            raise
+        except Exception as exc:
+            raise ProvisionerError(repr(exc)) from exc
+
+        if self.nowait:
+            # res is a job id
+            jobs_registry.add(res, command, args, kwargs)
+        return res
+
     # TODO TYPING
     def run(self, command: Union[str, Any], *args, **kwargs):
 
@@ -57,17 +84,24 @@ class SimpleRunner:
         )
 
         if salt_job:
-            try:
-                return provisioner_cmd(
-                    command,
-                    fun_args=args,
-                    fun_kwargs=kwargs,
-                    nowait=self.nowait
-                )
-            except ProvisionerError:
-                raise
-            except Exception as exc:
-                raise ProvisionerError(repr(exc)) from exc
+            return self.run_salt_job(command, *args, **kwargs)
         else:
+            # Note. imported here to not load commands for
+            #       CLI arguments parsing
+            from .commands import commands
             cmd = commands[command]
-            return cmd.run(*args, **kwargs)
+            try:
+                with tracer.command(command):
+                    res = cmd.run(*args, **kwargs)
+            except Exception:
+                # Note. not to mask the command error
+                try:
+                    pillar_refresher.flush()
+                except Exception:
+                    logger.exception('Deferred pillar refresh failed')
+                raise
+            else:
+                # pillar updates should be visible for the minions
+                # once the command is done
+                pillar_refresher.flush()
+                return res
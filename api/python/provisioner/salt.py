@@ -16,31 +16,38 @@
 #
 
 from abc import ABC, abstractmethod
-import salt.config
-from salt.client import LocalClient, Caller
-from salt.runner import RunnerClient
 from typing import (
     List, Union, Dict, Tuple, Iterable, Any, Callable, Type, Optional
 )
-from salt.client.ssh.client import SSHClient
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import json
 import logging
+import threading
+import time
 
 from .vendor import attr
 from .config import (
    ALL_MINIONS, LOCAL_MINION,
-   PRVSNR_USER_FILEROOT_DIR
+   PRVSNR_USER_FILEROOT_DIR,
+   SSH_CONTROL_PERSIST
 )
 from .errors import (
     ProvisionerError,
     SaltError, SaltNoReturnError,
     SaltCmdRunError, SaltCmdResultError,
-    PrvsnrCmdNotFinishedError, PrvsnrCmdNotFoundError
+    PrvsnrCmdNotFinishedError, PrvsnrCmdNotFoundError,
+    YumRollbackError
 )
+from . import ssh
 from .ssh import copy_id
 from .values import is_special
 from ._api_cli import process_cli_result
-from .utils import load_yaml
+from .utils import load_yaml, backoff_delays
+from .jobs import jobs_registry, JobRecord
+from .tracing import tracer, Span
+from . import metrics
+from .log_results import LazyResult
 
 logger = logging.getLogger(__name__)
 
@@ -428,6 +435,7 @@ def salt_local_client():
     #      lead to Authentication error, so always recreate it
     #      as a workaround for now
     if not _salt_local_client or True:
+        from salt.client import LocalClient
         _salt_local_client = LocalClient()
     return _salt_local_client
 
@@ -435,6 +443,8 @@ def salt_local_client():
 def salt_runner_client():
     global _salt_runner_client
     if not _salt_runner_client:
+        import salt.config
+        from salt.runner import RunnerClient
         __opts__ = salt.config.client_config('/etc/salt/master')
         _salt_runner_client = RunnerClient(opts=__opts__)
     return _salt_runner_client
@@ -443,6 +453,8 @@ def salt_runner_client():
 def salt_caller():
     global _salt_caller
     if not _salt_caller:
+        import salt.config
+        from salt.client import Caller
         __opts__ = salt.config.minion_config('/etc/salt/minion')
         _salt_caller = Caller(mopts=__opts__)
     return _salt_caller
@@ -451,12 +463,47 @@ def salt_caller():
 def salt_caller_local():
     global _salt_caller_local
     if not _salt_caller_local:
+        import salt.config
+        from salt.client import Caller
         __opts__ = salt.config.minion_config('/etc/salt/minion')
         __opts__['file_client'] = 'local'
         _salt_caller_local = Caller(mopts=__opts__)
     return _salt_caller_local
 
 
+def _trace_salt_res(span, salt_res):
+    """Adds jid, per minion details and the payload size to a span."""
+    if not tracer.enabled or span is None:
+        return
+
+    if not isinstance(salt_res, dict):
+        # async call returns a job id
+        span.set(jid=salt_res)
+        return
+
+    minions = {}
+    for minion_id, ret in salt_res.items():
+        if not isinstance(ret, dict):
+            continue
+        if 'jid' in ret:
+            span.set(jid=ret['jid'])
+        minions[minion_id] = dict(retcode=ret.get('retcode'))
+        # states report their durations in milliseconds
+        if isinstance(ret.get('ret'), dict):
+            durations = [
+                _ret['duration'] for _ret in ret['ret'].values()
+                if isinstance(_ret, dict)
+                and isinstance(_ret.get('duration'), (int, float))
+            ]
+            if durations:
+                minions[minion_id]['duration'] = sum(durations) / 1000
+
+    span.set(
+        minions=minions,
+        payload_size=len(json.dumps(salt_res, default=str))
+    )
+
+
 # TODO TEST EOS-8473
 @attr.s(auto_attribs=True)
 class SaltClientBase(ABC):
@@ -504,37 +551,34 @@ class SaltClientBase(ABC):
         )
 
         logger.debug(
-            "Running function '{}' on '{}', fun_args: {},"
-            " fun_kwargs: {}, kwargs: {}"
-            .format(
-                fun, targets, fun_args, fun_kwargs, kwargs
-            )
+            "Running function '%s' on '%s', fun_args: %s,"
+            " fun_kwargs: %s, kwargs: %s",
+            fun, targets, fun_args, fun_kwargs, kwargs
         )
 
-        try:
-            salt_res = self._run(cmd_args)
-        except Exception as exc:
-            # TODO too generic
-            raise SaltCmdRunError(cmd_args._as_dict(), exc) from exc
-        else:
+        with tracer.span(
+            'salt.{}'.format(type(self).__name__),
+            fun=fun, targets=targets
+        ) as span:
             try:
+                salt_res = self._run(cmd_args)
+            except Exception as exc:
+                # TODO too generic
+                raise SaltCmdRunError(cmd_args._as_dict(), exc) from exc
+            else:
                 logger.debug(
-                    "Function '{}' on '{}' resulted in {}".format(
-                        fun, targets, salt_res
-                        )
+                    "Function '%s' on '%s' resulted in %s",
+                    fun, targets, LazyResult(salt_res, fun)
                 )
-            except Exception as exc:
-                if (type(exc).__name__ == 'OSError' and exc.strerror == 'Message too long'):  # noqa: E501
-                    logger.exception("Exception Skipped: {}".format(str(exc.strerror)))  # noqa: E501
-                else:
-                    raise exc
 
-        res = self.parse_res(salt_res, cmd_args)
+            _trace_salt_res(span, salt_res)
 
-        if res.fails:
-            raise SaltCmdResultError(cmd_args._as_dict(), res.fails)
-        else:
-            return res.results
+            res = self.parse_res(salt_res, cmd_args)
+
+            if res.fails:
+                raise SaltCmdResultError(cmd_args._as_dict(), res.fails)
+            else:
+                return res.results
 
     def state_apply(self, state: str, targets=ALL_MINIONS, **kwargs):
         return self.run(
@@ -550,10 +594,10 @@ class SaltClientBase(ABC):
 # TODO TEST EOS-8473
 @attr.s(auto_attribs=True)
 class SaltClient(SaltClientBase):
-    # FIXME
-    _client: SSHClient = attr.ib(init=False, default=None)
+    _client: Any = attr.ib(init=False, default=None)
 
     def __attrs_post_init__(self):
+        from salt.client import LocalClient
         self._client = LocalClient(c_path=str(self.c_path))
 
     @property
@@ -579,10 +623,17 @@ class SaltClient(SaltClientBase):
 class SaltSSHClient(SaltClientBase):
     roster_file: str = None
     ssh_options: Optional[Dict] = None
+    # if set ssh connections are multiplexed using control sockets
+    # inside the dir and kept open for `control_persist` seconds
+    control_dir: Optional[Path] = attr.ib(
+        converter=attr.converters.optional(Path), default=None
+    )
+    control_persist: int = SSH_CONTROL_PERSIST
 
-    _client: SSHClient = attr.ib(init=False, default=None)
+    _client: Any = attr.ib(init=False, default=None)
 
     def __attrs_post_init__(self):
+        from salt.client.ssh.client import SSHClient
         self._client = SSHClient(c_path=str(self.c_path))
 
     @property
@@ -617,7 +668,11 @@ class SaltSSHClient(SaltClientBase):
                         user=roster.get(target, {}).get('user'),
                         port=roster.get(target, {}).get('port'),
                         priv_key_path=roster.get(target, {}).get('priv'),
-                        ssh_options=exc.cmd_args.get('kw').get('ssh_options'),
+                        # Note. a new connection is required
+                        #       to verify the key
+                        ssh_options=ssh.drop_control_options(
+                            exc.cmd_args.get('kw').get('ssh_options') or []
+                        ),
                         force=True
                     )
                 else:
@@ -672,10 +727,25 @@ class SaltSSHClient(SaltClientBase):
             kwargs['roster_file'] = str(roster_file)
         if ssh_options is None:
             ssh_options = self.ssh_options
+        if self.control_dir and not any(
+            ssh.is_control_option(opt) for opt in (ssh_options or [])
+        ):
+            ssh.ensure_control_dir(self.control_dir)
+            # the masters might be used by the callers, idle ones are
+            # also stopped by ssh itself after `control_persist` seconds
+            ssh.close_control_masters_at_exit(self.control_dir)
+            ssh_options = list(ssh_options or []) + ssh.control_options(
+                self.control_dir, self.control_persist
+            )
         if ssh_options:
             kwargs['ssh_options'] = ssh_options
         return super().run(*args, **kwargs)
 
+    def close(self):
+        """Stops multiplexed connections masters if any."""
+        if self.control_dir:
+            ssh.close_control_masters(self.control_dir)
+
 
 def local_minion_id():
     global _local_minion_id
@@ -718,6 +788,7 @@ def _salt_runner_cmd(  # noqa: C901 FIXME
     fun_args: Union[Tuple, None] = None,
     fun_kwargs: Union[Dict, None] = None,
     nowait=False,
+    span: Optional[Span] = None,
     **kwargs
 ):
     # TODO FEATURE not yet supported
@@ -757,6 +828,9 @@ def _salt_runner_cmd(  # noqa: C901 FIXME
     except Exception as exc:
         raise SaltCmdRunError(cmd_args._as_dict(), exc) from exc
 
+    if tracer.enabled and span is not None:
+        span.set(payload_size=len(json.dumps(salt_res, default=str)))
+
     if not salt_res:
         raise SaltNoReturnError(
             cmd_args._as_dict(), 'Empty salt result: {}'.format(salt_res)
@@ -807,25 +881,23 @@ def runner_function_run(
     **kwargs
 ):
     logger.debug(
-        "Running runner function '{}', fun_args: {},"
-        " fun_kwargs: {}, kwargs: {}"
-        .format(
-            fun, fun_args, fun_kwargs, kwargs
-        )
+        "Running runner function '%s', fun_args: %s,"
+        " fun_kwargs: %s, kwargs: %s",
+        fun, fun_args, fun_kwargs, kwargs
     )
 
     try:
-        res = _salt_runner_cmd(
-            fun, fun_args=fun_args, fun_kwargs=fun_kwargs, **kwargs
-        )
+        with tracer.span('salt.runner', fun=fun) as span:
+            res = _salt_runner_cmd(
+                fun, fun_args=fun_args, fun_kwargs=fun_kwargs, span=span,
+                **kwargs
+            )
     except Exception:
         logger.exception("Salt runner command failed")
         raise
 
     logger.debug(
-        "Runner function '{}' resulted in {}".format(
-            fun, res
-        )
+        "Runner function '%s' resulted in %s", fun, LazyResult(res, fun)
     )
 
     return res
@@ -838,6 +910,7 @@ def _salt_client_cmd(
     fun_args: Union[Tuple, None] = None,
     fun_kwargs: Union[Dict, None] = None,
     nowait=False,
+    span: Optional[Span] = None,
     **kwargs
 ):
     # TODO log username / password ??? / eauth
@@ -858,6 +931,8 @@ def _salt_client_cmd(
         # TODO too generic
         raise SaltCmdRunError(cmd_args._as_dict(), exc) from exc
 
+    _trace_salt_res(span, salt_res)
+
     if not salt_res:
         reason = (
             'Async API returned empty result: {}'.format(salt_res) if nowait
@@ -892,26 +967,33 @@ def function_run(
     #     https://github.com/saltstack/salt/issues/46905
     # return _salt_caller_cmd(fun, *args, **kwargs)
 
+    pillar_refresher.on_function_run(fun, targets)
+
     logger.debug(
-        "Running function '{}' on '{}', fun_args: {},"
-        " fun_kwargs: {}, kwargs: {}"
-        .format(
-            fun, targets, fun_args, fun_kwargs, kwargs
-        )
+        "Running function '%s' on '%s', fun_args: %s,"
+        " fun_kwargs: %s, kwargs: %s",
+        fun, targets, fun_args, fun_kwargs, kwargs
     )
 
     try:
-        res = _salt_client_cmd(
-            targets, fun, fun_args=fun_args, fun_kwargs=fun_kwargs, **kwargs
-        )
+        with tracer.span(
+            'salt.local', fun=fun, targets=targets,
+            tgt_type=kwargs.get('tgt_type', 'glob'),
+            nowait=kwargs.get('nowait', False)
+        ) as span, metrics.track(
+            metrics.salt_calls, metrics.salt_call_duration, fun=fun
+        ):
+            res = _salt_client_cmd(
+                targets, fun, fun_args=fun_args, fun_kwargs=fun_kwargs,
+                span=span, **kwargs
+            )
     except Exception:
         logger.exception("Salt client command failed")
         raise
 
     logger.debug(
-        "Function '{}' on '{}' resulted in {}".format(
-            fun, targets, res
-        )
+        "Function '%s' on '%s' resulted in %s",
+        fun, targets, LazyResult(res, fun)
     )
 
     return res
@@ -921,10 +1003,122 @@ def pillar_get(targets=ALL_MINIONS):
     return function_run('pillar.items', targets=targets)
 
 
+def pillar_keys_get(
+    keys: Iterable[str], targets=ALL_MINIONS, default=None, delimiter='/'
+):
+    """Gets only the requested keypaths from the minions' pillar.
+
+    Returns ``{minion_id: {keypath: value}}``, ``default`` is used
+    as a value for missed keypaths.
+    """
+    # Note. an environment makes pillar.item compile the pillar on the fly
+    #       as pillar.items does instead of using the in-memory one that
+    #       might be stale (refresh is asynchronous), the environment
+    #       itself is ignored since 'pillarenv_from_saltenv' is not set
+    fun_kwargs = dict(delimiter=delimiter, saltenv='base')
+    if default is not None:
+        fun_kwargs['default'] = default
+    return function_run(
+        'pillar.item',
+        fun_args=list(keys),
+        fun_kwargs=fun_kwargs,
+        targets=targets
+    )
+
+
+def pillar_subtrees_get(keys: Iterable[str], targets=ALL_MINIONS):
+    """Gets only the requested keypaths using custom execution module.
+
+    Returns ``{minion_id: {keypath: value}}``, missed keypaths
+    are omitted. Requires 'prvsnr_pillar' module synced to the minions.
+    """
+    return function_run(
+        'prvsnr_pillar.subtrees',
+        fun_args=list(keys),
+        targets=targets
+    )
+
+
 def pillar_refresh(targets=ALL_MINIONS):
     return function_run('saltutil.refresh_pillar', targets=targets)
 
 
+@attr.s(auto_attribs=True)
+class PillarRefreshStats:
+    requested: int = 0
+    issued: int = 0
+
+    @property
+    def saved(self):
+        return self.requested - self.issued
+
+
+# TODO IMPROVE EOS-12076 coalesce pillar refresh for salt-ssh calls
+class PillarRefresher:
+    """Coalesces pillar refresh requests.
+
+    Pillar updates mark the targets as dirty and a single refresh
+    is issued lazily before the next salt function call that might
+    depend on the pillar (or explicitly by ``flush``).
+    """
+
+    # functions that don't need an up to date pillar
+    independent_funs = ('saltutil.', 'grains.', 'test.')
+
+    def __init__(self):
+        self._dirty = set()
+        # Note. the lock is held during a refresh, so concurrent callers
+        #       wait for it to complete
+        self._lock = threading.RLock()
+        self.stats = PillarRefreshStats()
+
+    @property
+    def pending(self):
+        return set(self._dirty)
+
+    def request(self, targets=ALL_MINIONS):
+        with self._lock:
+            self._dirty.add(targets)
+            self.stats.requested += 1
+
+    def refreshed(self, targets=ALL_MINIONS):
+        with self._lock:
+            if targets == ALL_MINIONS:
+                self._dirty.clear()
+            else:
+                self._dirty.discard(targets)
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+
+            pending = (
+                [ALL_MINIONS] if ALL_MINIONS in self._dirty
+                else sorted(self._dirty)
+            )
+            for targets in pending:
+                pillar_refresh(targets=targets)
+                self.stats.issued += 1
+            self._dirty.clear()
+
+            logger.debug(f"Pillar refresh requests coalesced: {self.stats}")
+
+    def on_function_run(self, fun: str, targets=ALL_MINIONS):
+        if fun == 'saltutil.refresh_pillar':
+            self.refreshed(targets)
+        elif self._dirty and not fun.startswith(self.independent_funs):
+            self.flush()
+
+    def reset(self):
+        with self._lock:
+            self._dirty.clear()
+            self.stats = PillarRefreshStats()
+
+
+pillar_refresher = PillarRefresher()
+
+
 # TODO test
 # TODO IMPROVE EOS-9484 think about better alternative to get separated
 #      stderr and stdout streams that makes sense sometimes even if a command
@@ -1028,18 +1222,133 @@ def provisioner_cmd(
             return process_provisioner_cmd_res(res)
 
 
+def _state_of_task(states: List[State], sls: str) -> Optional[State]:
+    # the longest matched state wins since states might be nested
+    # (e.g. 'components.ha' and 'components.ha.haproxy')
+    res = None
+    for state in states:
+        if sls == state.name or sls.startswith(f"{state.name}."):
+            if res is None or len(state.name) > len(res.name):
+                res = state
+    return res
+
+
+# TODO IMPROVE tasks that come from sls included outside of the state
+#      sub-tree are attributed to the previous state in the run order,
+#      it is an approximation
+def split_states_result(states: List[State], res: Dict) -> Dict:
+    """Splits a result of a batched state.apply per a state.
+
+    :param states: The list of states applied in the batch
+    :param res: Salt result as returned by ``function_run``, a dictionary
+        of a form ``{<target>: {<task-id>: <task-result>}}``
+    :return: A dictionary of a form ``{<state>: {<target>: <tasks>}}``
+        which is the same as ``states_apply`` returns
+    """
+    ret = {state.name: {} for state in states}
+
+    for target, tasks in res.items():
+        if type(tasks) is not dict:
+            # e.g. rendering errors, can't be attributed to any state
+            for state in states:
+                ret[state.name][target] = tasks
+            continue
+
+        for state in states:
+            ret[state.name][target] = {}
+
+        current = states[0]
+        for task_id, task in sorted(
+            tasks.items(),
+            key=lambda item: (
+                item[1].get('__run_num__', 0)
+                if type(item[1]) is dict else 0
+            )
+        ):
+            state = None
+            if type(task) is dict:
+                state = _state_of_task(states, task.get('__sls__', ''))
+            if state is None:
+                state = current
+            current = state
+            ret[state.name][target][task_id] = task
+
+    return ret
+
+
+def states_durations(res: Dict) -> Dict[str, float]:
+    """Returns states durations (in seconds) as reported by salt.
+
+    :param res: A dictionary of a form ``{<state>: {<target>: <tasks>}}``
+        as ``states_apply`` returns
+    :return: A dictionary of a form ``{<state>: <duration>}``, targets
+        apply states in parallel so the longest one is taken
+    """
+    ret = {}
+    for state, targets_res in res.items():
+        durations = [0]
+        for tasks in targets_res.values():
+            if type(tasks) is dict:
+                durations.append(sum(
+                    task['duration'] for task in tasks.values()
+                    if type(task) is dict
+                    and isinstance(task.get('duration'), (int, float))
+                ) / 1000)
+        ret[state] = max(durations)
+    return ret
+
+
 def states_apply(
-    states: List[Union[str, State]], targets=ALL_MINIONS, **kwargs
+    states: List[Union[str, State]],
+    targets=ALL_MINIONS,
+    batch: bool = False,
+    **kwargs
 ):
-    # TODO multiple states at once
-    ret = {}
-    for state in states:
-        state = State(state)
-        res = function_run(
-            'state.apply', fun_args=[state.name], targets=targets, **kwargs
-        )
-        ret[state.name] = res
+    states = [State(state) for state in states]
+
+    with tracer.span(
+        'salt.states_apply',
+        states=[state.name for state in states], targets=targets,
+        batch=batch
+    ):
+        if batch and len(states) > 1:
+            return _states_apply_batch(states, targets=targets, **kwargs)
+
+        ret = {}
+        for state in states:
+            with metrics.state_apply_duration.time(state=state.name):
+                res = function_run(
+                    'state.apply', fun_args=[state.name], targets=targets,
+                    **kwargs
+                )
+            ret[state.name] = res
+
+        return ret
+
+
+def _states_apply_batch(states: List[State], targets=ALL_MINIONS, **kwargs):
+    # stop on the first failure as sequential appliance does
+    fun_kwargs = dict(kwargs.pop('fun_kwargs', None) or {})
+    fun_kwargs.setdefault('failhard', True)
+
+    logger.info(
+        "Applying states {} on {} as a single job"
+        .format([state.name for state in states], targets)
+    )
 
+    # salt renders the pillar and publishes the job only once
+    # for the whole comma separated list of sls
+    res = function_run(
+        'state.apply',
+        fun_args=[','.join(state.name for state in states)],
+        fun_kwargs=fun_kwargs,
+        targets=targets,
+        **kwargs
+    )
+
+    ret = split_states_result(states, res)
+    for state, duration in states_durations(ret).items():
+        metrics.state_apply_duration.observe(duration, state=state)
     return ret
 
 
@@ -1123,10 +1432,15 @@ def copy_to_file_roots(
 class StatesApplier:
     @staticmethod
     def apply(
-        states: List[State], targets: str = ALL_MINIONS, **kwargs
+        states: List[State],
+        targets: str = ALL_MINIONS,
+        batch: bool = False,
+        **kwargs
     ) -> None:
         if states:
-            return states_apply(states=states, targets=targets, **kwargs)
+            return states_apply(
+                states=states, targets=targets, batch=batch, **kwargs
+            )
 
 
 # TODO tests
@@ -1184,22 +1498,48 @@ class SaltJobsRunner:
         )
 
     @classmethod
-    def prvsnr_job_result(cls, jid):
-        jobs = cls.provisioner_jobs()
-        if jid in jobs:
-            job = cls.print_job(jid)
-            if not job.result:
+    def _job_result(cls, record: JobRecord):
+        if record.finished:
+            return record.result
+
+        job = cls.print_job(record.jid)
+        if not job.result:
+            return None
+
+        cmd_args = SaltClientArgs(
+            targets=job.minions,  # TODO ??? or job.target
+            fun=job.function,
+            fun_args=job.arguments
+        )
+        client_res = SaltClientResult(job.result, cmd_args)
+        jobs_registry.set_result(record.jid, client_res.results)
+        return client_res.results
+
+    @classmethod
+    def prvsnr_job_result(
+        cls, jid, timeout: float = 0, poll_interval: float = 1,
+        poll_interval_max: float = 10
+    ):
+        record = jobs_registry.get(jid)
+        if record is None:
+            # the job was not registered locally (e.g. scheduled
+            # on other node), so search the master's job cache
+            if jid not in cls.provisioner_jobs():
+                raise PrvsnrCmdNotFoundError(jid)
+            record = JobRecord(jid, cmd='')
+
+        deadline = time.monotonic() + timeout
+        while True:
+            res = cls._job_result(record)
+            if res is not None:
+                return process_provisioner_cmd_res(res)
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 raise PrvsnrCmdNotFinishedError(jid)
-            else:
-                cmd_args = SaltClientArgs(
-                    targets=job.minions,  # TODO ??? or job.target
-                    fun=job.function,
-                    fun_args=job.arguments
-                )
-                client_res = SaltClientResult(job.result, cmd_args)
-                return process_provisioner_cmd_res(client_res.results)
-        else:
-            raise PrvsnrCmdNotFoundError(jid)
+
+            time.sleep(min(poll_interval, remaining))
+            poll_interval = min(poll_interval * 2, poll_interval_max)
 
 
 # TODO test
@@ -1208,7 +1548,9 @@ class YumRollbackManager:
     targets: str = ALL_MINIONS
     multiple_targets_ok: bool = False
     pre_rollback_cb: Optional[Callable] = None
+    rollback_timeout: Optional[int] = None
     _last_txn_ids: Dict = attr.ib(init=False, default=attr.Factory(dict))
+    _rollback_done: List = attr.ib(init=False, default=attr.Factory(list))
     _rollback_error: Union[Exception, None] = attr.ib(init=False, default=None)
 
     def _resolve_last_txn_ids(self):
@@ -1221,18 +1563,92 @@ class YumRollbackManager:
             targets=self.targets
         )
 
+    def _wait_rollback_job(self, jid: str, cmd_args: SaltClientArgs):
+        """Waits for a rollback job, returns False on timeout."""
+        deadline = time.monotonic() + self.rollback_timeout
+        for delay in backoff_delays(initial=1, maximum=30):
+            job = SaltJobsRunner.print_job(jid)
+            if job.result:
+                res = SaltClientResult(job.result, cmd_args)
+                if res.fails:
+                    raise SaltCmdResultError(cmd_args._as_dict(), res.fails)
+                return True
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+
+    def _yum_rollback_target(self, target, txn_id) -> Optional[str]:
+        """Rolls back the target, returns a jid if it is still running."""
+        logger.info("Starting rollback on target {}".format(target))
+        start = time.monotonic()
+        cmd = "yum history rollback -y {}".format(txn_id)
+        if self.rollback_timeout is None:
+            cmd_run(cmd, targets=target)
+        else:
+            # Note. the rollback is not interrupted on timeout
+            #       (it would leave the packages in the intermediate
+            #       state), it is reported as still running instead
+            jid = cmd_run(cmd, targets=target, nowait=True)
+            if not self._wait_rollback_job(
+                jid, SaltClientArgs(target, 'cmd.run', [cmd])
+            ):
+                logger.warning(
+                    "Rollback on target {} is still running after {}s,"
+                    " jid: {}".format(target, self.rollback_timeout, jid)
+                )
+                return jid
+        logger.info(
+            "Rollback on target {} is completed in {:.1f}s"
+            .format(target, time.monotonic() - start)
+        )
+        return None
+
     def _yum_rollback(self):
         # TODO IMPROVE minion might be stopped at that moment,
         #      option - use some ssh fallback
-        for target, txn_id in self._last_txn_ids.items():
-            logger.info("Starting rollback on target {}".format(target))
-            cmd_run(
-                "yum history rollback -y {}".format(txn_id),
-                targets=target
-            )
-            logger.info(
-                "Rollback on target {} is completed".format(target)
-            )
+        if not self._last_txn_ids:
+            return
+
+        # targets are rolled back independently (a job per target),
+        # so a failure on one target doesn't stop the others
+        errors = {}
+        running = {}
+        with ThreadPoolExecutor(
+            max_workers=len(self._last_txn_ids),
+            thread_name_prefix='yum-rollback'
+        ) as executor:
+            futures = {
+                executor.submit(
+                    self._yum_rollback_target, target, txn_id
+                ): target
+                for target, txn_id in self._last_txn_ids.items()
+            }
+            for future in as_completed(futures):
+                target = futures[future]
+                try:
+                    jid = future.result()
+                except Exception as exc:
+                    logger.error(
+                        "Rollback on target {} failed: {!r}"
+                        .format(target, exc)
+                    )
+                    errors[target] = exc
+                else:
+                    if jid is not None:
+                        running[target] = jid
+                        continue
+                    self._rollback_done.append(target)
+                    logger.info(
+                        "Rollback progress: {} of {} targets are done"
+                        .format(
+                            len(self._rollback_done), len(self._last_txn_ids)
+                        )
+                    )
+
+        if errors or running:
+            raise YumRollbackError(errors, running=running)
 
     def __enter__(self):
         self._last_txn_ids = self._resolve_last_txn_ids()
@@ -1279,6 +1695,10 @@ class YumRollbackManager:
     def rollback_error(self):
         return self._rollback_error
 
+    @property
+    def rollback_done(self):
+        return self._rollback_done
+
 
 # SALT RESULT FORMATS
 
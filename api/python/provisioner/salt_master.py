@@ -21,7 +21,8 @@ import time
 from .salt import runner_function_run
 from .salt_minion import (
     list_minions,
-    ensure_salt_minions_are_ready
+    ensure_salt_minions_are_ready,
+    minion_presence
 )
 from .utils import ensure
 from .errors import (
@@ -102,6 +103,7 @@ def config_salt_master():
     pid = res['MainPID']
 
     up_minions = list_minions()
+    since = time.time()
 
     # apply new configuration
     res = runner_function_run(
@@ -132,7 +134,9 @@ def config_salt_master():
         # (keeping in mind that minion may try to reconnect only once
         # in a few minutes)
         # TODO IMPROVE make more dynamic based on actual minions configuration
-        ensure_salt_minions_are_ready(up_minions)
+        # Note. the bus of the previous salt-master is gone
+        minion_presence.stop()
+        ensure_salt_minions_are_ready(up_minions, since=since)
 
 
 def ensure_salt_master_is_running():
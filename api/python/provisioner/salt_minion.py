@@ -15,11 +15,14 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
 
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, List, Optional
+import re
+import time
 import logging
 import functools
+import threading
 
-
+from .vendor import attr
 from .config import ALL_MINIONS
 from .errors import ProvisionerError
 from .salt import runner_function_run, StatesApplier, function_run
@@ -27,6 +30,144 @@ from .utils import ensure
 
 logger = logging.getLogger(__name__)
 
+MINION_START_TAG_RE = re.compile(r'^salt/minion/(?P<minion_id>[^/]+)/start$')
+AUTH_TAG = 'salt/auth'
+PRESENCE_TAG = 'salt/presence/present'
+
+# how long a readiness try waits for minions events
+PRESENCE_WAIT = 30  # seconds
+
+
+@attr.s(auto_attribs=True)
+class MinionPresenceTracker:
+    """In-memory minions presence table fed from the master event bus.
+
+    A minion is considered up once it starts, (re-)authenticates
+    or is reported by the ``manage.up`` runner. The table is filled
+    only while the tracker is running and entries never expire there,
+    so the lookups require a moment the minions should be seen since,
+    they are used as a shortcut and callers fall back to the broadcast
+    checks.
+    """
+    c_path: str = '/etc/salt/master'
+    # minion id -> the last time the minion was known to be up
+    seen: Dict[str, float] = attr.ib(init=False, factory=dict)
+    # minion id -> the last minion start time
+    started: Dict[str, float] = attr.ib(init=False, factory=dict)
+    _cond: threading.Condition = attr.ib(
+        init=False, factory=threading.Condition
+    )
+    _stop: threading.Event = attr.ib(init=False, factory=threading.Event)
+    _thread: Optional[threading.Thread] = attr.ib(init=False, default=None)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _connect(self):
+        import salt.config
+        import salt.utils.event
+        opts = salt.config.client_config(self.c_path)
+        return salt.utils.event.get_master_event(
+            opts, opts['sock_dir'], listen=True
+        )
+
+    # TODO TEST EOS-12076
+    def _listen(self, event):
+        while not self._stop.is_set():
+            try:
+                if event is None:
+                    event = self._connect()
+                ret = event.get_event(wait=1, full=True)
+            except Exception as exc:
+                # the bus is gone with salt-master restart
+                logger.debug(
+                    f"Master event bus is not available: {exc!r}, "
+                    "reconnecting"
+                )
+                event = None
+                self._stop.wait(1)
+                continue
+
+            if ret:
+                self.on_event(ret.get('tag', ''), ret.get('data') or {})
+
+    def start(self) -> bool:
+        """Starts the tracking if it is possible, returns the status."""
+        if self.running:
+            return True
+
+        try:
+            event = self._connect()
+        except Exception as exc:
+            logger.warning(
+                f"Minions presence tracking is not available: {exc!r}"
+            )
+            return False
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._listen, args=(event,),
+            name='minion-presence', daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        # the table is not updated anymore
+        with self._cond:
+            self.seen.clear()
+            self.started.clear()
+
+    def on_event(self, tag: str, data: Dict):
+        now = time.time()
+        match = MINION_START_TAG_RE.match(tag)
+        with self._cond:
+            if match:
+                minion_id = match.group('minion_id')
+                self.seen[minion_id] = self.started[minion_id] = now
+            elif tag == AUTH_TAG and data.get('act') == 'accept':
+                self.seen[data['id']] = now
+            elif tag == PRESENCE_TAG:
+                for minion_id in data.get('present', []):
+                    self.seen[minion_id] = now
+            else:
+                return
+            self._cond.notify_all()
+
+    def update(self, minions: Iterable[str]):
+        now = time.time()
+        with self._cond:
+            for minion_id in minions:
+                self.seen[minion_id] = now
+            self._cond.notify_all()
+
+    def _check(self, table: Dict, targets: Iterable, since: float) -> bool:
+        return all(
+            minion_id in table and table[minion_id] >= since
+            for minion_id in targets
+        )
+
+    def is_up(self, targets: Iterable, since: float):
+        with self._cond:
+            return self._check(self.seen, targets, since)
+
+    def is_started(self, targets: Iterable, since: float):
+        with self._cond:
+            return self._check(self.started, targets, since)
+
+    def wait(self, check: Callable, timeout: float) -> bool:
+        """Waits for the table changes until the check passes."""
+        with self._cond:
+            return self._cond.wait_for(check, timeout)
+
+
+minion_presence = MinionPresenceTracker()
+
 
 # TODO TEST
 # case 1: config_salt_minions raises if no active minions found
@@ -42,19 +183,52 @@ def list_minions():
             timeout=1, gather_job_timeout=1
         )
     )
-    return list(res)
+    minions = list(res)
+    minion_presence.update(minions)
+    return minions
 
 
-# TODO TEST
-def check_salt_minions_are_ready(targets: List):
+def check_salt_minions_are_ready(
+    targets: List, since: Optional[float] = None
+):
+    if since is not None and minion_presence.is_up(targets, since):
+        return True
     ready = list_minions()
     return not (set(targets) - set(ready))
 
 
-def ensure_salt_minions_are_ready(targets: List):
+def _ensure_presence(
+    check_cb: Callable, presence_check: Callable, timeout: float
+):
+    tracking = minion_presence.start()
+
+    def _check():
+        if check_cb():
+            return True
+        # wake up on minions events instead of sleeping
+        return tracking and minion_presence.wait(
+            presence_check, min(PRESENCE_WAIT, timeout)
+        )
+
+    # minions usually come up in a few seconds, so start with
+    # short intervals
     ensure(
-        functools.partial(check_salt_minions_are_ready, targets),
-        tries=20, wait=30
+        _check, tries=None, wait=1, backoff=2, wait_max=30, timeout=timeout,
+        name=check_cb.func.__name__
+    )
+
+
+def ensure_salt_minions_are_ready(
+    targets: List, since: Optional[float] = None
+):
+    _ensure_presence(
+        functools.partial(check_salt_minions_are_ready, targets, since),
+        # only minions seen during the waiting are trusted by default
+        functools.partial(
+            minion_presence.is_up, targets,
+            time.time() if since is None else since
+        ),
+        timeout=600
     )
 
 # FIXME
@@ -63,9 +237,12 @@ def ensure_salt_minions_are_ready(targets: List):
 
 
 # TODO TEST
-def check_salt_minions_restarted(pids: Dict):
+def check_salt_minions_restarted(pids: Dict, since: Optional[float] = None):
     targets = list(pids)
-    if check_salt_minions_are_ready(targets):
+    if since is not None and minion_presence.is_started(targets, since):
+        return True
+
+    if check_salt_minions_are_ready(targets, since):
         _targets = ','.join(targets)
         res = function_run(
             'service.show', fun_args=('salt-minion',),
@@ -104,6 +281,10 @@ def config_salt_minions(targets=ALL_MINIONS):
     if len(not_running):
         raise ProvisionerError(f'{not_running} minions are not running')
 
+    # minion restarts are caught from the master events
+    minion_presence.start()
+    since = time.time()
+
     # apply new configuration
     res = StatesApplier.apply(
         ['components.provisioner.salt_minion.config'], targets
@@ -120,9 +301,10 @@ def config_salt_minions(targets=ALL_MINIONS):
     )
 
     if changes:
-        ensure(
-            functools.partial(check_salt_minions_restarted, pids),
-            tries=10, wait=1
+        _ensure_presence(
+            functools.partial(check_salt_minions_restarted, pids, since),
+            functools.partial(minion_presence.is_started, list(pids), since),
+            timeout=60
         )
 
     # Note. sync_all in a state doesn't work as expected even
@@ -0,0 +1,185 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+import time
+import logging
+from typing import Callable, Dict, Iterable, List, Optional
+from concurrent.futures import (
+    ThreadPoolExecutor, wait as futures_wait, FIRST_COMPLETED
+)
+
+from .vendor import attr
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(auto_attribs=True)
+class TaskTiming:
+    name: str
+    start: float
+    end: float
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+
+@attr.s(auto_attribs=True)
+class ScheduleReport:
+    timings: Dict[str, TaskTiming] = attr.Factory(dict)
+    critical_path: List[str] = attr.Factory(list)
+    total: float = 0
+
+    def __str__(self):
+        lines = [
+            f"total: {self.total:.1f}s, critical path: "
+            f"{' -> '.join(self.critical_path)}"
+        ]
+        for timing in sorted(self.timings.values(), key=lambda t: t.start):
+            mark = '*' if timing.name in self.critical_path else ' '
+            lines.append(
+                f" {mark} {timing.name}: started at +{timing.start:.1f}s, "
+                f"took {timing.duration:.1f}s"
+            )
+        return '\n'.join(lines)
+
+
+# TODO IMPROVE EOS-12076 consider salt orchestration as an alternative
+@attr.s(auto_attribs=True)
+class DAGScheduler:
+    """Runs tasks concurrently respecting their dependencies.
+
+    A task is started as soon as all the tasks it requires are done
+    and a worker is free, ready tasks are started in the order they
+    are added. No new tasks are started once some task fails, already
+    running ones are waited for and then the first error is raised.
+    """
+    tasks: Dict[str, Callable] = attr.Factory(dict)
+    requires: Dict[str, Iterable[str]] = attr.Factory(dict)
+    max_workers: int = 4
+
+    def add(
+        self, name: str, task: Callable, requires: Optional[Iterable] = None
+    ):
+        if name in self.tasks:
+            raise ValueError(f"task '{name}' is already added")
+        self.tasks[name] = task
+        self.requires[name] = list(requires or [])
+
+    def _pending(self) -> Dict[str, set]:
+        return {
+            name: set(self.requires.get(name, ())) for name in self.tasks
+        }
+
+    def _validate(self):
+        for name, requires in self.requires.items():
+            unknown = set(requires) - set(self.tasks)
+            if unknown:
+                raise ValueError(
+                    f"task '{name}' requires unknown tasks: {sorted(unknown)}"
+                )
+
+        # Kahn's algorithm
+        pending = self._pending()
+        done = set()
+        while True:
+            ready = [n for n, req in pending.items() if not (req - done)]
+            if not ready:
+                break
+            for name in ready:
+                del pending[name]
+                done.add(name)
+
+        if pending:
+            raise ValueError(
+                f"dependency cycle detected among tasks: {sorted(pending)}"
+            )
+
+    def _critical_path(self, timings: Dict[str, TaskTiming]) -> List[str]:
+        if not timings:
+            return []
+
+        # the latest finished task and the chain of its
+        # latest finished requirements
+        name = max(timings, key=lambda n: timings[n].end)
+        res = [name]
+        while True:
+            requires = [r for r in self.requires.get(name, ()) if r in timings]
+            if not requires:
+                break
+            name = max(requires, key=lambda n: timings[n].end)
+            res.append(name)
+        return res[::-1]
+
+    def run(self) -> ScheduleReport:  # noqa: C901 FIXME
+        self._validate()
+
+        report = ScheduleReport()
+        pending = self._pending()
+        done = set()
+        running = {}
+        error = None
+        t0 = time.monotonic()
+
+        def _run_task(name):
+            start = time.monotonic() - t0
+            logger.debug(f"Task '{name}' started")
+            try:
+                return self.tasks[name]()
+            finally:
+                report.timings[name] = TaskTiming(
+                    name, start, time.monotonic() - t0
+                )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                # at most max_workers tasks are submitted, the rest wait
+                # here (in the declaration order) so no task is started
+                # once some task fails
+                while error is None and len(running) < self.max_workers:
+                    ready = [
+                        n for n, req in pending.items() if not (req - done)
+                    ]
+                    if not ready:
+                        break
+                    name = ready[0]
+                    del pending[name]
+                    running[executor.submit(_run_task, name)] = name
+
+                if not running:
+                    break
+
+                finished, _ = futures_wait(
+                    list(running), return_when=FIRST_COMPLETED
+                )
+                for future in finished:
+                    name = running.pop(future)
+                    exc = future.exception()
+                    if exc is None:
+                        done.add(name)
+                    else:
+                        logger.error(f"Task '{name}' failed: {exc!r}")
+                        if error is None:
+                            error = exc
+
+        report.total = time.monotonic() - t0
+        report.critical_path = self._critical_path(report.timings)
+
+        if error is not None:
+            raise error
+
+        return report
@@ -16,12 +16,19 @@
 #
 
 import json
+import base64
 import functools
-from typing import Any
+from typing import Any, Dict, Tuple, Type
 from importlib import import_module
 
 from .errors import PrvsnrTypeDecodeError
 
+# Note. salt depends on msgpack so it is expected to be available
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 
 PRVSNR_TYPE_ATTR = '_prvsnr_type_'
 TO_ARGS_METHOD = 'to_args'
@@ -31,6 +38,13 @@ PRVSNR_TYPE_KEY = PRVSNR_TYPE_ATTR
 PRVSNR_ARGS_KEY = 'args'
 PRVSNR_KWARGS_KEY = 'kwargs'
 
+# msgpack data is framed as a text line to pass through
+# the same channels as JSON does (e.g. salt cmd.run output)
+MSGPACK_FRAME_PREFIX = 'msgpack:'
+
+# (module, class name) -> class
+_types: Dict[Tuple[str, str], Type] = {}
+
 
 class PrvsnrType:
     _prvsnr_type_ = True
@@ -57,40 +71,72 @@ class PrvsnrType:
         return cls(*args, **kwargs)
 
 
+def register_type(cls: Type) -> Type:
+    """Adds a class to the decoding types table.
+
+    Not registered classes are resolved by import on the first
+    decoding and cached as well.
+    """
+    _types[(cls.__module__, cls.__name__)] = cls
+    return cls
+
+
+def resolve_type(m_name: str, cls_name: str) -> Type:
+    try:
+        return _types[(m_name, cls_name)]
+    except KeyError:
+        cls = getattr(import_module(m_name), cls_name)
+        _types[(m_name, cls_name)] = cls
+        return cls
+
+
 # TODO DOC works on for classes defined in the top level of a module
 # TODO explore how pickle iplements similar logic
 #      https://docs.python.org/3.6/library/pickle.html#what-can-be-pickled-and-unpickled
+def encode_prvsnr_type(obj) -> Dict:
+    """Returns a serializable spec of a provisioner type or an exception.
+
+    Raises TypeError for objects of other types.
+    """
+    is_prvsnr_type = hasattr(obj, PRVSNR_TYPE_ATTR)
+    if not (is_prvsnr_type or isinstance(obj, BaseException)):
+        raise TypeError(
+            'Object of type {} is not serializable'
+            .format(type(obj).__name__)
+        )
+
+    try:
+        cls = type(obj)
+        res = {PRVSNR_TYPE_KEY: [cls.__module__, cls.__name__]}
+
+        to_args = (
+            getattr(obj, TO_ARGS_METHOD, None) if is_prvsnr_type else None
+        )
+        if to_args is None:
+            args, kwargs = PrvsnrType.to_args_default(obj)
+        else:
+            args, kwargs = to_args()
+
+        if args:
+            res[PRVSNR_ARGS_KEY] = args
+        if kwargs:
+            res[PRVSNR_KWARGS_KEY] = kwargs
+    # it is expected that encoder's 'default' method
+    # should either return an encodeable representation of an
+    # object or raise a TypeError
+    # https://docs.python.org/3.6/library/json.html#basic-usage
+    except Exception as exc:
+        raise TypeError(
+            'Failed to encode object {}: error {}'
+            .format(obj, exc)
+        )
+    return res
+
+
 class PrvsnrJSONEncoder(json.JSONEncoder):
     def default(self, obj):
         if hasattr(obj, PRVSNR_TYPE_ATTR) or isinstance(obj, BaseException):
-            try:
-                cls = type(obj)
-                res = {PRVSNR_TYPE_KEY: [cls.__module__, cls.__name__]}
-
-                if hasattr(obj, PRVSNR_TYPE_ATTR):
-                    args, kwargs = getattr(
-                        obj, TO_ARGS_METHOD,
-                        functools.partial(PrvsnrType.to_args_default, obj)
-                    )()
-                else:  # BaseException
-                    args, kwargs = PrvsnrType.to_args_default(obj)
-
-                if args:
-                    res[PRVSNR_ARGS_KEY] = args
-                if kwargs:
-                    res[PRVSNR_KWARGS_KEY] = kwargs
-            # it is expected that encoder's 'default' method
-            # should either return an encodeable representation of an
-            # object or raise a TypeError
-            # https://docs.python.org/3.6/library/json.html#basic-usage
-            except Exception as exc:
-                raise TypeError(
-                    'Failed to encode object {}: error {}'
-                    .format(obj, exc)
-                )
-            else:
-                return res
-
+            return encode_prvsnr_type(obj)
         return super().default(obj)
 
 
@@ -107,24 +153,56 @@ def json_prvsnr_type_hook(dct, strict=True):
                     .format(PRVSNR_TYPE_KEY, prvsnr_type)
                 )
 
-            module = import_module(m_name)
-            cls = getattr(module, cls_name)
+            cls = resolve_type(m_name, cls_name)
             args = dct.get(PRVSNR_ARGS_KEY, ())
             kwargs = dct.get(PRVSNR_KWARGS_KEY, {})
-            return getattr(
-                cls, FROM_ARGS_METHOD,
-                functools.partial(PrvsnrType.from_args_default, cls)
-            )(*args, **kwargs)
+            from_args = getattr(cls, FROM_ARGS_METHOD, None)
+            if from_args is None:
+                return PrvsnrType.from_args_default(cls, *args, **kwargs)
+            return from_args(*args, **kwargs)
         except Exception as exc:
             if strict:
                 raise PrvsnrTypeDecodeError(dct, exc)
     return dct
 
 
+_json_hooks = {
+    strict: functools.partial(json_prvsnr_type_hook, strict=strict)
+    for strict in (True, False)
+}
+
+
+def _has_typed_objects(s) -> bool:
+    key = PRVSNR_TYPE_KEY if isinstance(s, str) else PRVSNR_TYPE_KEY.encode()
+    return key in s
+
+
+def packs(obj) -> str:
+    """Encodes an object as a framed msgpack data."""
+    if msgpack is None:
+        raise ValueError('msgpack is not available')
+    data = msgpack.packb(obj, default=encode_prvsnr_type, use_bin_type=True)
+    return MSGPACK_FRAME_PREFIX + base64.b64encode(data).decode()
+
+
+def unpacks(s: str, strict=True):
+    if msgpack is None:
+        raise ValueError('msgpack is not available')
+    data = base64.b64decode(s.strip()[len(MSGPACK_FRAME_PREFIX):])
+    kwargs = {}
+    # strings are packed as is, so the same check works
+    if _has_typed_objects(data):
+        kwargs['object_hook'] = _json_hooks[bool(strict)]
+    return msgpack.unpackb(data, raw=False, strict_map_key=False, **kwargs)
+
+
 def loads(s, strict=True, *args, **kwargs):
-    kwargs['object_hook'] = functools.partial(
-        json_prvsnr_type_hook, strict=strict
-    )
+    if isinstance(s, str) and s.startswith(MSGPACK_FRAME_PREFIX):
+        return unpacks(s, strict=strict)
+
+    # plain JSON is decoded without python level hooks
+    if _has_typed_objects(s):
+        kwargs['object_hook'] = _json_hooks[bool(strict)]
     return json.loads(s, *args, **kwargs)
 
 
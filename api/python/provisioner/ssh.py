@@ -15,10 +15,16 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
 
+import os
+import stat
+import atexit
 import logging
+import hashlib
+import tempfile
 from pathlib import Path
-from typing import Union
+from typing import Union, List, Iterable, Set
 
+from .errors import ProvisionerError, SubprocessCmdError
 from .utils import run_subprocess_cmd
 
 logger = logging.getLogger(__name__)
@@ -66,3 +72,98 @@ def copy_id(
     cmd.append(f"{user}@{host}" if user else host)
 
     run_subprocess_cmd(cmd)
+
+
+# Note. UNIX socket path length is limited (108 bytes on Linux)
+#       and '%C' token is expanded to 40 chars
+CONTROL_DIR_PATH_MAX = 60
+
+
+def control_dir(preferred: Union[Path, str]) -> Path:
+    """Returns a directory for SSH control sockets.
+
+    The preferred one is used if it's short enough for a control
+    socket path, otherwise a directory inside the system temporary
+    directory is derived from it. In both cases the directory should
+    be prepared by ``ensure_control_dir`` before the use.
+    """
+    preferred = Path(str(preferred))
+    if len(str(preferred)) <= CONTROL_DIR_PATH_MAX:
+        return preferred
+    digest = hashlib.sha1(str(preferred).encode()).hexdigest()[:12]
+    return Path(tempfile.gettempdir()) / f'prvsnr-ssh-{digest}'
+
+
+def ensure_control_dir(control_dir: Union[Path, str]) -> Path:
+    """Creates a private directory for control sockets.
+
+    The directory path might be predictable (e.g. in the system
+    temporary directory), so an existing one is accepted only if it is
+    a real directory owned by the current user and not accessible
+    by others.
+    """
+    control_dir = Path(str(control_dir))
+    control_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+    st = os.lstat(str(control_dir))
+    if (
+        not stat.S_ISDIR(st.st_mode)
+        or st.st_uid != os.getuid()
+        or (st.st_mode & 0o077)
+    ):
+        raise ProvisionerError(
+            f"Insecure ssh control directory '{control_dir}': "
+            f"owner uid {st.st_uid}, mode {oct(st.st_mode & 0o777)}"
+        )
+    return control_dir
+
+
+def control_options(
+    control_dir: Union[Path, str], persist: int
+) -> List[str]:
+    return [
+        'ControlMaster=auto',
+        f'ControlPath={control_dir}/%C',
+        f'ControlPersist={persist}'
+    ]
+
+
+def is_control_option(option: str) -> bool:
+    return option.split('=')[0].strip().lower().startswith('control')
+
+
+def drop_control_options(options: Iterable[str]) -> List[str]:
+    return [opt for opt in options if not is_control_option(opt)]
+
+
+def close_control_masters(control_dir: Union[Path, str]):
+    control_dir = Path(str(control_dir))
+    if not control_dir.exists():
+        return
+
+    for sock in control_dir.iterdir():
+        if not sock.is_socket():
+            continue
+        try:
+            # Note. the destination is not used but required
+            run_subprocess_cmd(
+                ['ssh', '-O', 'exit', '-S', str(sock), 'localhost']
+            )
+        except SubprocessCmdError:
+            # might be already stopped
+            logger.debug(f"Failed to stop ssh control master {sock}")
+            if sock.exists():
+                sock.unlink()
+
+
+_exit_control_dirs: Set[Path] = set()
+
+
+def close_control_masters_at_exit(control_dir: Union[Path, str]):
+    """Stops control masters of the directory at the process exit."""
+    _exit_control_dirs.add(Path(str(control_dir)))
+
+
+@atexit.register
+def _close_exit_control_masters():
+    for control_dir in list(_exit_control_dirs):
+        close_control_masters(control_dir)
@@ -0,0 +1,186 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .vendor import attr
+
+logger = logging.getLogger(__name__)
+
+TRACE_FILE_ENV = 'PRVSNR_TRACE_FILE'
+
+
+@attr.s(auto_attribs=True)
+class Span:
+    name: str
+    trace_id: str
+    span_id: str = attr.Factory(lambda: uuid.uuid4().hex[:16])
+    parent_id: Optional[str] = None
+    start: float = attr.Factory(time.time)
+    duration: float = 0
+    success: bool = True
+    error: Optional[str] = None
+    attrs: Dict = attr.Factory(dict)
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+@attr.s(auto_attribs=True)
+class SpanStats:
+    name: str
+    count: int = 0
+    failed: int = 0
+    total: float = 0
+    max: float = 0
+
+
+# TODO IMPROVE EOS-12076 consider OpenTelemetry when it is available
+#      in the product environment
+@attr.s(auto_attribs=True)
+class Tracer:
+    """Records nested timing spans as JSON lines.
+
+    The spans of the current thread are nested, spans started in
+    other threads are attached to the command level span. Nothing
+    is recorded unless a trace file is set.
+    """
+    path: Optional[Path] = attr.ib(
+        converter=attr.converters.optional(Path), default=None
+    )
+    trace_id: str = attr.Factory(lambda: uuid.uuid4().hex)
+    stats: Dict[str, SpanStats] = attr.ib(init=False, factory=dict)
+    _root: Optional[Span] = attr.ib(init=False, default=None)
+    _local: threading.local = attr.ib(init=False, factory=threading.local)
+    _lock: threading.Lock = attr.ib(init=False, factory=threading.Lock)
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def _stack(self) -> List[Span]:
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def current(self) -> Optional[Span]:
+        stack = self._stack()
+        return stack[-1] if stack else self._root
+
+    def _record(self, span: Span):
+        stats_key = (
+            f"{span.name}:{span.attrs['fun']}" if 'fun' in span.attrs
+            else span.name
+        )
+        with self._lock:
+            stats = self.stats.setdefault(stats_key, SpanStats(stats_key))
+            stats.count += 1
+            stats.failed += (not span.success)
+            stats.total += span.duration
+            stats.max = max(stats.max, span.duration)
+
+            try:
+                with self.path.open('a') as f:
+                    f.write(json.dumps(attr.asdict(span), default=str))
+                    f.write('\n')
+            except Exception as exc:
+                logger.warning(f"Failed to write trace span: {exc!r}")
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        span = Span(name, self.trace_id, attrs=attrs)
+        if not self.enabled:
+            yield span
+            return
+
+        parent = self.current()
+        span.parent_id = None if parent is None else parent.span_id
+        stack = self._stack()
+        stack.append(span)
+        start = time.monotonic()
+        try:
+            yield span
+        except BaseException as exc:
+            span.success = False
+            span.error = repr(exc)
+            raise
+        finally:
+            span.duration = time.monotonic() - start
+            stack.pop()
+            self._record(span)
+
+    def _start_trace(self):
+        # a long-lived process (e.g. the daemon) runs many commands,
+        # each one is a separate trace with its own summary
+        with self._lock:
+            self.trace_id = uuid.uuid4().hex
+            self.stats.clear()
+
+    @contextmanager
+    def command(self, name: str, **attrs):
+        """The top level span, a summary is logged at the end."""
+        if self.enabled and self._root is None:
+            self._start_trace()
+        try:
+            with self.span(f"command.{name}", **attrs) as span:
+                if self.enabled and self._root is None:
+                    self._root = span
+                try:
+                    yield span
+                finally:
+                    if self._root is span:
+                        self._root = None
+        finally:
+            if self.enabled:
+                logger.info(
+                    f"Command '{name}' trace summary:\n{self.summary()}"
+                )
+
+    def summary(self, limit: int = 20) -> str:
+        lines = [
+            f"{'total, s':>10} | {'max, s':>8} | {'count':>6} | "
+            f"{'failed':>6} | span"
+        ]
+        with self._lock:
+            stats = sorted(
+                self.stats.values(), key=lambda s: s.total, reverse=True
+            )[:limit]
+        for _stats in stats:
+            lines.append(
+                f"{_stats.total:>10.2f} | {_stats.max:>8.2f} | "
+                f"{_stats.count:>6} | {_stats.failed:>6} | {_stats.name}"
+            )
+        return '\n'.join(lines)
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+        self._root = None
+        self._local = threading.local()
+
+
+tracer = Tracer(os.getenv(TRACE_FILE_ENV))
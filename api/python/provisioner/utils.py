@@ -15,15 +15,24 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
 
+import os
 import yaml
+import random
+import shutil
+import hashlib
 import logging
+import threading
 import time
-from typing import Tuple, Union
+from collections import OrderedDict
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from copy import deepcopy
+from typing import Callable, Tuple, Type, Union
 from pathlib import Path
 from typing import Optional, List
 import subprocess
 
-from . import config
+from .vendor import attr
+from . import config, metrics
 
 from .errors import (
     BadPillarDataError, ProvisionerError, SubprocessCmdError
@@ -31,6 +40,13 @@ from .errors import (
 
 logger = logging.getLogger(__name__)
 
+# libyaml based implementations are much faster, pure python ones
+# are used as a fallback
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+
 
 # TODO TEST
 def validator_path_exists(instance, attribute, value):
@@ -42,8 +58,9 @@ def validator_path_exists(instance, attribute, value):
 
 
 def load_yaml_str(data):
+    """Parses YAML from a string or a text stream."""
     try:
-        return yaml.safe_load(data)
+        return yaml.load(data, Loader=YamlLoader)
     except yaml.YAMLError as exc:
         logger.exception("Failed to load pillar data")
         raise BadPillarDataError(str(exc))
@@ -57,8 +74,9 @@ def dump_yaml_str(
     canonical=False,
     **kwargs
 ):
-    return yaml.safe_dump(
+    return yaml.dump(
         data,
+        Dumper=YamlDumper,
         default_flow_style=default_flow_style,
         canonical=canonical,
         width=width,
@@ -67,15 +85,67 @@ def dump_yaml_str(
     )
 
 
-# TODO streamed read
-def load_yaml(path):
+class YamlCache:
+    """Parsed YAML files keyed by the files state.
+
+    A file is re-read once its inode, mtime or size changes.
+    """
+
+    def __init__(self, maxsize: int = config.YAML_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: Path, key: Tuple):
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != key:
+                return None
+            self._entries.move_to_end(path)
+            return entry
+
+    def set(self, path: Path, key: Tuple, data):
+        with self._lock:
+            self._entries[path] = (key, data)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+yaml_cache = YamlCache()
+
+
+def load_yaml(path, cached=True):
+    """Loads YAML file streaming it to the parser.
+
+    Parsed data is cached, callers get a copy and are free to modify it.
+    """
     path = Path(str(path))
+
+    key = None
+    if cached:
+        stat = path.stat()
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        entry = yaml_cache.get(path, key)
+        if entry is not None:
+            return deepcopy(entry[1])
+
     try:
-        return load_yaml_str(path.read_text())
+        with path.open() as stream:
+            data = load_yaml_str(stream)
     except yaml.YAMLError as exc:
         logger.exception("Failed to load pillar data")
         raise BadPillarDataError(str(exc))
 
+    if cached:
+        yaml_cache.set(path, key, data)
+        return deepcopy(data)
+    return data
+
 
 # TODO streamed write
 def dump_yaml(path, data, **kwargs):
@@ -83,47 +153,277 @@ def dump_yaml(path, data, **kwargs):
     path.write_text(dump_yaml_str(data, **kwargs))
 
 
-# TODO IMPROVE:
-#   - exceptions in check callback
-def ensure(  # noqa: C901 FIXME
-    check_cb, tries=10, wait=1, name=None,
-    expected_exc: Union[Tuple, Exception, None] = None
+def write_text_atomic(path, text: str):
+    """Writes the text to a temporary file and renames it to the path.
+
+    Readers (e.g. salt minions compiling the pillar) never see
+    a partially written file. Permissions of an existing file
+    are preserved.
+    """
+    path = Path(str(path))
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    try:
+        tmp_path.write_text(text)
+        if path.exists():
+            shutil.copymode(str(path), str(tmp_path))
+        os.replace(str(tmp_path), str(path))
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def backoff_delays(
+    initial: float = 1, maximum: float = 30,
+    factor: float = 2, jitter: float = 0.1
 ):
+    """Yields exponentially growing delays randomized by +/- ``jitter``."""
+    delay = initial
+    while True:
+        yield delay * (1 + random.uniform(-jitter, jitter))
+        delay = min(delay * factor, maximum)
+
+
+@attr.s(auto_attribs=True)
+class EnsureStats:
+    name: str
+    tries: int = 0
+    # total time spent in sleeps between tries
+    waited: float = 0
+    elapsed: float = 0
+    succeeded: bool = False
+
+    def __str__(self):
+        return (
+            "'{}' {} after {} tries, waited: {:.1f}s, elapsed: {:.1f}s"
+            .format(
+                self.name, 'succeeded' if self.succeeded else 'failed',
+                self.tries, self.waited, self.elapsed
+            )
+        )
+
+
+@attr.s(auto_attribs=True)
+class _EnsureLoop:
+    """Retry policy shared by the sync and async ``ensure`` versions.
+
+    Tries are started not more often than once per interval,
+    the interval is multiplied by ``backoff`` after each try
+    and limited by ``wait_max``. The time the check takes counts
+    towards the interval, so slow checks are retried without a sleep.
+    """
+    stats: EnsureStats
+    tries: Optional[int] = 10
+    wait: float = 1
+    backoff: float = 1
+    wait_max: Optional[float] = None
+    timeout: Optional[float] = None
+    try_timeout: Optional[float] = None
+    expected_exc: Union[Tuple, Type[Exception], None] = None
+    _start: float = attr.ib(init=False, factory=time.monotonic)
+    _try_start: float = attr.ib(init=False, default=0)
+    _interval: float = attr.ib(init=False, default=None)
+
+    def __attrs_post_init__(self):
+        self._interval = self.wait
+
+    def _remaining(self):
+        if self.timeout is None:
+            return None
+        return self.timeout - (time.monotonic() - self._start)
+
+    def next_try(self) -> Optional[float]:
+        """Starts a try, returns the timeout for it."""
+        self.stats.tries += 1
+        self._try_start = time.monotonic()
+        logger.debug(
+            'Try #{}/{} for {}'
+            .format(self.stats.tries, self.tries, self.stats.name)
+        )
+        timeouts = [
+            t for t in (self.try_timeout, self._remaining()) if t is not None
+        ]
+        return max(min(timeouts), 0) if timeouts else None
+
+    def _finish(self, succeeded):
+        self.stats.succeeded = succeeded
+        self.stats.elapsed = time.monotonic() - self._start
+        metrics.ensure_tries.inc(
+            self.stats.tries, name=self.stats.name,
+            outcome=(
+                metrics.OUTCOME_SUCCESS if succeeded
+                else metrics.OUTCOME_FAILURE
+            )
+        )
+        if succeeded:
+            logger.info(str(self.stats))
+        else:
+            logger.warning(str(self.stats))
+
+    def try_done(self, res, exc: Optional[Exception] = None):
+        """Checks the try result, returns a delay before the next try.
+
+        Returns None if the check succeeded, raises if it shouldn't
+        be retried anymore.
+        """
+        if exc is not None:
+            if isinstance(exc, FuturesTimeoutError) or (
+                self.expected_exc and isinstance(exc, self.expected_exc)
+            ):
+                logger.info(
+                    'Try #{}/{} for {} failed: {!r}'
+                    .format(self.stats.tries, self.tries, self.stats.name, exc)
+                )
+            else:
+                self._finish(False)
+                raise exc
+        elif res:
+            self._finish(True)
+            return None
+
+        remaining = self._remaining()
+        reason = None
+        if self.tries is not None and self.stats.tries >= self.tries:
+            reason = 'no more tries'
+        elif remaining is not None and remaining <= 0:
+            reason = 'timeout {}s is exceeded'.format(self.timeout)
+
+        if reason:
+            self._finish(False)
+            raise (exc or ProvisionerError(reason))
+
+        delay = max(
+            self._interval - (time.monotonic() - self._try_start), 0
+        )
+        if remaining is not None:
+            delay = min(delay, remaining)
+
+        self._interval *= self.backoff
+        if self.wait_max is not None:
+            self._interval = min(self._interval, self.wait_max)
+
+        self.stats.waited += delay
+        return delay
+
+
+def _call_with_timeout(fun: Callable, timeout: Optional[float] = None):
+    if timeout is None:
+        return fun()
+
+    # Note. a thread can't be cancelled, so a hanging call is left
+    #       in a daemon thread not to block the process exit
+    res = {}
+
+    def _run():
+        try:
+            res['ret'] = fun()
+        except BaseException as exc:
+            res['exc'] = exc
+
+    thread = threading.Thread(target=_run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise FuturesTimeoutError(
+            'no response in {}s'.format(timeout)
+        )
+    if 'exc' in res:
+        raise res['exc']
+    return res['ret']
+
+
+def _ensure_name(check_cb, name=None):
     if name is None:
         try:
             name = check_cb.__name__
         except AttributeError:
             name = str(check_cb)
+    return name
+
+
+def ensure(
+    check_cb, tries=10, wait=1, name=None,
+    expected_exc: Union[Tuple, Type[Exception], None] = None,
+    backoff: float = 1,
+    wait_max: Optional[float] = None,
+    timeout: Optional[float] = None,
+    try_timeout: Optional[float] = None
+) -> EnsureStats:
+    """Calls ``check_cb`` until it returns a true value.
+
+    Gives up after ``tries`` tries (None - unlimited) or ``timeout``
+    seconds (None - no deadline), whatever comes first. A try
+    taking more than ``try_timeout`` seconds is considered failed.
+    """
+    loop = _EnsureLoop(
+        EnsureStats(_ensure_name(check_cb, name)),
+        tries=tries, wait=wait, backoff=backoff, wait_max=wait_max,
+        timeout=timeout, try_timeout=try_timeout, expected_exc=expected_exc
+    )
 
-    ntry = 0
     while True:
+        try_timeout = loop.next_try()
         exc = None
-        ntry += 1
-        logger.debug(
-            'Try #{}/{} for {}'
-            .format(ntry, tries, name)
-        )
-
         try:
-            if check_cb():
-                return
+            res = _call_with_timeout(check_cb, try_timeout)
         except Exception as _exc:
-            if expected_exc and isinstance(_exc, expected_exc):
-                logger.info(
-                    'Try #{}/{} for {} failed: {!r}'
-                    .format(ntry, tries, name, _exc)
-                )
-                exc = _exc
-            else:
-                raise
+            res, exc = False, _exc
+
+        delay = loop.try_done(res, exc)
+
+        if delay is None:
+            return loop.stats
+        time.sleep(delay)
+
+
+async def ensure_async(
+    check_cb, tries=10, wait=1, name=None,
+    expected_exc: Union[Tuple, Type[Exception], None] = None,
+    backoff: float = 1,
+    wait_max: Optional[float] = None,
+    timeout: Optional[float] = None,
+    try_timeout: Optional[float] = None
+) -> EnsureStats:
+    """The same as ``ensure`` but for asyncio based callers.
+
+    ``check_cb`` might be a coroutine function, otherwise it is called
+    in the loop's default executor.
+    """
+    # Note. imported here since it takes noticeable time on CLI start
+    import asyncio
+
+    loop = _EnsureLoop(
+        EnsureStats(_ensure_name(check_cb, name)),
+        tries=tries, wait=wait, backoff=backoff, wait_max=wait_max,
+        timeout=timeout, try_timeout=try_timeout, expected_exc=expected_exc
+    )
 
-        if ntry < tries:
-            time.sleep(wait)
+    while True:
+        try_timeout = loop.next_try()
+        if asyncio.iscoroutinefunction(check_cb):
+            check = check_cb()
         else:
-            if exc:
-                raise exc
-            else:
-                raise ProvisionerError('no more tries')
+            check = asyncio.get_event_loop().run_in_executor(None, check_cb)
+
+        exc = None
+        try:
+            res = await asyncio.wait_for(check, try_timeout)
+        except asyncio.TimeoutError:
+            # not the same as the futures one before python 3.11
+            res, exc = False, FuturesTimeoutError(
+                'no response in {}s'.format(try_timeout)
+            )
+        except Exception as _exc:
+            res, exc = False, _exc
+
+        delay = loop.try_done(res, exc)
+
+        if delay is None:
+            return loop.stats
+        await asyncio.sleep(delay)
 
 
 def run_subprocess_cmd(cmd, **kwargs):
@@ -77,6 +77,7 @@ setup(
     entry_points={
         'console_scripts': [
             'provisioner = provisioner.__main__:main',
+            'provisioner-daemon = provisioner.daemon:main',
         ],
     },
     install_requires=[
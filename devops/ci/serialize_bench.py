@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+# Compares provisioner CLI result codecs on a pillar_get like result
+# built from the repo pillar files, and on an error result.
+#
+# Usage: serialize_bench.py [-n NUMBER] [-m MINIONS]
+
+import sys
+import json
+import timeit
+import argparse
+import functools
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_DIR / 'api/python'))
+
+from provisioner import utils, serialize, values  # noqa: E402
+from provisioner.errors import SaltCmdResultError  # noqa: E402
+
+
+def pillar_get_res(minions):
+    pillar = {}
+    for path in sorted((REPO_DIR / 'pillar/components').glob('*.sls')):
+        pillar.update(utils.load_yaml(path) or {})
+    return {
+        'ret': {f'srvnode-{i + 1}': pillar for i in range(minions)}
+    }
+
+
+def error_res():
+    return {
+        'exc': SaltCmdResultError(
+            {'fun': 'state.apply', 'targets': '*'},
+            {'srvnode-1': {'some-task': {'result': False}}}
+        ),
+        'value': values.MISSED
+    }
+
+
+def bench(number, minions):
+    hook = functools.partial(serialize.json_prvsnr_type_hook, strict=True)
+    codecs = [
+        (
+            'json indent',
+            functools.partial(serialize.dumps, sort_keys=True, indent=4),
+            lambda s: json.loads(s, object_hook=hook)
+        ),
+        ('json', serialize.dumps, serialize.loads),
+    ]
+    if serialize.msgpack is not None:
+        codecs.append(('msgpack', serialize.packs, serialize.loads))
+    else:
+        print('WARNING: msgpack is not available')
+
+    print(f"rounds: {number}, minions: {minions}")
+    print(
+        f"{'result':>8} | {'codec':>12} | {'size, KiB':>10} | "
+        f"{'dump, ms':>10} | {'load, ms':>10}"
+    )
+    for name, res in (
+        ('pillar', pillar_get_res(minions)), ('error', error_res())
+    ):
+        for codec, dump, load in codecs:
+            data = dump(res)
+            dump_t = timeit.timeit(lambda: dump(res), number=number)
+            load_t = timeit.timeit(lambda: load(data), number=number)
+            print(
+                f"{name:>8} | {codec:>12} | {len(data) / 1024:>10.1f} | "
+                f"{dump_t * 1000 / number:>10.3f} | "
+                f"{load_t * 1000 / number:>10.3f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CLI result codecs benchmark')
+    parser.add_argument(
+        '-n', '--number', type=int, default=100, help='number of rounds'
+    )
+    parser.add_argument(
+        '-m', '--minions', type=int, default=3,
+        help='number of minions in the pillar result'
+    )
+    args = parser.parse_args()
+
+    bench(args.number, args.minions)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+# Compares pure python and libyaml based YAML engines (and the provisioner
+# parsed files cache) on the repo pillar and API spec files.
+#
+# Usage: yaml_bench.py [-n NUMBER] [PATH ...]
+
+import sys
+import timeit
+import argparse
+from pathlib import Path
+
+import yaml
+
+REPO_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_DIR / 'api/python'))
+
+from provisioner import utils  # noqa: E402
+
+DEFAULT_PATHS = (
+    sorted((REPO_DIR / 'pillar/components').glob('*.sls')) +
+    [
+        REPO_DIR / 'api/python/provisioner/api_spec.yaml',
+        REPO_DIR / 'api/python/provisioner/params_spec.yaml'
+    ]
+)
+
+DUMP_KWARGS = dict(
+    default_flow_style=False, canonical=False, width=1, indent=4
+)
+
+
+def bench(paths, number):
+    texts = [path.read_text() for path in paths]
+    data = [yaml.safe_load(text) for text in texts]
+
+    engines = [('python', yaml.SafeLoader, yaml.SafeDumper)]
+    if hasattr(yaml, 'CSafeLoader'):
+        engines.append(('libyaml', yaml.CSafeLoader, yaml.CSafeDumper))
+    else:
+        print('WARNING: libyaml bindings are not available')
+
+    print(
+        f"files: {len(paths)}, total size: "
+        f"{sum(len(t) for t in texts) / 1024:.1f} KiB, rounds: {number}"
+    )
+    print(f"{'engine':>10} | {'load, ms':>10} | {'dump, ms':>10}")
+
+    for name, loader, dumper in engines:
+        load_t = timeit.timeit(
+            lambda: [yaml.load(text, Loader=loader) for text in texts],
+            number=number
+        )
+        dump_t = timeit.timeit(
+            lambda: [
+                yaml.dump(d, Dumper=dumper, **DUMP_KWARGS) for d in data
+            ],
+            number=number
+        )
+        print(
+            f"{name:>10} | {load_t * 1000 / number:>10.2f} | "
+            f"{dump_t * 1000 / number:>10.2f}"
+        )
+
+    utils.yaml_cache.clear()
+    cached_t = timeit.timeit(
+        lambda: [utils.load_yaml(path) for path in paths], number=number
+    )
+    print(f"{'cached':>10} | {cached_t * 1000 / number:>10.2f} | {'-':>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='YAML engines benchmark')
+    parser.add_argument(
+        '-n', '--number', type=int, default=20, help='number of rounds'
+    )
+    parser.add_argument(
+        'paths', metavar='PATH', nargs='*', type=Path,
+        help='YAML files, repo pillar and API spec files by default'
+    )
+    args = parser.parse_args()
+
+    bench(args.paths or DEFAULT_PATHS, args.number)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+# How to test:
+# $ salt-call saltutil.sync_modules
+# $ salt-call prvsnr_pillar.subtrees cluster/type release/target_build
+
+
+def _subtree(pillar, keypath, delimiter):
+    res = pillar
+    for key in keypath.split(delimiter):
+        try:
+            res = res[key]
+        except (KeyError, TypeError, IndexError):
+            raise KeyError(keypath)
+    return res
+
+
+def subtrees(*keypaths, delimiter='/'):
+    """Return only the requested subtrees of the pillar.
+
+    The pillar is compiled on the fly (as pillar.items does) since
+    the in-memory one might be stale, only the subtrees are returned.
+
+    Args:
+      keypaths: pillar keypaths, e.g. 'cluster/srvnode-1/hostname'.
+      delimiter: keypath parts delimiter.
+
+    Returns:
+      A dict of keypaths and their values, missed keypaths are omitted.
+    """
+    pillar = __salt__['pillar.items']()
+    res = {}
+    for keypath in keypaths:
+        try:
+            res[keypath] = _subtree(pillar, keypath, delimiter)
+        except KeyError:
+            pass
+    return res
@@ -24,6 +24,10 @@ from shutil import copyfile
 
 import commons
 
+# libyaml based loader / dumper are much faster if available
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YamlDumper = getattr(yaml, 'CDumper', yaml.Dumper)
+
 # How to test:
 # $ salt-call saltutil.clear_cache
 # $ salt-call saltutil.sync_modules && salt-call s3server.conf_update "/opt/seagate/cortx/provisioner/srv/_modules/files/samples/s3config.yaml" s3server
@@ -59,7 +63,7 @@ def conf_update(
   config_dict = {}
   with open(name, "r") as fd:
     try:
-      config_dict = yaml.safe_load(fd)
+      config_dict = yaml.load(fd, Loader=_YamlLoader)
     except yaml.YAMLError as yerr:
       print("Error parsing yaml file {0}".format(yerr))
       return False
@@ -71,13 +75,14 @@ def conf_update(
     copyfile(name, name + '.bak')
 
   config_dict = commons._update_dict(config_dict, pillar_dict)
-  yaml.add_representer(list, _blockseqlist_rep)
-  yaml.add_representer(type(None), _represent_none)
+  yaml.add_representer(list, _blockseqlist_rep, Dumper=_YamlDumper)
+  yaml.add_representer(type(None), _represent_none, Dumper=_YamlDumper)
 
   with open(name, 'w') as fd:
     yaml.dump(
         config_dict,
         stream=fd,
+        Dumper=_YamlDumper,
         default_flow_style = False,
         canonical=False,
         width=1,
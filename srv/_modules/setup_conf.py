@@ -22,6 +22,9 @@ import errno
 import os
 import yaml
 
+# libyaml based loader is much faster if available
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 def conf_cmd(conf_file, conf_key):
   if not os.path.exists(conf_file):
     print("[ERROR   ] Setup config file {0} doesn't exist.".format(conf_file))
@@ -36,7 +39,7 @@ def conf_cmd(conf_file, conf_key):
   ret_val = ''
   with open(conf_file, 'r') as fd:
     try:
-      yml_dict = yaml.safe_load(fd)
+      yml_dict = yaml.load(fd, Loader=_YamlLoader)
 
       script_path = yml_dict[conf_key.split(':')[0]][conf_key.split(':')[1]]['script']
       if script_path and os.path.exists(script_path):
@@ -17,15 +17,141 @@
 
 import logging
 import os
-import salt.client
+import re
 import subprocess
+import time
 import yaml
 
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
 logger = logging.getLogger(__name__)
 
+# libyaml based loader is much faster if available
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+RSYNC = "/usr/bin/rsync"
+RSYNC_ARGS = ["--archive", "--recursive", "--compress", "--stats"]
+# max number of rsync processes running at the same time
+TRANSFER_WORKERS = 8
+
+_RSYNC_BYTES_SENT_RE = re.compile(r'^Total bytes sent: ([\d,.]+)', re.M)
+
+
+def _load_yaml(path):
+    with path.open() as stream:
+        return yaml.load(stream, Loader=_YamlLoader)
+
+
+def _backup_files(component):
+    """
+    Returns the list of files in the section <component>:backup:files
+    of the component setup.yaml or None if the file doesn't exist.
+    """
+    yaml_file = Path(f'/opt/seagate/cortx/{component}/conf/setup.yaml')
+    if not yaml_file.exists():
+        msg = f"ERROR: {str(yaml_file)} doesn't exist."
+        # raise Exception(msg)
+        logger.error(msg)
+        return None
+
+    yaml_dict = _load_yaml(yaml_file)
+    backup = yaml_dict[component].get("backup") or {}
+    return list(backup.get("files") or [])
+
+
+def _peer_nodes():
+    # Note. pillar data is shared between calls, so shouldn't be mutated
+    return [
+        node for node in __pillar__["cluster"]["node_list"]
+        if node != __grains__["id"]
+    ]
+
+
+def _group_by_dir(files):
+    res = defaultdict(list)
+    for file in files:
+        file_path = Path(file)
+        res[file_path.parent].append(file_path.name)
+    return res
+
+
+def _rsync(src_dir, files, dst, args=()):
+    """
+    Transfers all the files (relative to src_dir) by a single rsync
+    run, returns the number of bytes sent.
+    """
+    cmd = (
+        [RSYNC] + RSYNC_ARGS + list(args)
+        + ["--from0", "--files-from=-", f"{src_dir}{os.sep}", dst]
+    )
+
+    proc_completed = subprocess.run(
+        cmd,
+        input='\0'.join(str(f) for f in files).encode(),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+
+    try:
+        proc_completed.check_returncode()
+        msg = (
+            "Command exited with retcode: 0 "
+            f"stdout: {proc_completed.stdout}"
+        )
+        logger.debug(msg)
+    except subprocess.CalledProcessError:
+        msg = (
+            f"Command: {' '.join(cmd)} "
+            f"Error: {proc_completed.stderr}"
+        )
+        logger.error(msg)
+        raise Exception(proc_completed.stderr)
+
+    match = _RSYNC_BYTES_SENT_RE.search(proc_completed.stdout.decode())
+    return int(re.sub(r'[,.]', '', match.group(1))) if match else 0
+
+
+def _transfer(component, transfers):
+    """
+    Runs the transfers (node, src_dir, files, dst, args) concurrently,
+    logs bytes / time per node and raises if any of them failed.
+    """
+    if not transfers:
+        return
+
+    report = defaultdict(lambda: [0, 0])
+    errors = []
+
+    def _run(node, *args):
+        start = time.monotonic()
+        sent = _rsync(*args)
+        return node, sent, time.monotonic() - start
+
+    with ThreadPoolExecutor(
+        max_workers=min(len(transfers), TRANSFER_WORKERS)
+    ) as executor:
+        futures = [executor.submit(_run, *t) for t in transfers]
+        for future, transfer in zip(futures, transfers):
+            try:
+                node, sent, duration = future.result()
+            except Exception as exc:
+                errors.append(f"{transfer[0]}: {exc}")
+            else:
+                report[node][0] += sent
+                report[node][1] += duration
+
+    for node, (sent, duration) in report.items():
+        logger.info(
+            f"{component} files transfer to {node}: "
+            f"{sent} bytes sent in {duration:.1f}s"
+        )
+
+    if errors:
+        raise Exception('; '.join(errors))
+
 
 def sync_files(component="provisioner"):
     """
@@ -40,51 +166,19 @@ def sync_files(component="provisioner"):
     /var/lib/seagate/provisioner/provisioner_custom_config.conf
     on srvnode-2.
     """
-    yaml_file = Path(f'/opt/seagate/cortx/{component}/conf/setup.yaml')
-    if not yaml_file.exists():
-        msg = f"ERROR: {str(yaml_file)} doesn't exist."
-        # raise Exception(msg)
-        logger.error(msg)
+    files = _backup_files(component)
+    if files is None:
         return False
 
-    # This generic logic should always work
-    node_list = __pillar__["cluster"]["node_list"]
-    node_list.remove(__grains__["id"])
-    node = node_list[0]
-
-    yaml_dict = yaml.safe_load(yaml_file.read_text())
-
-    if (
-        "backup" in yaml_dict[component]
-        and "files" in yaml_dict[component]["backup"]
-    ):
-        cmd_args = ["/usr/bin/rsync", "--archive", "--compress", "--update"]
-        for file in yaml_dict[component]["backup"]["files"]:
-            dst = Path(file).parent
-            cmd = cmd_args
-            cmd.extend([file, f"{node}:{dst}"])
-
-            proc_completed = subprocess.run(
-                cmd,
-                # shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-
-            try:
-                proc_completed.check_returncode()
-                msg = (
-                    "Command exited with retcode: 0 "
-                    f"stdout: {proc_completed.stdout}"
-                )
-                logger.debug(msg)
-            except subprocess.CalledProcessError:
-                msg = (
-                        f"Command: {' '.join(cmd)} "
-                        f"Error: {proc_completed.stderr}"
-                    )
-                logger.error(msg)
-                raise Exception(proc_completed.stderr)
+    # all the files by a single rsync per peer node,
+    # the full paths are kept (--files-from implies --relative)
+    _transfer(
+        component,
+        [
+            (node, '', files, f"{node}:{os.sep}", ["--update"])
+            for node in _peer_nodes()
+        ] if files else []
+    )
     return True
 
 
@@ -102,69 +196,28 @@ def backup_files(component="provisioner"):
     /var/lib/srvnode-1/provisioner/provisioner_custom_config.conf
     on srvnode-2.
     """
-
-    yaml_file = Path(f'/opt/seagate/cortx/{component}/conf/setup.yaml')
-    if not yaml_file.exists():
-        msg = f"ERROR: {str(yaml_file)} doesn't exist."
-        # raise Exception(msg)
-        logger.error(msg)
+    files = _backup_files(component)
+    if files is None:
         return False
 
-    # This generic logic should always work
     current_node = __grains__["id"]
-    node_list = __pillar__["cluster"]["node_list"]
-    node_list.remove(current_node)
-    node = node_list[0]
-
-    yaml_dict = yaml.safe_load(yaml_file.read_text())
-
-    if (
-        "backup" in yaml_dict[component]
-        and "files" in yaml_dict[component]["backup"]
-    ):
-        salt_client = salt.client.LocalClient()
-        cmd_args = [
-                    "/usr/bin/rsync", "--archive", "--compress",
-                    "--exclude", f"{node}"
+    files = [file for file in files if Path(file).exists()]
+
+    # a single rsync per source directory and peer node,
+    # the destination directory is created by the remote side
+    transfers = []
+    for node in _peer_nodes():
+        for src_dir, names in _group_by_dir(files).items():
+            dst = src_dir.joinpath(current_node)
+            transfers.append((
+                node, str(src_dir), names, f"{node}:{dst}{os.sep}",
+                [
+                    "--exclude", f"{node}",
+                    f"--rsync-path=mkdir -p {dst} && {RSYNC}"
                 ]
+            ))
 
-        for file in yaml_dict[component]["backup"]["files"]:
-            file_path = Path(file)
-            if not file_path.exists():
-                continue
-            dst = file_path.parent.joinpath(current_node)
-
-            salt_client.cmd(f'{node}', 'file.mkdir', [f"{str(dst)}"])
-
-            cmd = (
-                    cmd_args
-                    + [str(file_path), f"{node}:{dst}{os.sep}"]
-            )
-            # salt_client.cmd(f'{node}', 'cmd.run', [f"{' '.join(cmd)}"])
-
-            # For pathlib: https://bugs.python.org/issue21039
-            proc_completed = subprocess.run(
-                [f"{' '.join(cmd)}"],
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-
-            try:
-                proc_completed.check_returncode()
-                msg = (
-                    "Command exited with retcode: 0 "
-                    f"stdout: {proc_completed.stdout}"
-                )
-                logger.debug(msg)
-            except subprocess.CalledProcessError:
-                msg = (
-                    f"Command: {' '.join(cmd)} "
-                    f"Error: {proc_completed.stderr}"
-                )
-                logger.error(msg)
-                raise Exception(proc_completed.stderr)
-
+    _transfer(component, transfers)
     return True
 
 
@@ -176,17 +229,13 @@ def restore_files(component="provisioner"):
 
     The location of file on source node shall be the appended
     with source node name directory on the destination node.
-    E.g. /var/lib/seagate/provisioner/provisioner_custom_config.conf
-    on srvnode-1 shall be copied to
-    /var/lib/seagate/provisioner/srvnode-1/provisioner_custom_config.conf
-    on srvnode-2.
+    E.g. /var/lib/seagate/provisioner/srvnode-1/provisioner_custom_config.conf
+    on srvnode-2 shall be copied to
+    /var/lib/seagate/provisioner/provisioner_custom_config.conf
+    on srvnode-1.
     """
-
-    yaml_file = Path(f'/opt/seagate/cortx/{component}/conf/setup.yaml')
-    if not yaml_file.exists():
-        msg = f"ERROR: {str(yaml_file)} doesn't exist."
-        # raise Exception(msg)
-        logger.error(msg)
+    files = _backup_files(component)
+    if files is None:
         return False
 
     # Execute on replacement_node only
@@ -204,53 +253,26 @@ def restore_files(component="provisioner"):
         replacement_node and
         __grains__["id"] != replacement_node
     ):
-        # node_list = __pillar__["cluster"]["node_list"]
-        # node_list.remove(replacement_node)
-        # node = node_list[0]
-
-        yaml_dict = yaml.safe_load(yaml_file.read_text())
-
-        if (
-            "backup" in yaml_dict[component] and
-            "files" in yaml_dict[component]["backup"]
-        ):
-            cmd_args = ["/usr/bin/rsync", "--archive", "--compress"]
-
-            for file in yaml_dict[component]["backup"]["files"]:
-                file_path = Path(file)
-                src = file_path.parent.joinpath(
-                    replacement_node,
-                    file_path
-                )
-                if not src.exists():
-                    msg = f"Specified file ({src}) doesn't exist for restore. "
-                    "Skipping..."
-                    logger.error(msg)
-                    continue
-
-                dst = file_path.parent
-                cmd = cmd_args + [f"{src}", f"{replacement_node}:{dst}{os.sep}"]
-                proc_completed = subprocess.run(
-                        [f"{' '.join(cmd)}"],
-                        shell=True,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE
-                )
-
-                try:
-                    proc_completed.check_returncode()
-                    msg = (
-                        "Command exited with retcode: 0 "
-                        f"stdout: {proc_completed.stdout}"
-                    )
-                    logger.debug(msg)
-                except subprocess.CalledProcessError:
-                    msg = (
-                        f"Command: {' '.join(cmd)} "
-                        f"Error: {proc_completed.stderr}"
+        transfers = []
+        for dst_dir, names in _group_by_dir(files).items():
+            src_dir = dst_dir.joinpath(replacement_node)
+            existing = []
+            for name in names:
+                if src_dir.joinpath(name).exists():
+                    existing.append(name)
+                else:
+                    logger.error(
+                        f"Specified file ({src_dir.joinpath(name)}) "
+                        "doesn't exist for restore. Skipping..."
                     )
-                    logger.error(msg)
-                    raise Exception(proc_completed.stderr)
+
+            if existing:
+                transfers.append((
+                    replacement_node, str(src_dir), existing,
+                    f"{replacement_node}:{dst_dir}{os.sep}", []
+                ))
+
+        _transfer(component, transfers)
     else:
         logger.warning(
             f"Replacement_node is {replacement_node} "
@@ -20,15 +20,71 @@ import pytest
 from provisioner.vendor import attr
 
 from provisioner import (
-    ALL_MINIONS, param, pillar, inputs, log
+    ALL_MINIONS, param, pillar, inputs, log, jobs, salt, utils, tracing,
+    log_results, metrics
 )
 
+from .helper import mock_pillar_keys_get
+
 
 @pytest.fixture(scope='session', autouse=True)
 def unit():
     pass
 
 
+@pytest.fixture(autouse=True)
+def pillar_cache_clean():
+    pillar.pillar_cache.invalidate()
+    yield
+    pillar.pillar_cache.invalidate()
+
+
+@pytest.fixture(autouse=True)
+def yaml_cache_clean():
+    utils.yaml_cache.clear()
+    yield
+    utils.yaml_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def pillar_refresher_clean():
+    salt.pillar_refresher.reset()
+    yield
+    salt.pillar_refresher.reset()
+
+
+@pytest.fixture(autouse=True)
+def tracer_clean(monkeypatch):
+    # tracing is enabled explicitly by the tests that need it
+    monkeypatch.setattr(tracing.tracer, 'path', None)
+    tracing.tracer.reset()
+    yield
+    tracing.tracer.reset()
+
+
+@pytest.fixture(autouse=True)
+def jobs_registry(monkeypatch, tmpdir_function):
+    monkeypatch.setattr(
+        jobs.jobs_registry, 'path', tmpdir_function / 'jobs'
+    )
+    return jobs.jobs_registry
+
+
+@pytest.fixture(autouse=True)
+def metrics_clean(monkeypatch):
+    monkeypatch.setattr(metrics.registry, 'path', None)
+    metrics.registry.reset()
+    yield
+    metrics.registry.reset()
+
+
+@pytest.fixture(autouse=True)
+def results_spill(monkeypatch, tmpdir_function):
+    spill = log_results.ResultsSpill(tmpdir_function / 'results')
+    monkeypatch.setattr(log_results, 'results_spill', spill)
+    return spill
+
+
 @pytest.fixture
 def pillar_dir(monkeypatch, tmpdir_function):
     pillar_dir = tmpdir_function / 'pillar'
@@ -83,6 +139,13 @@ def test_pillar(monkeypatch):
     monkeypatch.setattr(
         pillar, 'pillar_get', pillar_get
     )
+    monkeypatch.setattr(
+        pillar, 'pillar_keys_get', mock_pillar_keys_get(_pillar)
+    )
+    monkeypatch.setattr(
+        pillar, 'pillar_subtrees_get',
+        mock_pillar_keys_get(_pillar, skip_missed=True)
+    )
 
     return _pillar
 
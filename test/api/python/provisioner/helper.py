@@ -18,6 +18,7 @@
 from functools import partial
 from typing import Callable, Any, Tuple, Dict
 from provisioner.vendor import attr
+from provisioner.config import ALL_MINIONS, LOCAL_MINION
 
 # TODO consider to use mocks (e.g. pytest-mock plugin)
 
@@ -68,3 +69,28 @@ def mock_fun_echo(mock_res=None, mock_key=None):
 
 def mock_fun_result(res, mock_res=None, mock_key=None):
     return partial(mock_fun, res, mock_res=mock_res, mock_key=mock_key)
+
+
+def mock_pillar_keys_get(_pillar, skip_missed=False):
+    def pillar_keys_get(
+        keys, targets=ALL_MINIONS, default=None, delimiter='/', **kwargs
+    ):
+        res = {}
+        for minion_id, minion_pillar in _pillar.items():
+            if targets not in (ALL_MINIONS, LOCAL_MINION, minion_id):
+                continue
+            res[minion_id] = {}
+            for key in keys:
+                value = minion_pillar
+                for part in key.split(delimiter):
+                    if not isinstance(value, dict) or part not in value:
+                        value = '' if default is None else default
+                        break
+                    value = value[part]
+                else:
+                    res[minion_id][key] = value
+                    continue
+                if not skip_missed:
+                    res[minion_id][key] = value
+        return res
+    return pillar_keys_get
@@ -206,3 +206,26 @@ def test_api_cli_set_env(mocker, patch_logging):
 
     api._run_cmd([cmd_name], env=env)
     run_m.assert_called_once_with([cmd_name], env=expected)
+
+
+@pytest.mark.parametrize(
+    'output,expected',
+    [('msgpack', 'msgpack'), ('json', 'json'), ('yaml', 'json'),
+     ('plain', 'json')]
+)
+def test_api_cli_output(mocker, output, expected):
+    mocker.patch.object(
+        api, 'prvsnr_config', mocker.Mock(env={'PRVSNR_OUTPUT': output})
+    )
+    assert api._cli_output() == expected
+
+
+def test_api_cli_process_msgpack_result():
+    stdout = _prepare_output('msgpack', prepare_res('msgpack', ret={1: 2}))
+    assert api.process_cli_result(stdout) == {1: 2}
+
+    stdout = _prepare_output(
+        'msgpack', prepare_res('msgpack', exc=ProvisionerError('some error'))
+    )
+    with pytest.raises(ProvisionerError):
+        api.process_cli_result(stdout)
@@ -20,7 +20,7 @@ from copy import deepcopy
 
 from provisioner.vendor import attr
 from provisioner.cli_parser import parse_args, ParseRes
-from provisioner import errors, config
+from provisioner import errors, config, cli_parser
 from provisioner.base import prvsnr_config
 import builtins
 
@@ -31,6 +31,13 @@ import builtins
 # HELPERS AND FIXTURES
 
 
+@pytest.fixture(autouse=True)
+def parser_cache_path(monkeypatch, tmpdir_function):
+    res = tmpdir_function / 'cli_parser.pickle'
+    monkeypatch.setattr(cli_parser, 'parser_cache_path', res)
+    return res
+
+
 # --version provides a way for separate check for
 # some args not allowed as standalone ones
 def _parse_args(*args, add_version=True):
@@ -195,3 +202,48 @@ def test_cli_parser_no_print_for_machine_output(
     )
 
     print_mock.reset_mock()
+
+
+def test_cli_parser_loads_requested_command_only(mocker):
+    from provisioner.commands import commands, Commands
+
+    load_m = mocker.spy(Commands, '_load')
+    mocker.patch.object(commands, '_commands', {})
+
+    parse_args(['--version'])
+    load_m.assert_not_called()
+
+    # the first run builds the cache
+    res = parse_args(['get_result', 'some-cmd-id'])
+    assert res.cmd == 'get_result'
+    assert load_m.call_count == len(commands)
+
+    # cached spec is used then
+    load_m.reset_mock()
+    mocker.patch.object(commands, '_commands', {})
+    res = parse_args(['get_result', 'some-cmd-id'])
+    assert res.kwargs['cmd_id'] == 'some-cmd-id'
+    load_m.assert_not_called()
+
+
+def test_cli_parser_spec_cache(mocker, parser_cache_path):
+    build_m = mocker.spy(cli_parser, '_build_parser_spec')
+
+    spec = cli_parser.parser_spec()
+    assert parser_cache_path.exists()
+    assert (parser_cache_path.stat().st_mode & 0o777) == 0o600
+    assert list(cli_parser.parser_spec()) == list(spec)
+    assert build_m.call_count == 1
+
+    # invalidated once sources are changed
+    mocker.patch.object(
+        cli_parser, '_parser_spec_key', autospec=True,
+        return_value='some-other-key'
+    )
+    cli_parser.parser_spec()
+    assert build_m.call_count == 2
+
+    # not trusted if writable by others
+    parser_cache_path.chmod(0o666)
+    cli_parser.parser_spec()
+    assert build_m.call_count == 3
@@ -19,6 +19,7 @@ import pytest
 import builtins
 import typing
 import functools
+import threading
 
 from provisioner.vendor import attr
 from provisioner.errors import (
@@ -38,7 +39,9 @@ from provisioner import (
 from provisioner.salt import State, YumRollbackManager
 from provisioner.values import MISSED
 
-from .helper import mock_fun_echo, mock_fun_result
+from .helper import (
+    mock_fun_echo, mock_fun_result, mock_pillar_keys_get
+)
 
 
 # HELPERS and FIXTURE
@@ -79,6 +82,10 @@ def storage_enclosure_data(mocker):
     mocker.patch.object(
         pillar, 'pillar_get', autospec=True, return_value=test_pillar
     )
+    mocker.patch.object(
+        pillar, 'pillar_keys_get', autospec=True,
+        side_effect=mock_pillar_keys_get(test_pillar)
+    )
 
     return (ip, user, passwd)
 
@@ -509,6 +516,81 @@ def test_commnads_update_component(patch_logging, mocker):
     )
 
 
+def test_commnads_update_components(mocker):
+    target = 'some-target'
+    independent = ('sspl', 'csm', 'uds')
+    # independent components are expected to be updated at the same time
+    barrier = threading.Barrier(len(independent), timeout=5)
+    done = []
+
+    def apply_side_effect(states, targets, **kwargs):
+        component = states[0].split('.', 1)[1].rsplit('.', 1)[0]
+        assert targets == target
+        assert kwargs == dict(fun_kwargs=dict(concurrent=True))
+        for required in commands.sw_update_components_requires.get(
+            component, []
+        ):
+            assert required in done
+        if component in independent:
+            barrier.wait()
+        done.append(component)
+
+    mocker.patch.object(
+        commands.StatesApplier, 'apply', autospec=True,
+        side_effect=apply_side_effect
+    )
+
+    report = commands._update_components(
+        commands.sw_update_components, target, workers=3
+    )
+
+    assert sorted(done) == sorted(commands.sw_update_components)
+    assert set(report.timings) == set(commands.sw_update_components)
+
+
+def test_commnads_update_components_sequential_by_default(mocker):
+    target = 'some-target'
+    done = []
+
+    def apply_side_effect(states, targets, **kwargs):
+        # no concurrent states on the minions by default
+        assert kwargs == {}
+        done.append(states[0].split('.', 1)[1].rsplit('.', 1)[0])
+
+    mocker.patch.object(
+        commands.StatesApplier, 'apply', autospec=True,
+        side_effect=apply_side_effect
+    )
+
+    commands._update_components(commands.sw_update_components, target)
+
+    assert config.SW_UPDATE_WORKERS == 1
+    # the same order as the components are listed
+    assert done == commands.sw_update_components
+
+
+def test_commnads_update_components_stops_on_failure(mocker):
+    target = 'some-target'
+    done = []
+
+    def apply_side_effect(states, targets, **kwargs):
+        component = states[0].split('.', 1)[1].rsplit('.', 1)[0]
+        done.append(component)
+        if component == 'motr':
+            raise RuntimeError('some error')
+
+    mocker.patch.object(
+        commands.StatesApplier, 'apply', autospec=True,
+        side_effect=apply_side_effect
+    )
+
+    with pytest.raises(RuntimeError):
+        commands._update_components(commands.sw_update_components, target)
+
+    # nothing is updated after the failed component
+    assert done == ['motr']
+
+
 @pytest.mark.patch_logging([(commands, ('info',))])
 def test_commnads_apply_provisioner_config(patch_logging, mocker):
     target = 'some-target'
@@ -538,6 +620,7 @@ def mock_swupdate(mocker):
         'ensure_salt_master_is_running',
         '_ensure_update_repos_configuration',
         '_update_component',
+        '_update_components',
         '_apply_provisioner_config'
     ):
         mock = mocker.patch.object(commands, fun, autospec=True)
@@ -612,7 +695,8 @@ def test_commands_SWUpdate_run_happy_path(
         calls['YumRollbackManager'](
             target,
             multiple_targets_ok=True,
-            pre_rollback_cb=commands._pre_yum_rollback
+            pre_rollback_cb=commands._pre_yum_rollback,
+            rollback_timeout=config.SW_UPDATE_ROLLBACK_TIMEOUT
         ),
         calls['YumRollbackManager']().__enter__(),
         calls['YumRollbackManager']()._resolve_last_txn_ids(),
@@ -620,12 +704,7 @@ def test_commands_SWUpdate_run_happy_path(
         calls['_update_component']("provisioner", target),
         calls['config_salt_master'](),
         calls['config_salt_minions'](),
-    ] + [
-        calls['_update_component'](component, target)
-        for component in (
-            'motr', 's3server', 'hare', 'ha.cortx-ha', 'sspl', 'csm', 'uds'
-        )
-    ] + [
+        calls['_update_components'](commands.sw_update_components, target),
         calls['cluster_maintenance_disable'](),
         calls['apply_ha_post_update'](target),
         calls['ensure_cluster_is_healthy'](),
@@ -694,7 +773,8 @@ def test_commands_SWUpdate_run_maintenance_enable_failed(
         calls['YumRollbackManager'](
             target,
             multiple_targets_ok=True,
-            pre_rollback_cb=commands._pre_yum_rollback
+            pre_rollback_cb=commands._pre_yum_rollback,
+            rollback_timeout=config.SW_UPDATE_ROLLBACK_TIMEOUT
         ),
         calls['YumRollbackManager']().__enter__(),
         calls['YumRollbackManager']()._resolve_last_txn_ids(),
@@ -729,17 +809,11 @@ def test_commands_SWUpdate_run_sw_stack_update_failed(
     #      - during salt-master config (first time and on rollback)
     #      - during salt-minions config (first time and on rollback)
     #      - ensure_salt_master_is_running on rollback
-    def apply_side_effect(component, *args, **kwargs):
-        if component == 'motr':
-            raise update_lower_exc
-        else:
-            return mocker.DEFAULT
-
     type(mocks['rollback_ctx']).rollback_error = mocker.PropertyMock(
         return_value=rollback_error
     )
 
-    mocks['_update_component'].side_effect = apply_side_effect
+    mocks['_update_components'].side_effect = update_lower_exc
     expected_exc_t = SWUpdateFatalError if rollback_error else SWUpdateError
     with pytest.raises(expected_exc_t) as excinfo:
         commands.SWUpdate().run(target)
@@ -754,7 +828,8 @@ def test_commands_SWUpdate_run_sw_stack_update_failed(
         calls['YumRollbackManager'](
             target,
             multiple_targets_ok=True,
-            pre_rollback_cb=commands._pre_yum_rollback
+            pre_rollback_cb=commands._pre_yum_rollback,
+            rollback_timeout=config.SW_UPDATE_ROLLBACK_TIMEOUT
         ),
         calls['YumRollbackManager']().__enter__(),
         calls['YumRollbackManager']()._resolve_last_txn_ids(),
@@ -762,7 +837,7 @@ def test_commands_SWUpdate_run_sw_stack_update_failed(
         calls['_update_component']("provisioner", target),
         calls['config_salt_master'](),
         calls['config_salt_minions'](),
-        calls['_update_component']("motr", target),
+        calls['_update_components'](commands.sw_update_components, target),
         calls['YumRollbackManager']().__exit__(
             SWStackUpdateError,
             # XXX semes not valuable to check exact exc and trace as well
@@ -819,7 +894,8 @@ def test_commands_SWUpdate_run_maintenance_disable_failed(
         calls['YumRollbackManager'](
             target,
             multiple_targets_ok=True,
-            pre_rollback_cb=commands._pre_yum_rollback
+            pre_rollback_cb=commands._pre_yum_rollback,
+            rollback_timeout=config.SW_UPDATE_ROLLBACK_TIMEOUT
         ),
         calls['YumRollbackManager']().__enter__(),
         calls['YumRollbackManager']()._resolve_last_txn_ids(),
@@ -827,12 +903,7 @@ def test_commands_SWUpdate_run_maintenance_disable_failed(
         calls['_update_component']("provisioner", target),
         calls['config_salt_master'](),
         calls['config_salt_minions'](),
-    ] + [
-        calls['_update_component'](component, target)
-        for component in (
-            'motr', 's3server', 'hare', 'ha.cortx-ha', 'sspl', 'csm', 'uds'
-        )
-    ] + [
+        calls['_update_components'](commands.sw_update_components, target),
         calls['cluster_maintenance_disable'](),
         calls['YumRollbackManager']().__exit__(
             ClusterMaintenanceDisableError,
@@ -892,7 +963,8 @@ def test_commands_SWUpdate_run_ha_post_update_failed(
         calls['YumRollbackManager'](
             target,
             multiple_targets_ok=True,
-            pre_rollback_cb=commands._pre_yum_rollback
+            pre_rollback_cb=commands._pre_yum_rollback,
+            rollback_timeout=config.SW_UPDATE_ROLLBACK_TIMEOUT
         ),
         calls['YumRollbackManager']().__enter__(),
         calls['YumRollbackManager']()._resolve_last_txn_ids(),
@@ -900,12 +972,7 @@ def test_commands_SWUpdate_run_ha_post_update_failed(
         calls['_update_component']("provisioner", target),
         calls['config_salt_master'](),
         calls['config_salt_minions'](),
-    ] + [
-        calls['_update_component'](component, target)
-        for component in (
-            'motr', 's3server', 'hare', 'ha.cortx-ha', 'sspl', 'csm', 'uds'
-        )
-    ] + [
+        calls['_update_components'](commands.sw_update_components, target),
         calls['cluster_maintenance_disable'](),
         calls['apply_ha_post_update'](target),
         calls['YumRollbackManager']().__exit__(
@@ -966,7 +1033,8 @@ def test_commands_SWUpdate_run_ensure_cluster_is_healthy_failed(
         calls['YumRollbackManager'](
             target,
             multiple_targets_ok=True,
-            pre_rollback_cb=commands._pre_yum_rollback
+            pre_rollback_cb=commands._pre_yum_rollback,
+            rollback_timeout=config.SW_UPDATE_ROLLBACK_TIMEOUT
         ),
         calls['YumRollbackManager']().__enter__(),
         calls['YumRollbackManager']()._resolve_last_txn_ids(),
@@ -974,12 +1042,7 @@ def test_commands_SWUpdate_run_ensure_cluster_is_healthy_failed(
         calls['_update_component']("provisioner", target),
         calls['config_salt_master'](),
         calls['config_salt_minions'](),
-    ] + [
-        calls['_update_component'](component, target)
-        for component in (
-            'motr', 's3server', 'hare', 'ha.cortx-ha', 'sspl', 'csm', 'uds'
-        )
-    ] + [
+        calls['_update_components'](commands.sw_update_components, target),
         calls['cluster_maintenance_disable'](),
         calls['apply_ha_post_update'](target),
         calls['ensure_cluster_is_healthy'](),
@@ -1040,7 +1103,8 @@ def test_commands_SWUpdate_run_maintenance_enable_at_rollback_failed(
         calls['YumRollbackManager'](
             target,
             multiple_targets_ok=True,
-            pre_rollback_cb=commands._pre_yum_rollback
+            pre_rollback_cb=commands._pre_yum_rollback,
+            rollback_timeout=config.SW_UPDATE_ROLLBACK_TIMEOUT
         ),
         calls['YumRollbackManager']().__enter__(),
         calls['YumRollbackManager']()._resolve_last_txn_ids(),
@@ -1048,12 +1112,7 @@ def test_commands_SWUpdate_run_maintenance_enable_at_rollback_failed(
         calls['_update_component']("provisioner", target),
         calls['config_salt_master'](),
         calls['config_salt_minions'](),
-    ] + [
-        calls['_update_component'](component, target)
-        for component in (
-            'motr', 's3server', 'hare', 'ha.cortx-ha', 'sspl', 'csm', 'uds'
-        )
-    ] + [
+        calls['_update_components'](commands.sw_update_components, target),
         calls['cluster_maintenance_disable'](),
         calls['apply_ha_post_update'](target),
         calls['ensure_cluster_is_healthy'](),
@@ -1131,7 +1190,8 @@ def test_commands_SWUpdate_run_post_rollback_fail(
         calls['YumRollbackManager'](
             target,
             multiple_targets_ok=True,
-            pre_rollback_cb=commands._pre_yum_rollback
+            pre_rollback_cb=commands._pre_yum_rollback,
+            rollback_timeout=config.SW_UPDATE_ROLLBACK_TIMEOUT
         ),
         calls['YumRollbackManager']().__enter__(),
         calls['YumRollbackManager']()._resolve_last_txn_ids(),
@@ -1292,3 +1352,107 @@ def test_commands_ShutdownController_happy_path(
             )
         )
     )
+
+
+def test_commands_SetupProvisioner_resolve_connections(mocker):
+    from provisioner.commands import setup_provisioner
+
+    nodes = []
+    for i in (1, 2, 3):
+        node = setup_provisioner.Node(f'srvnode-{i}', f'host{i}')
+        node.grains = setup_provisioner.NodeGrains(
+            fqdn=f'host{i}', ipv4=[f'10.0.0.{i}', f'192.168.0.{i}']
+        )
+        nodes.append(node)
+
+    def cmd_run(cmd, targets, tgt_type):
+        assert tgt_type == 'pcre'
+        assert set(targets.split('|')) == {n.minion_id for n in nodes}
+        res = {}
+        for node in nodes:
+            lines = []
+            for addr in ('host1', 'host2', 'host3'):
+                lines.append(f'{addr} reachable')
+            for i in (1, 2, 3):
+                # 192.168.0.3 is not reachable from srvnode-1
+                lines.append(
+                    f'192.168.0.{i} ' + (
+                        'unreachable' if (
+                            node.minion_id == 'srvnode-1' and i == 3
+                        ) else 'reachable'
+                    )
+                )
+                lines.append(f'10.0.0.{i} unreachable')
+            res[node.minion_id] = '\n'.join(lines)
+        return res
+
+    ssh_client = mocker.Mock()
+    ssh_client.cmd_run.side_effect = cmd_run
+
+    setup_provisioner.SetupProvisioner()._resolve_connections(
+        nodes, ssh_client
+    )
+
+    # single salt-ssh call for all the nodes and addresses
+    ssh_client.cmd_run.assert_called_once()
+    assert nodes[0].ping_addrs == ['host1', '192.168.0.1']
+    assert nodes[1].ping_addrs == ['host2', '192.168.0.2']
+    assert nodes[2].ping_addrs == ['host3']
+
+    ssh_client.cmd_run.side_effect = setup_provisioner.SaltCmdResultError(
+        {}, {'srvnode-2': 'some-error'}
+    )
+    with pytest.raises(setup_provisioner.ProvisionerError):
+        setup_provisioner.SetupProvisioner()._resolve_connections(
+            nodes, ssh_client
+        )
+
+
+def test_commands_ConfigureSetup_run_single_update(mocker, tmpdir_function):
+    from provisioner.commands import configure_setup
+
+    pillar_set_m = mocker.patch.object(
+        configure_setup.PillarSet, 'run', autospec=True
+    )
+    mocker.patch.object(
+        configure_setup.ConfigureSetup, '_validate_params', autospec=True
+    )
+
+    config_path = tmpdir_function / 'config.ini'
+    config_path.write_text(
+        '[cluster]\n'
+        'cluster_ip=1.2.3.4\n'
+        'mgmt_vip=\n'
+        '[srvnode-1]\n'
+        'hostname=srvnode-1.localhost\n'
+        'network.data_nw.iface=eth1,eth2\n'
+    )
+
+    configure_setup.ConfigureSetup().run(str(config_path), 1)
+
+    pillar_set_m.assert_called_once()
+    set_cmd, *args = pillar_set_m.call_args[0]
+    assert set_cmd.input_type is commands.inputs.PillarItemsList
+    assert list(
+        commands.inputs.PillarItemsList.from_args(*args).pillar_items()
+    ) == [
+        (pillar.PillarKey('cluster/cluster_ip'), '1.2.3.4'),
+        (pillar.PillarKey('cluster/mgmt_vip'), commands.inputs.UNCHANGED),
+        (
+            pillar.PillarKey('cluster/srvnode-1/hostname'),
+            'srvnode-1.localhost'
+        ),
+        (
+            pillar.PillarKey('cluster/srvnode-1/network/data_nw/iface'),
+            ['eth1', 'eth2']
+        ),
+        (pillar.PillarKey('cluster/node_list'), ['srvnode-1']),
+        (pillar.PillarKey('s3clients/ip'), '1.2.3.4'),
+        (pillar.PillarKey('cluster/type'), 'single'),
+    ]
+
+    # nothing is updated if some node is missed
+    pillar_set_m.reset_mock()
+    with pytest.raises(ValueError):
+        configure_setup.ConfigureSetup().run(str(config_path), 2)
+    pillar_set_m.assert_not_called()
@@ -0,0 +1,157 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+import socket
+import threading
+import tempfile
+import pytest
+from pathlib import Path
+
+from provisioner import daemon, _api, _api_cli, runner, serialize
+from provisioner.errors import ProvisionerError
+
+
+@pytest.fixture
+def api_server(monkeypatch):
+    # Note. pytest tmp dirs might exceed AF_UNIX path length limit
+    with tempfile.TemporaryDirectory() as tmpdir:
+        server = daemon.ApiServer(Path(tmpdir) / 'api.sock')
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        monkeypatch.setattr(_api_cli, '_daemon_socket', server.path)
+        yield server
+        server.shutdown()
+        server.server_close()
+
+
+def test_daemon_api_call(mocker, api_server):
+    run_m = mocker.patch.object(
+        _api, 'run', autospec=True, return_value={'some-minion': 'value'}
+    )
+    auth_init_m = mocker.patch.object(_api, 'auth_init', autospec=True)
+    subprocess_run_m = mocker.patch.object(
+        _api_cli.subprocess, 'run', autospec=True
+    )
+
+    assert _api_cli.pillar_get('some/key', targets='some-minion') == {
+        'some-minion': 'value'
+    }
+    run_m.assert_called_once_with(
+        'pillar_get', 'some/key',
+        targets='some-minion'
+    )
+    assert auth_init_m.call_args_list == [
+        mocker.call(None, None, eauth='pam'),
+        mocker.call(None, None)
+    ]
+    subprocess_run_m.assert_not_called()
+
+
+def test_daemon_api_call_fails(mocker, api_server):
+    mocker.patch.object(
+        _api, 'run', autospec=True,
+        side_effect=ProvisionerError('some error')
+    )
+
+    with pytest.raises(ProvisionerError) as excinfo:
+        _api_cli.get_params('some-param')
+
+    assert excinfo.value.args == ('some error',)
+
+
+def test_daemon_non_root_requires_credentials(mocker, api_server):
+    run_m = mocker.patch.object(
+        _api, 'run', autospec=True, return_value=None
+    )
+    provisioner_cmd_m = mocker.patch.object(
+        runner, 'provisioner_cmd', autospec=True, return_value='some-ret'
+    )
+    mocker.patch.object(daemon, 'peer_uid', autospec=True, return_value=1000)
+
+    with pytest.raises(PermissionError):
+        _api_cli.get_params('some-param')
+    provisioner_cmd_m.assert_not_called()
+
+    mocker.patch.object(_api_cli, '_username', 'someuser')
+    mocker.patch.object(_api_cli, '_password', 'somepasswd')
+    assert _api_cli.get_params('some-param') == 'some-ret'
+
+    # non-root calls are authenticated by salt before any side effects
+    run_m.assert_not_called()
+    provisioner_cmd_m.assert_called_once_with(
+        'get_params', fun_args=('some-param',), fun_kwargs={}, nowait=False
+    )
+
+
+def test_daemon_unknown_fun(api_server):
+    with pytest.raises(ValueError):
+        _api_cli._api_call('some-fun')
+
+
+def test_daemon_fallback_to_cli(mocker, tmpdir_function):
+    mocker.patch.object(
+        _api_cli, '_daemon_socket', tmpdir_function / 'absent.sock'
+    )
+    run_cmd_m = mocker.patch.object(
+        _api_cli, '_run_cmd', autospec=True, return_value='some-ret'
+    )
+
+    assert _api_cli.get_params('some-param') == 'some-ret'
+    run_cmd_m.assert_called_once()
+
+
+def test_daemon_fallback_to_cli_no_access(mocker, api_server):
+    mocker.patch.object(
+        _api_cli.socket.socket, 'connect', autospec=True,
+        side_effect=PermissionError(13, 'Permission denied')
+    )
+    run_cmd_m = mocker.patch.object(
+        _api_cli, '_run_cmd', autospec=True, return_value='some-ret'
+    )
+
+    assert _api_cli.get_params('some-param') == 'some-ret'
+    run_cmd_m.assert_called_once()
+
+
+def _raw_call(server, data: bytes, shutdown: bool = True):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(5)
+    try:
+        sock.connect(str(server.path))
+        sock.sendall(data)
+        if shutdown:
+            sock.shutdown(socket.SHUT_WR)
+        return serialize.loads(daemon.recv_all(sock).decode())
+    finally:
+        sock.close()
+
+
+def test_daemon_request_timeout(monkeypatch, api_server):
+    monkeypatch.setattr(api_server, 'request_timeout', 0.1)
+
+    # the write side is not closed by the client
+    res = _raw_call(api_server, b'{"fun": ', shutdown=False)
+    assert isinstance(res['exc'], socket.timeout)
+
+
+def test_daemon_request_size_max(mocker, monkeypatch, api_server):
+    monkeypatch.setattr(api_server, 'request_size_max', 10)
+    call_m = mocker.patch.object(api_server, 'call', autospec=True)
+
+    res = _raw_call(api_server, b' ' * 100)
+    assert isinstance(res['exc'], ValueError)
+    assert str(res['exc']) == 'Data size exceeds 10 bytes'
+    call_m.assert_not_called()
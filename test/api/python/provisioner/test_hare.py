@@ -14,9 +14,11 @@
 # For any questions about this software or licensing,
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
+import json
 import pytest
 
 from provisioner.config import LOCAL_MINION
+from provisioner.errors import ClusterHealthWaitError, SaltCmdResultError
 from provisioner import hare
 
 from .helper import mock_fun_result, mock_fun_echo
@@ -146,28 +148,94 @@ def test_ensure_cluster_is_stopped(monkeypatch):
     assert stopped
 
 
-def test_ensure_cluster_is_started(monkeypatch):
+def test_ensure_cluster_is_started(mocker):
+    cluster_start_m = mocker.patch.object(hare, 'cluster_start', autospec=True)
+    wait_m = mocker.patch.object(
+        hare, 'wait_cluster_is_healthy', autospec=True
+    )
+
+    assert hare.ensure_cluster_is_started() is wait_m.return_value
+
+    cluster_start_m.assert_called_once_with()
+    wait_m.assert_called_once_with(timeout=300)
+
 
-    started = True
-    _tries = None
-    _wait = None
-    _cb = None
+def hctl_status(online=(True, True), stopped=0, failed=0):
+    return json.dumps({
+        'nodes': [
+            {'name': f'srvnode-{i + 1}', 'online': _online}
+            for i, _online in enumerate(online)
+        ],
+        'resources': {
+            'statistics': {'started': 10, 'stopped': stopped, 'failed': failed}
+        }
+    })
 
-    def cluster_start():
-        nonlocal started
-        started = True
 
-    def ensure(cb, tries=None, wait=None):
-        nonlocal _cb, _tries, _wait
-        _cb = cb
-        _tries = tries
-        _wait = wait
+def test_cluster_health(mocker):
+    cmd_run_m = mocker.patch.object(
+        hare, 'cmd_run', autospec=True,
+        return_value={'srvnode-1': hctl_status(online=(True, False))}
+    )
+
+    health = hare.cluster_health()
+    cmd_run_m.assert_called_once_with(
+        'hctl node status --full', targets=LOCAL_MINION
+    )
+    assert health.nodes == {'srvnode-1': True, 'srvnode-2': False}
+    assert not health.online
+    assert not health.healthy
+    assert not health.failed
+
+    cmd_run_m.return_value = {'srvnode-1': hctl_status(stopped=1)}
+    health = hare.cluster_health()
+    assert health.online
+    assert not health.healthy
+
+    cmd_run_m.return_value = {'srvnode-1': hctl_status()}
+    assert hare.cluster_health().healthy
+
+
+def test_wait_cluster_is_healthy(mocker):
+    sleep_m = mocker.patch.object(hare.time, 'sleep', autospec=True)
+    mocker.patch.object(
+        hare, 'cmd_run', autospec=True,
+        side_effect=[
+            SaltCmdResultError('cluster is not running'),
+            {'srvnode-1': hctl_status(online=(False, False))},
+            {'srvnode-1': hctl_status(stopped=2)},
+            {'srvnode-1': hctl_status()}
+        ]
+    )
+
+    stats = hare.wait_cluster_is_healthy(wait_min=1, wait_max=2)
+
+    assert stats.tries == 4
+    assert stats.health.healthy
+    delays = [_call[0][0] for _call in sleep_m.call_args_list]
+    assert len(delays) == 3
+    assert 0.9 <= delays[0] <= 1.1
+    assert 1.8 <= delays[1] <= 2.2
+    assert 1.8 <= delays[2] <= 2.2
+
+
+def test_wait_cluster_is_healthy_fails(mocker):
+    mocker.patch.object(hare.time, 'sleep', autospec=True)
+    cmd_run_m = mocker.patch.object(
+        hare, 'cmd_run', autospec=True,
+        return_value={'srvnode-1': hctl_status(failed=1)}
+    )
+
+    # failed resources stop waiting immediately
+    with pytest.raises(ClusterHealthWaitError) as excinfo:
+        hare.wait_cluster_is_healthy()
+    assert excinfo.value.health['resources_failed'] == 1
+    cmd_run_m.assert_called_once()
 
-    monkeypatch.setattr(hare, 'cluster_start', mock_fun_result(cluster_start))
-    monkeypatch.setattr(hare, 'ensure', mock_fun_result(ensure))
-    hare.ensure_cluster_is_started()
+    # deadline
+    cmd_run_m.return_value = {'srvnode-1': hctl_status(stopped=1)}
+    with pytest.raises(ClusterHealthWaitError) as excinfo:
+        hare.wait_cluster_is_healthy(timeout=0)
+    assert 'timeout' in str(excinfo.value)
 
-    assert started
-    assert _cb is hare.check_cluster_is_online
-    assert _tries == 30
-    assert _wait == 10
+    assert hare.wait_cluster_is_healthy(timeout=0, online_only=True).tries == 1
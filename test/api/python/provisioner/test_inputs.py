@@ -35,6 +35,7 @@ from provisioner.inputs import (
     AttrParserArgs,
     InputAttrParserArgs,
     PillarKeysList,
+    PillarItemsList,
     PillarInputBase,
     ParamsList,
     ParamGroupInputBase,
@@ -348,6 +349,44 @@ def test_inputs_PillarKeysList_fill_parser(param_spec_mocked):
     args = parser.parse_args([])
     assert args.args == []
 
+
+# ### PillarItemsList ###
+
+def test_inputs_PillarItemsList_from_args():
+    items = PillarItemsList.from_args(
+        {'1/2': 3, '4': [5]},
+        ('6', {'7': 8}),
+        ('9', 10, 'some.sls'),
+        '11/12="13"',
+        '14=["15", "16"]',
+        f'17={UNCHANGED}',
+        '{"18": 19}'
+    )
+    assert len(items) == 8
+    assert list(items.pillar_items()) == [
+        (PillarKey('1/2'), 3),
+        (PillarKey('4'), [5]),
+        (PillarKey('6'), {'7': 8}),
+        (PillarKey('9', 'some.sls'), 10),
+        (PillarKey('11/12'), '13'),
+        (PillarKey('14'), ['15', '16']),
+        (PillarKey('17'), UNCHANGED),
+        (PillarKey('18'), 19),
+    ]
+
+    with pytest.raises(ValueError):
+        PillarItemsList.from_args('1/2')
+
+    with pytest.raises(TypeError):
+        PillarItemsList.from_args(1)
+
+
+def test_inputs_PillarItemsList_fill_parser():
+    parser = argparse.ArgumentParser()
+    PillarItemsList.fill_parser(parser)
+    args = parser.parse_args(['1/2=3', '4="5"'])
+    assert args.args == ['1/2=3', '4="5"']
+
     args = parser.parse_args(
         '123 456'.split()
     )
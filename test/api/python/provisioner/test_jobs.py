@@ -0,0 +1,144 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+import os
+import time
+import pytest
+
+from provisioner.vendor import attr
+from provisioner import salt
+from provisioner.jobs import REDACTED
+from provisioner.errors import (
+    PrvsnrCmdNotFinishedError, PrvsnrCmdNotFoundError
+)
+
+
+def test_jobs_registry_add_get(jobs_registry):
+    assert jobs_registry.get('123') is None
+
+    record = jobs_registry.add('123', 'some-cmd', ['arg'], {'key': 'value'})
+    assert record.jid == '123'
+    assert not record.finished
+
+    assert jobs_registry.get('123') == record
+
+    record = jobs_registry.set_result('123', {'some-minion': 'some-res'})
+    assert record.finished
+    assert jobs_registry.get('123') == record
+    assert jobs_registry.get('123').result == {'some-minion': 'some-res'}
+
+    assert jobs_registry.set_result('456', 'some-res') is None
+
+
+def test_jobs_registry_permissions(jobs_registry):
+    jobs_registry.add('123', 'some-cmd')
+    assert jobs_registry.path.stat().st_mode & 0o777 == 0o700
+    assert jobs_registry._job_path('123').stat().st_mode & 0o777 == 0o600
+
+
+def test_jobs_registry_secrets_redacted(jobs_registry):
+    record = jobs_registry.add(
+        '123', 'create_user', ['someuser', 'somepasswd'], {}
+    )
+    assert record.args == ['someuser', REDACTED]
+
+    record = jobs_registry.add(
+        '124', 'pillar_set', [], {'keypath': 'some/key', 'value': 'secret'}
+    )
+    assert record.kwargs == {'keypath': 'some/key', 'value': REDACTED}
+
+    record = jobs_registry.add(
+        '125', 'pillar_set_bulk', ['{"some/key": "secret"}', 'other'], {}
+    )
+    assert record.args == [REDACTED, REDACTED]
+    assert 'secret' not in jobs_registry._job_path('125').read_text()
+
+
+def test_jobs_registry_invalid_jid(jobs_registry):
+    assert jobs_registry.add('../123', 'some-cmd') is None
+    assert jobs_registry.get('../123') is None
+
+
+def test_jobs_registry_prune(jobs_registry, monkeypatch):
+    monkeypatch.setattr(jobs_registry, 'max_jobs', 2)
+    now = time.time()
+    for jid in ('1', '2', '3'):
+        jobs_registry.add(jid, 'some-cmd')
+        path = jobs_registry._job_path(jid)
+        os.utime(str(path), (now - 10 + int(jid), now - 10 + int(jid)))
+    jobs_registry.prune()
+
+    assert jobs_registry.get('1') is None
+    assert jobs_registry.get('2') is not None
+    assert jobs_registry.get('3') is not None
+
+    monkeypatch.setattr(jobs_registry, 'max_age', 0)
+    jobs_registry.prune()
+    assert list(jobs_registry.path.glob('*.json')) == []
+
+
+def test_prvsnr_job_result_registry(mocker, jobs_registry):
+    job = salt.SaltJob(
+        jid='123', function='some-fun', arguments=[], minions=['some-minion'],
+        target='*'
+    )
+    print_job_m = mocker.patch.object(
+        salt.SaltJobsRunner, 'print_job', autospec=True, return_value=job
+    )
+    provisioner_jobs_m = mocker.patch.object(
+        salt.SaltJobsRunner, 'provisioner_jobs', autospec=True
+    )
+    process_m = mocker.patch.object(
+        salt, 'process_provisioner_cmd_res', autospec=True,
+        side_effect=lambda res: res
+    )
+    sleep_m = mocker.patch.object(salt.time, 'sleep', autospec=True)
+
+    jobs_registry.add('123', 'some-cmd')
+
+    with pytest.raises(PrvsnrCmdNotFinishedError):
+        salt.SaltJobsRunner.prvsnr_job_result('123')
+    sleep_m.assert_not_called()
+
+    # long-poll
+    finished = attr.evolve(job, result={
+        'some-minion': {'return': 'some-res', 'retcode': 0}
+    })
+    print_job_m.side_effect = [job, job, finished]
+    assert salt.SaltJobsRunner.prvsnr_job_result('123', timeout=60) == {
+        'some-minion': 'some-res'
+    }
+    assert sleep_m.call_count == 2
+    assert jobs_registry.get('123').finished
+
+    # finished jobs are resolved by the registry only
+    print_job_m.reset_mock()
+    assert salt.SaltJobsRunner.prvsnr_job_result('123') == {
+        'some-minion': 'some-res'
+    }
+    print_job_m.assert_not_called()
+    provisioner_jobs_m.assert_not_called()
+    assert process_m.call_count == 2
+
+
+def test_prvsnr_job_result_not_registered(mocker):
+    mocker.patch.object(
+        salt.SaltJobsRunner, 'provisioner_jobs', autospec=True,
+        return_value={}
+    )
+
+    with pytest.raises(PrvsnrCmdNotFoundError):
+        salt.SaltJobsRunner.prvsnr_job_result('123')
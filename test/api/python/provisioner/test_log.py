@@ -15,9 +15,11 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
 
+import io
 import pytest
 from copy import deepcopy
 import logging
+import threading
 
 from provisioner.vendor import attr
 from provisioner import (
@@ -460,6 +462,125 @@ def test_log_set_logging(
     ]
 
 
+def test_log_set_logging_queue(mocker, reset_logging_m, dictConfig_m):
+    start_m = mocker.patch.object(log, 'start_queue_logging', autospec=True)
+    config_m = mocker.patch.object(
+        log, 'queue_logging_config', autospec=True, return_value={}
+    )
+
+    log.set_logging()
+    start_m.assert_not_called()
+
+    config_m.return_value = {'enabled': True, 'size': 123}
+    log.set_logging()
+    start_m.assert_called_once_with(123)
+
+
+def test_log_set_logging_results(
+    mocker, reset_logging_m, dictConfig_m, results_spill
+):
+    config_m = mocker.patch.object(
+        log, 'results_logging_config', autospec=True, return_value={}
+    )
+
+    log.set_logging()
+    assert not results_spill.enabled
+    assert results_spill.keep == config.LOG_RESULTS_KEEP
+
+    config_m.return_value = {'enabled': True, 'keep': 3}
+    log.set_logging()
+    assert results_spill.enabled
+    assert results_spill.keep == 3
+
+
+@pytest.fixture
+def root_handler():
+    records = []
+
+    class _Handler(logging.Handler):
+        def emit(self, record):
+            records.append(record)
+
+    handler = _Handler(logging.INFO)
+    handler.records = records
+    root_handlers = logging.root.handlers[:]
+    try:
+        yield handler
+    finally:
+        log.stop_queue_logging()
+        logging.root.handlers[:] = root_handlers
+
+
+def test_log_queue_logging(root_handler):
+    # pytest adds its own handlers for a test call
+    logging.root.handlers[:] = [root_handler]
+    _logger = logging.getLogger('some.logger')
+    args = {'some': 'value'}
+
+    log.start_queue_logging()
+    assert root_handler not in logging.root.handlers
+    assert log._queue_logging.handler.level == logging.INFO
+
+    _logger.info("some message %s", args)
+    _logger.debug("not accepted")
+    args['some'] = 'changed'
+
+    log.stop_queue_logging()
+    assert root_handler in logging.root.handlers
+    assert log._queue_logging is None
+    assert [r.getMessage() for r in root_handler.records] == [
+        "some message {'some': 'value'}"
+    ]
+
+
+def test_log_queue_logging_lazy_args(mocker, root_handler):
+    formatting_handler = logging.StreamHandler(io.StringIO())
+    logging.root.handlers[:] = [root_handler, formatting_handler]
+    _logger = logging.getLogger('some.logger')
+    listener_thread = []
+
+    class SomeLazy:
+        def __str__(self):
+            listener_thread.append(threading.current_thread())
+            return 'some-res'
+
+    log.start_queue_logging()
+    _logger.info("some %s resulted in %s", 'fun', SomeLazy())
+    _logger.info("some %s", ('value', ['some']))
+
+    log.stop_queue_logging()
+    # formatted by the listener thread
+    assert listener_thread
+    assert listener_thread[0] is not threading.current_thread()
+    assert [r.args for r in root_handler.records] == [
+        ('fun', mocker.ANY), None
+    ]
+    assert formatting_handler.stream.getvalue().splitlines() == [
+        'some fun resulted in some-res', "some ('value', ['some'])"
+    ]
+
+
+def test_log_queue_logging_drops(root_handler):
+    # pytest adds its own handlers for a test call
+    logging.root.handlers[:] = [root_handler]
+    _logger = logging.getLogger('some.logger')
+
+    log.start_queue_logging(size=2)
+    queue_logging = log._queue_logging
+    # emulate a stuck listener
+    queue_logging.listener.stop()
+    for i in range(5):
+        _logger.info(f"message {i}")
+    assert queue_logging.handler.dropped == 3
+
+    queue_logging.listener.start()
+    log.stop_queue_logging()
+    assert [r.getMessage() for r in root_handler.records] == [
+        'message 0', 'message 1',
+        '3 log records were dropped due to the logging queue overflow'
+    ]
+
+
 def test_CommandFilter_filter():
     record = logging.makeLogRecord({})
     cmd = 'some-command'
@@ -0,0 +1,139 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+import os
+import json
+import stat
+import logging
+
+from provisioner import log_results, salt
+from provisioner.config import LOG_TRUNC_MSG_SIZE_MAX
+from provisioner.log_results import LazyResult
+
+
+class CountedRes(dict):
+    formatted = 0
+
+    def __str__(self):
+        type(self).formatted += 1
+        return super().__str__()
+
+
+def test_log_results_not_formatted_when_disabled(mocker, caplog):
+    CountedRes.formatted = 0
+    mocker.patch.object(
+        salt, '_salt_client_cmd', autospec=True,
+        return_value=CountedRes({'some-minion': 'some-ret'})
+    )
+
+    caplog.set_level(logging.INFO, logger=salt.__name__)
+    salt.function_run('some.fun', targets='some-minion')
+    assert CountedRes.formatted == 0
+
+    caplog.set_level(logging.DEBUG, logger=salt.__name__)
+    salt.function_run('some.fun', targets='some-minion')
+    assert CountedRes.formatted == 1
+    assert "resulted in {'some-minion': 'some-ret'}" in caplog.text
+
+
+def test_log_results_small_result(results_spill):
+    res = LazyResult({'some-minion': 'some-ret'})
+    assert str(res) == "{'some-minion': 'some-ret'}"
+    assert not results_spill.path_dir.exists()
+
+
+def test_log_results_big_result_not_spilled_by_default(results_spill):
+    text = str(LazyResult('x' * (LOG_TRUNC_MSG_SIZE_MAX + 1)))
+    assert text == log_results.LOG_TRUNC_MSG_TMPL.format(
+        'x' * LOG_TRUNC_MSG_SIZE_MAX
+    )
+    assert not results_spill.path_dir.exists()
+
+
+def test_log_results_big_result_spilled(results_spill):
+    results_spill.setup('some-cmd', enabled=True)
+    salt_res = {
+        'some-minion': {
+            'jid': '123', 'retcode': 0, 'ret': 'x' * LOG_TRUNC_MSG_SIZE_MAX
+        }
+    }
+    res = LazyResult(salt_res, fun='state.apply')
+
+    text = str(res)
+    assert text == (
+        log_results.LOG_TRUNC_MSG_TMPL.format(
+            str(salt_res)[:LOG_TRUNC_MSG_SIZE_MAX]
+        ) + f" (full result: {results_spill.path}, jid: 123)"
+    )
+    assert results_spill.path.name.startswith('some-cmd.')
+
+    # formatted once per record
+    assert str(res) == text
+    lines = results_spill.path.read_text().splitlines()
+    assert len(lines) == 1
+    record = json.loads(lines[0])
+    assert record['jid'] == '123'
+    assert record['fun'] == 'state.apply'
+    assert record['result'] == salt_res
+
+    # readable by the owner only
+    assert stat.S_IMODE(os.stat(str(results_spill.path_dir)).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(str(results_spill.path)).st_mode) == 0o600
+
+
+def test_log_results_spill_prune(results_spill):
+    results_spill.setup('some-cmd', enabled=True, keep=2)
+    results_spill.path_dir.mkdir(parents=True)
+    old_paths = []
+    for i in range(3):
+        path = results_spill.path_dir / f'other-cmd.{i}.results.jsonl'
+        path.write_text('')
+        os.utime(str(path), (i, i))
+        old_paths.append(path)
+    other_path = results_spill.path_dir / 'some.file'
+    other_path.write_text('')
+
+    results_spill.dump('some-res')
+    results_spill.dump('other-res')
+
+    assert sorted(results_spill.path_dir.iterdir()) == sorted([
+        old_paths[-1], other_path, results_spill.path
+    ])
+    assert len(results_spill.path.read_text().splitlines()) == 2
+
+
+def test_log_results_spill_fails(mocker, results_spill):
+    results_spill.setup(enabled=True)
+    mocker.patch.object(
+        results_spill, 'path_dir', results_spill.path_dir / 'file'
+    )
+    results_spill.path_dir.parent.mkdir(parents=True)
+    results_spill.path_dir.write_text('')
+
+    text = str(LazyResult('x' * (LOG_TRUNC_MSG_SIZE_MAX + 1)))
+    assert text == log_results.LOG_TRUNC_MSG_TMPL.format(
+        'x' * LOG_TRUNC_MSG_SIZE_MAX
+    )
+
+
+def test_log_results_jid():
+    assert log_results.result_jid('20201020123456') is None
+    assert log_results.result_jid({'jid': 123}) == '123'
+    assert log_results.result_jid(
+        {'some-minion': 'some-ret', 'other-minion': {'jid': '1'}}
+    ) == '1'
+    assert log_results.result_jid({'some-minion': 'some-ret'}) is None
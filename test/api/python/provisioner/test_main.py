@@ -284,6 +284,9 @@ def test_main_happy_path(
     )
 
     _main_m.return_value = ret
+    stop_queue_logging_m = mocker.patch.object(
+        __main__.log, 'stop_queue_logging', autospec=True
+    )
 
     __main__.main()
 
@@ -303,3 +306,4 @@ def test_main_happy_path(
         ])
 
     assert mock_manager.mock_calls == expected_calls
+    stop_queue_logging_m.assert_called_once_with()
@@ -0,0 +1,139 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+import pytest
+import urllib.request
+import urllib.error
+
+from provisioner import metrics, metrics_server, salt, utils, api
+from provisioner.salt import State
+
+
+def test_metrics_render():
+    registry = metrics.MetricsRegistry()
+    counter = registry.counter('some_total', 'some help', ('label',))
+    histogram = registry.histogram(
+        'some_seconds', 'other help', buckets=(1, 10)
+    )
+    # the same metric is returned for the same name
+    assert registry.counter('some_total', 'some help') is counter
+
+    counter.inc(label='some "value"')
+    counter.inc(2, label='some "value"')
+    histogram.observe(0.5)
+    histogram.observe(5)
+
+    assert registry.render() == (
+        '# HELP some_total some help\n'
+        '# TYPE some_total counter\n'
+        'some_total{label="some \\"value\\""} 3\n'
+        '# HELP some_seconds other help\n'
+        '# TYPE some_seconds histogram\n'
+        'some_seconds_bucket{le="1"} 1\n'
+        'some_seconds_bucket{le="10"} 2\n'
+        'some_seconds_bucket{le="+Inf"} 2\n'
+        'some_seconds_sum 5.5\n'
+        'some_seconds_count 2\n'
+    )
+
+
+def test_metrics_track():
+    with metrics.track(
+        metrics.api_calls, metrics.api_call_duration, cmd='some-cmd'
+    ):
+        pass
+
+    with pytest.raises(ValueError):
+        with metrics.track(
+            metrics.api_calls, metrics.api_call_duration, cmd='some-cmd'
+        ):
+            raise ValueError('some error')
+
+    assert metrics.api_calls.value(cmd='some-cmd', outcome='success') == 1
+    assert metrics.api_calls.value(cmd='some-cmd', outcome='failure') == 1
+    assert metrics.api_call_duration.value(cmd='some-cmd')[1] == 2
+
+
+def test_metrics_dump(tmpdir_function):
+    path = tmpdir_function / 'metrics' / 'provisioner.prom'
+    metrics.salt_calls.inc(fun='some.fun', outcome='success')
+
+    metrics.registry.dump(path)
+    assert (
+        'prvsnr_salt_calls_total{fun="some.fun",outcome="success"} 1'
+        in path.read_text().splitlines()
+    )
+    assert list(path.parent.iterdir()) == [path]
+
+
+def test_metrics_server():
+    server = metrics_server.MetricsServer(0)
+    server.start()
+    url = f'http://127.0.0.1:{server.server_address[1]}'
+    try:
+        metrics.pillar_refreshes.inc(deferred=True)
+        with urllib.request.urlopen(f'{url}/metrics') as resp:
+            assert resp.read().decode() == metrics.registry.render()
+
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            urllib.request.urlopen(f'{url}/other')
+        assert excinfo.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_metrics_updated_by_calls(mocker):
+    mocker.patch.object(
+        salt, '_salt_client_cmd', autospec=True,
+        return_value={'some-minion': {'some-task': {'duration': 1500}}}
+    )
+    mocker.patch.object(api, '_api', mocker.Mock())
+
+    api._api_call('some_cmd')
+    salt.states_apply(['some.state'], targets='some-minion')
+    salt.states_apply(
+        [State('other.state'), State('another.state')],
+        targets='some-minion', batch=True
+    )
+    utils.ensure(lambda: True, name='some-check')
+
+    assert metrics.api_calls.value(cmd='some_cmd', outcome='success') == 1
+    assert metrics.salt_calls.value(
+        fun='state.apply', outcome='success'
+    ) == 2
+    assert metrics.state_apply_duration.value(state='some.state')[1] == 1
+    # batched states durations are reported by salt
+    assert metrics.state_apply_duration.value(state='other.state') == (
+        1.5, 1
+    )
+    assert metrics.state_apply_duration.value(state='another.state') == (
+        0, 1
+    )
+    assert metrics.ensure_tries.value(
+        name='some-check', outcome='success'
+    ) == 1
+
+
+def test_metrics_states_durations():
+    assert salt.states_durations({
+        'some.state': {
+            'some-minion': {'task1': {'duration': 1000}, 'task2': {}},
+            'other-minion': {'task1': {'duration': 3000}},
+        },
+        'other.state': {'some-minion': 'rendering error'}
+    }) == {'some.state': 3, 'other.state': 0}
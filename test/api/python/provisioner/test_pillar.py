@@ -20,13 +20,15 @@ from copy import deepcopy
 from pathlib import Path
 
 from provisioner.utils import dump_yaml, load_yaml
+from provisioner.errors import SaltCmdResultError
 from provisioner.param import Param
+from provisioner.inputs import PillarInputBase
 from provisioner import (
     pillar, ALL_MINIONS, UNCHANGED, DEFAULT, MISSED, UNDEFINED
 )
 from provisioner.pillar import (
     KeyPath, PillarKeyAPI, PillarKey,
-    PillarEntry, PillarResolver, PillarUpdater
+    PillarEntry, PillarResolver, PillarUpdater, PillarCache
 )
 
 from .helper import mock_fun_echo
@@ -252,6 +254,127 @@ def test_pillar_resolver(test_pillar):
     }
 
 
+def test_pillar_resolver_targeted_get(mocker, test_pillar):
+    param1 = Param('some-param', ('1/2/3', 'aaa.sls'))
+    param3 = Param('some-param2', ('1/di_parent/8', 'aaa.sls'))
+
+    _iter = iter(test_pillar)
+    minion_id_1 = next(_iter)
+    minion_id_2 = next(_iter)
+
+    pillar_get_m = mocker.spy(pillar, 'pillar_get')
+
+    res = PillarResolver().get([param1, param3])
+    assert res == {
+        minion_id_1: {
+            param1: test_pillar[minion_id_1]['1']['2']['3'],
+            param3: MISSED
+        }, minion_id_2: {
+            param1: test_pillar[minion_id_2]['1']['2']['3'],
+            param3: test_pillar[minion_id_2]['1']['di_parent']['8']
+        }
+    }
+    pillar_get_m.assert_not_called()
+
+
+def test_pillar_resolver_subtrees_get(mocker, test_pillar):
+    param1 = Param('some-param', ('1/2', 'aaa.sls'))
+    param3 = Param('some-param2', ('1/di_parent/8', 'aaa.sls'))
+
+    _iter = iter(test_pillar)
+    minion_id_1 = next(_iter)
+    minion_id_2 = next(_iter)
+
+    pillar_keys_get_m = mocker.spy(pillar, 'pillar_keys_get')
+
+    expected = {
+        minion_id_1: {
+            param1: test_pillar[minion_id_1]['1']['2'],
+            param3: MISSED
+        }, minion_id_2: {
+            param1: test_pillar[minion_id_2]['1']['2'],
+            param3: test_pillar[minion_id_2]['1']['di_parent']['8']
+        }
+    }
+
+    res = PillarResolver(subtrees=True).get([param1, param3])
+    assert res == expected
+    pillar_keys_get_m.assert_not_called()
+
+    # falls back to pillar.item if custom module is not available
+    mocker.patch.object(
+        pillar, 'pillar_subtrees_get', autospec=True,
+        side_effect=SaltCmdResultError({}, 'not available')
+    )
+    res = PillarResolver(subtrees=True).get([param1, param3])
+    assert res == expected
+    pillar_keys_get_m.assert_called_once()
+
+
+def test_pillar_resolver_cache(mocker, test_pillar):
+    param1 = Param('some-param', ('1/2/3', 'aaa.sls'))
+
+    pillar_get_m = mocker.spy(pillar, 'pillar_get')
+    pillar_keys_get_m = mocker.spy(pillar, 'pillar_keys_get')
+    mocker.patch.object(pillar, 'pillar_refresh', autospec=True)
+
+    assert PillarResolver().pillar is test_pillar
+    # a copy of the snapshot
+    cached = PillarResolver().pillar
+    assert cached == test_pillar
+    assert cached is not test_pillar
+    assert pillar_get_m.call_count == 1
+
+    # cached snapshot is used for a query
+    PillarResolver().get([param1])
+    pillar_keys_get_m.assert_not_called()
+
+    # not shared between targets
+    minion_id = next(iter(test_pillar))
+    PillarResolver(targets=minion_id).pillar
+    assert pillar_get_m.call_count == 2
+
+    # cache bypassing
+    PillarResolver(use_cache=False).pillar
+    assert pillar_get_m.call_count == 3
+
+    PillarUpdater.refresh(minion_id)
+    assert pillar.pillar_cache.get(minion_id) is None
+    assert pillar.pillar_cache.get(ALL_MINIONS) is None
+
+    PillarResolver().pillar
+    assert pillar_get_m.call_count == 4
+
+
+def test_pillar_cache_ttl(mocker):
+    time_m = mocker.patch.object(pillar.time, 'monotonic', autospec=True)
+    time_m.return_value = 100
+
+    cache = PillarCache(ttl=10)
+    cache.set(ALL_MINIONS, {'some': 'pillar'})
+    cache.set('some-minion', {'some': 'pillar2'})
+
+    time_m.return_value = 110
+    assert cache.get(ALL_MINIONS) == {'some': 'pillar'}
+
+    time_m.return_value = 111
+    assert cache.get(ALL_MINIONS) is None
+
+    cache.invalidate()
+    assert cache.get('some-minion') is None
+
+
+def test_pillar_cache_copies():
+    cache = PillarCache()
+    data = {'some-minion': {'some': ['pillar']}}
+    cache.set(ALL_MINIONS, data)
+
+    data['some-minion']['some'].append('changed')
+    cache.get(ALL_MINIONS)['some-minion']['some'].append('changed')
+
+    assert cache.get(ALL_MINIONS) == {'some-minion': {'some': ['pillar']}}
+
+
 def test_pillar_updater_ensure_exists(tmpdir_function):
     pu = PillarUpdater()
 
@@ -453,3 +576,61 @@ def test_pillar_updater_component_pillar(monkeypatch, tmpdir_function):
     assert user_pillar_path.exists()
     assert [res.key for res in mock_res] == ['dump_yaml']
     assert mock_res[0].args_all == ((user_pillar_path, some_pillar), {})
+
+
+def test_pillar_updater_apply_deferred_refresh(mocker, pillar_dir):
+    pillar_refresh_m = mocker.patch.object(
+        pillar, 'pillar_refresh', autospec=True
+    )
+    mocker.patch.object(pillar, 'PILLAR_REFRESH_DEFERRED', True)
+
+    for value in (1, 2):
+        pillar_updater = PillarUpdater()
+        pillar_updater.update(PillarInputBase('1/2', value))
+        pillar_updater.apply()
+
+    pillar_refresh_m.assert_not_called()
+    assert pillar.pillar_refresher.pending == {ALL_MINIONS}
+    assert pillar.pillar_refresher.stats.requested == 2
+
+    mocker.patch.object(pillar, 'PILLAR_REFRESH_DEFERRED', False)
+    pillar_updater = PillarUpdater()
+    pillar_updater.update(PillarInputBase('1/2', 3))
+    pillar_updater.apply()
+    pillar_refresh_m.assert_called_once_with(targets=ALL_MINIONS)
+
+
+def test_pillar_updater_dump_changed_only(mocker, pillar_dir):
+    refresh_m = mocker.patch.object(PillarUpdater, 'refresh', autospec=True)
+    write_m = mocker.spy(pillar, 'write_text_atomic')
+
+    pillar_updater = PillarUpdater()
+    pillar_updater.update(
+        PillarInputBase('1/2', 3),
+        PillarInputBase('4/5', 6)
+    )
+    assert pillar_updater.apply() == [
+        pillar_dir / 'uu_1.sls', pillar_dir / 'uu_4.sls'
+    ]
+    assert refresh_m.call_count == 1
+    assert load_yaml(pillar_dir / 'uu_1.sls') == {'1': {'2': 3}}
+
+    # the same values
+    pillar_updater = PillarUpdater()
+    pillar_updater.update(
+        PillarInputBase('1/2', 3),
+        PillarInputBase('4/5', 7)
+    )
+    write_m.reset_mock()
+    assert pillar_updater.apply() == [pillar_dir / 'uu_4.sls']
+    write_m.assert_called_once()
+    assert refresh_m.call_count == 2
+
+    # nothing changed
+    assert pillar_updater.apply() == []
+    assert refresh_m.call_count == 2
+
+    # rollback restores the files
+    pillar_updater.rollback()
+    assert pillar_updater.apply() == [pillar_dir / 'uu_4.sls']
+    assert load_yaml(pillar_dir / 'uu_4.sls') == {'4': {'5': 6}}
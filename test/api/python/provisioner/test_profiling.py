@@ -0,0 +1,48 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+import sys
+import importlib
+
+from provisioner import profiling
+
+
+def test_import_profiler(monkeypatch, tmpdir_function):
+    pkg_dir = tmpdir_function / 'someprofiledpkg'
+    pkg_dir.mkdir()
+    (pkg_dir / '__init__.py').write_text('from . import mod1\n')
+    (pkg_dir / 'mod1.py').write_text('import time\ntime.sleep(0.01)\n')
+    monkeypatch.syspath_prepend(str(tmpdir_function))
+
+    profiler = profiling.ImportProfiler()
+    profiler.install()
+    try:
+        importlib.import_module('someprofiledpkg')
+    finally:
+        profiler.uninstall()
+        sys.modules.pop('someprofiledpkg', None)
+        sys.modules.pop('someprofiledpkg.mod1', None)
+
+    assert profiler not in sys.meta_path
+
+    pkg = profiler.timings['someprofiledpkg']
+    mod1 = profiler.timings['someprofiledpkg.mod1']
+    assert mod1.total >= 0.01
+    assert pkg.total >= mod1.total
+    assert pkg.self_time < mod1.total
+
+    report = profiler.report()
+    assert 'someprofiledpkg.mod1' in report
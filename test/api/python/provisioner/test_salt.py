@@ -17,13 +17,14 @@
 
 import pytest
 import functools
+import threading
 
 from provisioner import salt
 from provisioner.errors import (
     SaltCmdRunError, SaltNoReturnError, SaltCmdResultError,
-    ProvisionerError
+    ProvisionerError, YumRollbackError
 )
-from provisioner.config import LOCAL_MINION
+from provisioner.config import LOCAL_MINION, ALL_MINIONS
 from provisioner import UNCHANGED, MISSED
 
 
@@ -517,7 +518,7 @@ def test_salt_client_cmd(monkeypatch):  # noqa: C901 FIXME
     }
 
 
-def test_salt_function_run(monkeypatch, local_minion_id):
+def test_salt_function_run(mocker, monkeypatch, local_minion_id):
     _salt_client_cmd_args = []
 
     def _salt_client_cmd(*args, **kwargs):
@@ -550,6 +551,7 @@ def test_salt_function_run(monkeypatch, local_minion_id):
             dict(
                 fun_args=fun_args,
                 fun_kwargs=fun_kwargs,
+                span=mocker.ANY,
                 **kwargs
             )
         )
@@ -570,6 +572,7 @@ def test_salt_function_run(monkeypatch, local_minion_id):
             dict(
                 fun_args=fun_args,
                 fun_kwargs=fun_kwargs,
+                span=mocker.ANY,
                 **kwargs
             )
         )
@@ -605,6 +608,65 @@ def test_salt_pillar_get(monkeypatch):
     ]
 
 
+def test_salt_pillar_keys_get(monkeypatch):
+    function_run_args = []
+
+    def function_run(*args, **kwargs):
+        nonlocal function_run_args
+        function_run_args.append(
+            (args, kwargs)
+        )
+
+    monkeypatch.setattr(
+        salt, 'function_run', function_run
+    )
+
+    targets = 'some-targets'
+
+    salt.pillar_keys_get(
+        ['1/2', '3'], targets=targets, default='some-default'
+    )
+    assert function_run_args == [
+        (
+            ('pillar.item',),
+            dict(
+                fun_args=['1/2', '3'],
+                fun_kwargs=dict(
+                    delimiter='/', default='some-default', saltenv='base'
+                ),
+                targets=targets
+            )
+        )
+    ]
+
+
+def test_salt_pillar_subtrees_get(monkeypatch):
+    function_run_args = []
+
+    def function_run(*args, **kwargs):
+        nonlocal function_run_args
+        function_run_args.append(
+            (args, kwargs)
+        )
+
+    monkeypatch.setattr(
+        salt, 'function_run', function_run
+    )
+
+    targets = 'some-targets'
+
+    salt.pillar_subtrees_get(['1/2', '3'], targets=targets)
+    assert function_run_args == [
+        (
+            ('prvsnr_pillar.subtrees',),
+            dict(
+                fun_args=['1/2', '3'],
+                targets=targets
+            )
+        )
+    ]
+
+
 def test_salt_pillar_refresh(monkeypatch):
     function_run_args = []
 
@@ -837,6 +899,82 @@ def test_salt_states_apply(monkeypatch):
     ]
 
 
+def test_salt_states_apply_batch(monkeypatch):
+    function_run_args = []
+    function_run_res = {}
+
+    def function_run(*args, **kwargs):
+        nonlocal function_run_args
+        function_run_args.append(
+            (args, kwargs)
+        )
+        return function_run_res
+
+    monkeypatch.setattr(
+        salt, 'function_run', function_run
+    )
+
+    targets = 'some-targets'
+    states = ['state1', 'state1.sub', 'state2']
+
+    def _task(sls, run_num):
+        return {'__sls__': sls, '__run_num__': run_num, 'result': True}
+
+    function_run_res = {
+        'node1': {
+            'task1': _task('state1', 0),
+            'task2': _task('state1.sub', 1),
+            'task3': _task('state1.sub.install', 2),
+            'task4': _task('some.included', 3),
+            'task5': _task('state2.config', 4),
+        },
+        'node2': ['some rendering error']
+    }
+
+    ret = salt.states_apply(states, targets=targets, batch=True)
+    assert function_run_args == [
+        (
+            ('state.apply',),
+            dict(
+                fun_args=['state1,state1.sub,state2'],
+                fun_kwargs=dict(failhard=True),
+                targets=targets,
+            )
+        )
+    ]
+    assert ret == {
+        'state1': {
+            'node1': {'task1': _task('state1', 0)},
+            'node2': ['some rendering error']
+        },
+        'state1.sub': {
+            'node1': {
+                'task2': _task('state1.sub', 1),
+                'task3': _task('state1.sub.install', 2),
+                'task4': _task('some.included', 3)
+            },
+            'node2': ['some rendering error']
+        },
+        'state2': {
+            'node1': {'task5': _task('state2.config', 4)},
+            'node2': ['some rendering error']
+        },
+    }
+
+    # a single state is applied as usual
+    function_run_args = []
+    salt.states_apply(['state1'], targets=targets, batch=True)
+    assert function_run_args == [
+        (
+            ('state.apply',),
+            dict(
+                fun_args=['state1'],
+                targets=targets,
+            )
+        )
+    ]
+
+
 def test_salt_state_fun_execute(monkeypatch):
     function_run_args = []
 
@@ -875,3 +1013,186 @@ def test_salt_state_fun_execute(monkeypatch):
             )
         )
     ]
+
+
+def test_salt_ssh_client_control_options(mocker, tmpdir_function):
+    mocker.patch.object(
+        salt.SaltSSHClient, '__attrs_post_init__', autospec=True
+    )
+    run_m = mocker.patch.object(
+        salt.SaltClientBase, 'run', autospec=True
+    )
+    close_m = mocker.patch.object(
+        salt.ssh, 'close_control_masters', autospec=True
+    )
+    at_exit_m = mocker.patch.object(
+        salt.ssh, 'close_control_masters_at_exit', autospec=True
+    )
+    control_dir = tmpdir_function / 'cm'
+
+    client = salt.SaltSSHClient(ssh_options=['some-option'])
+    client.run('some-fun')
+    assert run_m.call_args[1]['ssh_options'] == ['some-option']
+    client.close()
+    close_m.assert_not_called()
+
+    client = salt.SaltSSHClient(
+        ssh_options=['some-option'], control_dir=control_dir,
+        control_persist=60
+    )
+    client.run('some-fun')
+    assert run_m.call_args[1]['ssh_options'] == [
+        'some-option'
+    ] + salt.ssh.control_options(control_dir, 60)
+    assert control_dir.is_dir()
+    at_exit_m.assert_called_with(control_dir)
+
+    # explicit control options are respected
+    client.run('some-fun', ssh_options=['ControlMaster=no'])
+    assert run_m.call_args[1]['ssh_options'] == ['ControlMaster=no']
+
+    client.close()
+    close_m.assert_called_once_with(control_dir)
+
+
+def test_salt_pillar_refresher(mocker):
+    salt_client_cmd_m = mocker.patch.object(
+        salt, '_salt_client_cmd', autospec=True, return_value={}
+    )
+    refresher = salt.pillar_refresher
+
+    refresher.request('some-minion')
+    refresher.request('some-minion')
+    refresher.request('other-minion')
+    assert refresher.pending == {'some-minion', 'other-minion'}
+
+    # pillar independent calls don't trigger a refresh
+    salt.function_run('test.ping')
+    assert salt_client_cmd_m.call_args_list == [
+        mocker.call(
+            ALL_MINIONS, 'test.ping', fun_args=None, fun_kwargs=None,
+            span=mocker.ANY
+        )
+    ]
+
+    salt_client_cmd_m.reset_mock()
+    salt.function_run('state.apply', fun_args=['some-state'])
+    assert salt_client_cmd_m.call_args_list == [
+        mocker.call(
+            'other-minion', 'saltutil.refresh_pillar',
+            fun_args=None, fun_kwargs=None, span=mocker.ANY
+        ),
+        mocker.call(
+            'some-minion', 'saltutil.refresh_pillar',
+            fun_args=None, fun_kwargs=None, span=mocker.ANY
+        ),
+        mocker.call(
+            ALL_MINIONS, 'state.apply',
+            fun_args=['some-state'], fun_kwargs=None,
+            span=mocker.ANY
+        )
+    ]
+    assert refresher.pending == set()
+    assert (
+        refresher.stats.requested, refresher.stats.issued,
+        refresher.stats.saved
+    ) == (3, 2, 1)
+
+    # all minions refresh covers any other
+    salt_client_cmd_m.reset_mock()
+    refresher.request('some-minion')
+    refresher.request(ALL_MINIONS)
+    refresher.flush()
+    salt_client_cmd_m.assert_called_once_with(
+        ALL_MINIONS, 'saltutil.refresh_pillar',
+        fun_args=None, fun_kwargs=None, span=mocker.ANY
+    )
+    refresher.flush()
+    salt_client_cmd_m.assert_called_once()
+
+    # an explicit refresh drops pending requests
+    salt_client_cmd_m.reset_mock()
+    refresher.request('some-minion')
+    salt.pillar_refresh()
+    assert refresher.pending == set()
+    salt_client_cmd_m.assert_called_once()
+    assert refresher.stats.saved == 3
+
+
+def test_salt_yum_rollback_parallel(mocker):
+    targets = ('srvnode-1', 'srvnode-2', 'srvnode-3')
+    # each rollback waits for all the others to start
+    barrier = threading.Barrier(len(targets), timeout=5)
+
+    def _cmd_run(cmd, targets):
+        barrier.wait()
+        if targets == 'srvnode-2':
+            raise SaltCmdResultError('some error')
+
+    cmd_run_m = mocker.patch.object(
+        salt, 'cmd_run', autospec=True, side_effect=_cmd_run
+    )
+
+    rb_manager = salt.YumRollbackManager(multiple_targets_ok=True)
+    rb_manager._last_txn_ids = {
+        target: str(i) for i, target in enumerate(targets)
+    }
+
+    with pytest.raises(YumRollbackError) as excinfo:
+        rb_manager._yum_rollback()
+
+    assert list(excinfo.value.reasons) == ['srvnode-2']
+    assert isinstance(
+        excinfo.value.reasons['srvnode-2'], SaltCmdResultError
+    )
+    assert sorted(rb_manager.rollback_done) == ['srvnode-1', 'srvnode-3']
+    assert excinfo.value.running == {}
+    assert sorted(rb_manager.rollback_done) == ['srvnode-1', 'srvnode-3']
+    assert sorted(cmd_run_m.call_args_list) == sorted(
+        mocker.call(
+            'yum history rollback -y {}'.format(i), targets=target
+        ) for i, target in enumerate(targets)
+    )
+
+
+def test_salt_yum_rollback_timeout(mocker):
+    targets = ('srvnode-1', 'srvnode-2', 'srvnode-3')
+    cmd = 'yum history rollback -y 1'
+    results = {
+        'srvnode-1': {'srvnode-1': {'return': 'done', 'retcode': 0}},
+        'srvnode-2': {},
+        'srvnode-3': {'srvnode-3': {'return': 'some error', 'retcode': 1}},
+    }
+
+    mocker.patch.object(
+        salt, 'cmd_run', autospec=True,
+        side_effect=lambda cmd, targets, nowait: 'jid-{}'.format(targets)
+    )
+    mocker.patch.object(
+        salt.SaltJobsRunner, 'print_job', autospec=True,
+        side_effect=lambda jid: salt.SaltJob(
+            jid, result=results[jid[len('jid-'):]]
+        )
+    )
+    mocker.patch.object(salt.time, 'sleep', autospec=True)
+
+    rb_manager = salt.YumRollbackManager(
+        multiple_targets_ok=True, rollback_timeout=0
+    )
+    rb_manager._last_txn_ids = {target: '1' for target in targets}
+
+    with pytest.raises(YumRollbackError) as excinfo:
+        rb_manager._yum_rollback()
+
+    assert rb_manager.rollback_done == ['srvnode-1']
+    assert excinfo.value.running == {'srvnode-2': 'jid-srvnode-2'}
+    assert list(excinfo.value.reasons) == ['srvnode-3']
+    assert excinfo.value.reasons['srvnode-3'].reason == {
+        'srvnode-3': 'some error'
+    }
+    assert str(excinfo.value).startswith(
+        "yum rollback failed on targets ['srvnode-3'],"
+        " yum rollback is still running on targets"
+        " srvnode-2 (jid jid-srvnode-2)"
+    )
+    salt.cmd_run.assert_any_call(cmd, targets='srvnode-2', nowait=True)
@@ -0,0 +1,166 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+import time
+import threading
+import pytest
+
+from provisioner import salt_minion
+
+
+@pytest.fixture
+def minion_presence(monkeypatch):
+    tracker = salt_minion.MinionPresenceTracker()
+    monkeypatch.setattr(salt_minion, 'minion_presence', tracker)
+    return tracker
+
+
+def test_minion_presence_events(minion_presence):
+    since = time.time()
+    targets = ['srvnode-1', 'srvnode-2']
+
+    minion_presence.on_event('salt/minion/srvnode-1/start', {})
+    minion_presence.on_event('salt/job/123/ret/srvnode-2', {})
+    assert not minion_presence.is_up(targets, since)
+
+    minion_presence.on_event('salt/auth', {'act': 'pend', 'id': 'srvnode-2'})
+    assert not minion_presence.is_up(targets, since)
+
+    minion_presence.on_event(
+        'salt/auth', {'act': 'accept', 'id': 'srvnode-2'}
+    )
+    assert minion_presence.is_up(targets, since)
+    assert not minion_presence.is_up(targets, time.time() + 1)
+
+    assert minion_presence.is_started(['srvnode-1'], since)
+    assert not minion_presence.is_started(targets, since)
+
+    minion_presence.on_event(
+        'salt/presence/present', {'present': ['srvnode-3']}
+    )
+    assert minion_presence.is_up(['srvnode-3'], since)
+
+    # the table is not trusted once the tracking is stopped
+    minion_presence.stop()
+    assert not minion_presence.is_up(['srvnode-3'], since)
+    assert not minion_presence.is_started(['srvnode-1'], since)
+
+
+def test_minion_presence_wait(minion_presence):
+    targets = ['srvnode-1']
+    since = time.time()
+
+    def check():
+        return minion_presence.is_up(targets, since)
+
+    assert not minion_presence.wait(check, 0.01)
+
+    timer = threading.Timer(
+        0.05, minion_presence.on_event, ('salt/minion/srvnode-1/start', {})
+    )
+    timer.start()
+    start = time.monotonic()
+    assert minion_presence.wait(check, 5)
+    assert time.monotonic() - start < 1
+    timer.join()
+
+
+def test_check_salt_minions_are_ready(mocker, minion_presence):
+    runner_m = mocker.patch.object(
+        salt_minion, 'runner_function_run', autospec=True,
+        return_value={'srvnode-1': True}
+    )
+    targets = ['srvnode-1']
+
+    since = time.time()
+
+    # falls back to the broadcast check
+    assert salt_minion.check_salt_minions_are_ready(targets, since)
+    runner_m.assert_called_once()
+
+    # immediate lookup
+    assert salt_minion.check_salt_minions_are_ready(targets, since)
+    runner_m.assert_called_once()
+
+    # the table is not trusted without the moment, so broadcast again
+    assert salt_minion.check_salt_minions_are_ready(targets)
+    assert runner_m.call_count == 2
+
+    # not seen since the moment, so broadcast again
+    assert salt_minion.check_salt_minions_are_ready(
+        targets, since=time.time() + 100
+    )
+    assert runner_m.call_count == 3
+
+    runner_m.return_value = {}
+    assert not salt_minion.check_salt_minions_are_ready(['srvnode-2'])
+
+
+def test_ensure_salt_minions_are_ready(mocker, minion_presence):
+    mocker.patch.object(
+        minion_presence, 'start', autospec=True, return_value=True
+    )
+    check_m = mocker.patch.object(
+        salt_minion, 'check_salt_minions_are_ready', autospec=True,
+        return_value=False
+    )
+    targets = ['srvnode-1']
+    since = time.time()
+
+    timer = threading.Timer(
+        0.05, minion_presence.on_event,
+        ('salt/auth', {'act': 'accept', 'id': 'srvnode-1'})
+    )
+    timer.start()
+    start = time.monotonic()
+    # wakes up on the minion event
+    salt_minion.ensure_salt_minions_are_ready(targets, since=since)
+    assert time.monotonic() - start < 1
+    check_m.assert_called_once_with(targets, since)
+    timer.join()
+
+
+def test_ensure_salt_minions_are_ready_stale(mocker, minion_presence):
+    mocker.patch.object(
+        minion_presence, 'start', autospec=True, return_value=True
+    )
+    mocker.patch.object(salt_minion, 'PRESENCE_WAIT', 0.05)
+    check_m = mocker.patch.object(
+        salt_minion, 'check_salt_minions_are_ready', autospec=True,
+        side_effect=[False, True]
+    )
+    targets = ['srvnode-1']
+    # seen before the call
+    minion_presence.update(targets)
+    minion_presence.seen['srvnode-1'] -= 10
+
+    salt_minion.ensure_salt_minions_are_ready(targets)
+    # the stale entry doesn't wake up the waiting
+    assert check_m.call_count == 2
+
+
+def test_check_salt_minions_restarted(mocker, minion_presence):
+    check_m = mocker.patch.object(
+        salt_minion, 'check_salt_minions_are_ready', autospec=True,
+        return_value=False
+    )
+    since = time.time()
+
+    assert not salt_minion.check_salt_minions_restarted(
+        {'srvnode-1': 123}, since
+    )
+    check_m.assert_called_once_with(['srvnode-1'], since)
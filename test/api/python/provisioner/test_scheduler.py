@@ -0,0 +1,135 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+import threading
+import pytest
+
+from provisioner import scheduler
+
+
+def test_scheduler_respects_requires():
+    calls = []
+    lock = threading.Lock()
+
+    def task(name):
+        def _task():
+            with lock:
+                calls.append(name)
+        return _task
+
+    sched = scheduler.DAGScheduler(max_workers=4)
+    sched.add('a', task('a'))
+    sched.add('b', task('b'), requires=['a'])
+    sched.add('c', task('c'), requires=['a'])
+    sched.add('d', task('d'), requires=['b', 'c'])
+
+    report = sched.run()
+
+    assert calls[0] == 'a'
+    assert set(calls[1:3]) == {'b', 'c'}
+    assert calls[3] == 'd'
+    assert set(report.timings) == {'a', 'b', 'c', 'd'}
+    assert report.critical_path[0] == 'a'
+    assert report.critical_path[-1] == 'd'
+    assert len(report.critical_path) == 3
+
+
+def test_scheduler_runs_independent_tasks_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    sched = scheduler.DAGScheduler(max_workers=2)
+    sched.add('a', barrier.wait)
+    sched.add('b', barrier.wait)
+
+    # would fail with BrokenBarrierError if run sequentially
+    sched.run()
+
+
+def test_scheduler_stops_on_failure():
+    calls = []
+
+    def fail():
+        raise RuntimeError('some error')
+
+    sched = scheduler.DAGScheduler(max_workers=1)
+    sched.add('a', fail)
+    sched.add('b', lambda: calls.append('b'), requires=['a'])
+
+    with pytest.raises(RuntimeError):
+        sched.run()
+
+    assert calls == []
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_scheduler_stops_ready_tasks_on_failure(max_workers):
+    calls = []
+    lock = threading.Lock()
+
+    def task(name, fail=False):
+        def _task():
+            with lock:
+                calls.append(name)
+            if fail:
+                raise RuntimeError('some error')
+        return _task
+
+    sched = scheduler.DAGScheduler(max_workers=max_workers)
+    sched.add('a', task('a', fail=True))
+    # keeps the other worker (if any) busy until 'a' fails
+    if max_workers > 1:
+        sched.add('b', lambda: threading.Event().wait(0.2))
+    for name in ('c', 'd', 'e'):
+        sched.add(name, task(name))
+
+    with pytest.raises(RuntimeError):
+        sched.run()
+
+    # independent ready tasks are not started after the failure
+    assert calls == ['a']
+
+
+def test_scheduler_sequential_order():
+    calls = []
+
+    sched = scheduler.DAGScheduler(max_workers=1)
+    sched.add('a', lambda: calls.append('a'))
+    sched.add('b', lambda: calls.append('b'), requires=['a'])
+    sched.add('c', lambda: calls.append('c'))
+    sched.add('d', lambda: calls.append('d'), requires=['b'])
+
+    sched.run()
+
+    # ready tasks are started in the declaration order
+    assert calls == ['a', 'b', 'c', 'd']
+
+
+def test_scheduler_validation():
+    sched = scheduler.DAGScheduler()
+    sched.add('a', lambda: None)
+
+    with pytest.raises(ValueError):
+        sched.add('a', lambda: None)
+
+    sched.add('b', lambda: None, requires=['unknown'])
+    with pytest.raises(ValueError):
+        sched.run()
+
+    sched = scheduler.DAGScheduler()
+    sched.add('a', lambda: None, requires=['b'])
+    sched.add('b', lambda: None, requires=['a'])
+    with pytest.raises(ValueError):
+        sched.run()
@@ -22,7 +22,7 @@ from provisioner.vendor import attr
 from provisioner.serialize import (
     PrvsnrType, dumps, loads, PRVSNR_TYPE_KEY
 )
-from provisioner import values
+from provisioner import values, serialize
 
 from provisioner.errors import (
     ProvisionerError, PrvsnrTypeDecodeError
@@ -185,3 +185,71 @@ def test_serialize_prvsnr_exception():
     exc2 = loads(dumps({'exc': exc1}))['exc']
     assert type(exc1) is type(exc2)
     assert exc1.args == exc2.args
+
+
+def test_serialize_types_cache(mocker):
+    import_module_m = mocker.patch.object(
+        serialize, 'import_module', autospec=True,
+        side_effect=serialize.import_module
+    )
+    mocker.patch.object(serialize, '_types', {})
+    data = dumps([SomePrvsnrClass1(1), SomePrvsnrClass1(2)])
+
+    assert loads(data) == [SomePrvsnrClass1(1), SomePrvsnrClass1(2)]
+    assert loads(data) == [SomePrvsnrClass1(1), SomePrvsnrClass1(2)]
+    import_module_m.assert_called_once_with(
+        'test.api.python.provisioner.test_serialize'
+    )
+
+    # registered types are not imported
+    import_module_m.reset_mock()
+    serialize.register_type(SomePrvsnrClass2)
+    assert loads(dumps(SomePrvsnrClass2(3, 4))) == SomePrvsnrClass2(3, 4)
+    import_module_m.assert_not_called()
+
+
+def test_serialize_plain_json_no_hook(mocker):
+    json_loads_m = mocker.patch.object(
+        serialize.json, 'loads', autospec=True,
+        side_effect=serialize.json.loads
+    )
+    data = {'some-minion': {'some-key': [1, 2, {'3': None}]}}
+
+    assert loads(json.dumps(data)) == data
+    assert 'object_hook' not in json_loads_m.call_args[1]
+
+    assert loads(dumps({'exc': ValueError(1)}))['exc'].args == (1,)
+    assert 'object_hook' in json_loads_m.call_args[1]
+
+
+@pytest.mark.skipif(serialize.msgpack is None, reason='msgpack is missed')
+def test_serialize_msgpack():
+    obj = {
+        'ret': {
+            'some-minion': [SomePrvsnrClass1(3, 4), SomePrvsnrClass2(3, 4)]
+        },
+        'exc': ProvisionerError(123),
+        'value': values.MISSED
+    }
+
+    data = serialize.packs(obj)
+    assert data.startswith(serialize.MSGPACK_FRAME_PREFIX)
+    assert '\n' not in data
+
+    # framed data is recognized by the common decoder
+    res = loads(data + '\n')
+    assert res['ret'] == obj['ret']
+    assert type(res['exc']) is ProvisionerError
+    assert res['exc'].args == (123,)
+    assert res['value'] is values.MISSED
+
+    dct = {"_prvsnr_type_": ["builtins", "SomeClass"], "args": [123]}
+    assert loads(serialize.packs(dct), strict=False) == dct
+    with pytest.raises(PrvsnrTypeDecodeError):
+        loads(serialize.packs(dct))
+
+
+def test_serialize_msgpack_missed(mocker):
+    mocker.patch.object(serialize, 'msgpack', None)
+    with pytest.raises(ValueError):
+        serialize.packs({})
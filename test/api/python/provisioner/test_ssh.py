@@ -1,64 +1,157 @@
-#
-# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
-#
-# This program is free software: you can redistribute it and/or modify
-# it under the terms of the GNU Affero General Public License as published
-# by the Free Software Foundation, either version 3 of the License, or
-# (at your option) any later version.
-# This program is distributed in the hope that it will be useful,
-# but WITHOUT ANY WARRANTY; without even the implied warranty of
-# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
-# GNU Affero General Public License for more details.
-# You should have received a copy of the GNU Affero General Public License
-# along with this program. If not, see <https://www.gnu.org/licenses/>.
-# For any questions about this software or licensing,
-# please email opensource@seagate.com or cortx-questions@seagate.com.
-#
-from provisioner import ssh
-
-
-def test_keygen_input_checks(mocker):
-    priv_key_path = 'some-path'
-    comment = 'some-comment'
-    passphrase = 'some-phrase'
-    cmd = 'ssh-keygen -t rsa -b 4096 -o -a 100'
-
-    run_m = mocker.patch.object(ssh, 'run_subprocess_cmd', autospec=True)
-
-    ssh.keygen(priv_key_path, comment=comment, passphrase=passphrase)
-    run_m.assert_called_with((cmd.split() + ['-C', comment, '-N', passphrase,
-                                             '-f', str(priv_key_path)]),
-                             input='y')
-
-
-def test_copy_id_input_checks(mocker):
-    host = 'some-host'
-    user = 'some-user'
-    port = 1234
-    priv_key_path = 'some-path'
-    ssh_options = ['option1', 'option2']
-    copy_id_cmd = 'ssh-copy-id'
-
-    run_m = mocker.patch.object(ssh, 'run_subprocess_cmd', autospec=True)
-
-    ssh.copy_id(host)
-    run_m.assert_called_with([copy_id_cmd, host])
-
-    ssh.copy_id(host, user)
-    run_m.assert_called_with([copy_id_cmd, str(user) + '@' + str(host)])
-
-    ssh.copy_id(host, force=True)
-    run_m.assert_called_with([copy_id_cmd, '-f', str(host)])
-
-    ssh.copy_id(host, priv_key_path=priv_key_path)
-    run_m.assert_called_with([copy_id_cmd, '-i', str(priv_key_path),
-                              str(host)])
-
-    ssh.copy_id(host, port=port)
-    run_m.assert_called_with([copy_id_cmd, '-p', str(port), str(host)])
-
-    ssh_options_lst = []
-    for opt in ssh_options:
-        ssh_options_lst.extend(['-o', opt])
-    ssh.copy_id(host, ssh_options=ssh_options)
-    run_m.assert_called_with([copy_id_cmd] + ssh_options_lst + [host])
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+import os
+import socket
+import pytest
+import tempfile
+from pathlib import Path
+
+from provisioner import ssh
+from provisioner.errors import ProvisionerError, SubprocessCmdError
+
+
+def test_keygen_input_checks(mocker):
+    priv_key_path = 'some-path'
+    comment = 'some-comment'
+    passphrase = 'some-phrase'
+    cmd = 'ssh-keygen -t rsa -b 4096 -o -a 100'
+
+    run_m = mocker.patch.object(ssh, 'run_subprocess_cmd', autospec=True)
+
+    ssh.keygen(priv_key_path, comment=comment, passphrase=passphrase)
+    run_m.assert_called_with((cmd.split() + ['-C', comment, '-N', passphrase,
+                                             '-f', str(priv_key_path)]),
+                             input='y')
+
+
+def test_copy_id_input_checks(mocker):
+    host = 'some-host'
+    user = 'some-user'
+    port = 1234
+    priv_key_path = 'some-path'
+    ssh_options = ['option1', 'option2']
+    copy_id_cmd = 'ssh-copy-id'
+
+    run_m = mocker.patch.object(ssh, 'run_subprocess_cmd', autospec=True)
+
+    ssh.copy_id(host)
+    run_m.assert_called_with([copy_id_cmd, host])
+
+    ssh.copy_id(host, user)
+    run_m.assert_called_with([copy_id_cmd, str(user) + '@' + str(host)])
+
+    ssh.copy_id(host, force=True)
+    run_m.assert_called_with([copy_id_cmd, '-f', str(host)])
+
+    ssh.copy_id(host, priv_key_path=priv_key_path)
+    run_m.assert_called_with([copy_id_cmd, '-i', str(priv_key_path),
+                              str(host)])
+
+    ssh.copy_id(host, port=port)
+    run_m.assert_called_with([copy_id_cmd, '-p', str(port), str(host)])
+
+    ssh_options_lst = []
+    for opt in ssh_options:
+        ssh_options_lst.extend(['-o', opt])
+    ssh.copy_id(host, ssh_options=ssh_options)
+    run_m.assert_called_with([copy_id_cmd] + ssh_options_lst + [host])
+
+
+def test_control_dir():
+    assert ssh.control_dir('/some/dir') == Path('/some/dir')
+
+    long_dir = Path('/some') / ('a' * ssh.CONTROL_DIR_PATH_MAX)
+    res = ssh.control_dir(long_dir)
+    assert len(str(res)) <= ssh.CONTROL_DIR_PATH_MAX
+    assert res == ssh.control_dir(long_dir)
+    assert res != ssh.control_dir(long_dir / 'b')
+
+
+def test_ensure_control_dir(tmpdir_function):
+    control_dir = tmpdir_function / 'cm'
+    assert ssh.ensure_control_dir(control_dir) == control_dir
+    assert control_dir.stat().st_mode & 0o777 == 0o700
+    # already existent one is accepted
+    ssh.ensure_control_dir(control_dir)
+
+    control_dir.chmod(0o755)
+    with pytest.raises(ProvisionerError):
+        ssh.ensure_control_dir(control_dir)
+
+    # e.g. a symlink pre-created by other user
+    link = tmpdir_function / 'link'
+    link.symlink_to(control_dir)
+    control_dir.chmod(0o700)
+    with pytest.raises(ProvisionerError):
+        ssh.ensure_control_dir(link)
+
+
+def test_ensure_control_dir_other_owner(mocker, tmpdir_function):
+    mocker.patch.object(
+        ssh.os, 'getuid', autospec=True, return_value=os.getuid() + 1
+    )
+    with pytest.raises(ProvisionerError):
+        ssh.ensure_control_dir(tmpdir_function / 'cm')
+
+
+def test_close_control_masters_at_exit(mocker, monkeypatch):
+    close_m = mocker.patch.object(
+        ssh, 'close_control_masters', autospec=True
+    )
+    monkeypatch.setattr(ssh, '_exit_control_dirs', set())
+
+    ssh.close_control_masters_at_exit('/some/dir')
+    ssh.close_control_masters_at_exit('/some/dir')
+    ssh._close_exit_control_masters()
+    close_m.assert_called_once_with(Path('/some/dir'))
+
+
+def test_control_options():
+    opts = ssh.control_options('/some/dir', 60)
+    assert opts == [
+        'ControlMaster=auto',
+        'ControlPath=/some/dir/%C',
+        'ControlPersist=60'
+    ]
+    assert all(ssh.is_control_option(opt) for opt in opts)
+    assert ssh.drop_control_options(
+        ['StrictHostKeyChecking=no'] + opts
+    ) == ['StrictHostKeyChecking=no']
+
+
+def test_close_control_masters(mocker, tmpdir_function):
+    run_m = mocker.patch.object(ssh, 'run_subprocess_cmd', autospec=True)
+
+    ssh.close_control_masters(tmpdir_function / 'absent')
+    run_m.assert_not_called()
+
+    # Note. pytest tmp dirs might exceed AF_UNIX path length limit
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sock_path = Path(tmpdir) / 'somehash'
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(str(sock_path))
+        (Path(tmpdir) / 'somefile').touch()
+
+        ssh.close_control_masters(tmpdir)
+        run_m.assert_called_once_with(
+            ['ssh', '-O', 'exit', '-S', str(sock_path), 'localhost']
+        )
+
+        run_m.side_effect = SubprocessCmdError('some-cmd', {}, 'some-error')
+        ssh.close_control_masters(tmpdir)
+        assert not sock_path.exists()
+        sock.close()
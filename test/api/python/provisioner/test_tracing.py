@@ -0,0 +1,161 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+import json
+import threading
+import pytest
+
+from provisioner import tracing, salt
+
+
+@pytest.fixture
+def trace_file(monkeypatch, tmpdir_function):
+    path = tmpdir_function / 'trace.jsonl'
+    monkeypatch.setattr(tracing.tracer, 'path', path)
+    return path
+
+
+def load_spans(path):
+    return {
+        span['name']: span
+        for span in map(json.loads, path.read_text().splitlines())
+    }
+
+
+def test_tracer_disabled():
+    tracer = tracing.Tracer()
+
+    with tracer.command('some-cmd'):
+        with tracer.span('some-span', some='attr') as span:
+            span.set(other='attr')
+
+    assert tracer.stats == {}
+    assert tracer.current() is None
+
+
+def test_tracer_nesting(trace_file):
+    tracer = tracing.tracer
+
+    def _run_in_thread():
+        with tracer.span('thread-span'):
+            pass
+
+    with pytest.raises(ValueError):
+        with tracer.command('some-cmd'):
+            with tracer.span('parent', fun='some.fun'):
+                with tracer.span('child') as span:
+                    span.set(some='attr')
+                thread = threading.Thread(target=_run_in_thread)
+                thread.start()
+                thread.join()
+            raise ValueError('some error')
+
+    spans = load_spans(trace_file)
+    assert set(spans) == {
+        'command.some-cmd', 'parent', 'child', 'thread-span'
+    }
+
+    root = spans['command.some-cmd']
+    assert root['parent_id'] is None
+    assert not root['success']
+    assert root['error'] == "ValueError('some error')"
+
+    assert spans['parent']['parent_id'] == root['span_id']
+    assert spans['parent']['success']
+    assert spans['child']['parent_id'] == spans['parent']['span_id']
+    assert spans['child']['attrs'] == {'some': 'attr'}
+    # spans of other threads are attached to the command
+    assert spans['thread-span']['parent_id'] == root['span_id']
+    assert len({span['trace_id'] for span in spans.values()}) == 1
+
+    assert tracer.stats['parent:some.fun'].count == 1
+    assert tracer.stats['command.some-cmd'].failed == 1
+    assert 'parent:some.fun' in tracer.summary()
+
+
+def test_tracer_commands(trace_file):
+    tracer = tracing.tracer
+
+    with tracer.command('some-cmd'):
+        with tracer.command('nested-cmd'):
+            with tracer.span('some-span'):
+                pass
+    trace_id = tracer.trace_id
+    assert set(tracer.stats) == {
+        'command.some-cmd', 'command.nested-cmd', 'some-span'
+    }
+
+    # the next command starts a new trace with its own stats
+    with tracer.command('other-cmd'):
+        pass
+    assert tracer.trace_id != trace_id
+    assert set(tracer.stats) == {'command.other-cmd'}
+
+    trace_ids = [
+        json.loads(line)['trace_id']
+        for line in trace_file.read_text().splitlines()
+    ]
+    assert trace_ids == [trace_id] * 3 + [tracer.trace_id]
+
+
+def test_tracer_salt_function_run(mocker, trace_file):
+    salt_res = {
+        'srvnode-1': {
+            'jid': '123', 'retcode': 0,
+            'ret': {
+                'state-1': {'result': True, 'duration': 1500},
+                'state-2': {'result': True, 'duration': 500}
+            }
+        }
+    }
+
+    class SomeClient:
+        def cmd(self, *args, **kwargs):
+            return salt_res
+
+    mocker.patch.object(salt, 'salt_local_client', return_value=SomeClient())
+
+    with tracing.tracer.command('some-cmd'):
+        salt.function_run('state.apply', fun_args=['some.state'])
+
+    span = load_spans(trace_file)['salt.local']
+    assert span['success']
+    assert span['attrs']['fun'] == 'state.apply'
+    assert span['attrs']['jid'] == '123'
+    assert span['attrs']['minions'] == {
+        'srvnode-1': {'retcode': 0, 'duration': 2}
+    }
+    assert span['attrs']['payload_size'] == len(json.dumps(salt_res))
+
+
+def test_tracer_salt_cmd_outside_wrapper(mocker, trace_file):
+    salt_res = {'srvnode-1': {'jid': '123', 'retcode': 0, 'ret': True}}
+
+    class SomeClient:
+        def cmd(self, *args, **kwargs):
+            return salt_res
+
+    mocker.patch.object(salt, 'salt_local_client', return_value=SomeClient())
+
+    # the attributes are set on the salt call spans only
+    with tracing.tracer.command('some-cmd'):
+        with tracing.tracer.span('some-span'):
+            salt._salt_client_cmd('*', 'some.fun')
+
+    spans = load_spans(trace_file)
+    assert spans['some-span']['attrs'] == {}
+    assert spans['command.some-cmd']['attrs'] == {}
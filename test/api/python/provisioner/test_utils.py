@@ -14,9 +14,13 @@
 # For any questions about this software or licensing,
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
+import time
 import pytest
+import asyncio
+import threading
 import subprocess
 import yaml
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 
 from provisioner import errors
 from provisioner import utils
@@ -53,7 +57,7 @@ def test_ensure(monkeypatch, patch_logging):
         utils.ensure(check_cb, tries=21, wait=3)
 
     assert ntries == 21
-    assert wait == 3
+    assert wait == pytest.approx(3, abs=0.1)
 
     def check_cb():
         nonlocal ntries
@@ -76,7 +80,7 @@ def test_ensure(monkeypatch, patch_logging):
         )
 
     assert ntries == 21
-    assert wait == 3
+    assert wait == pytest.approx(3, abs=0.1)
 
     wait = 0
     ntries = 0
@@ -86,7 +90,110 @@ def test_ensure(monkeypatch, patch_logging):
         )
 
     assert ntries == 21
-    assert wait == 3
+    assert wait == pytest.approx(3, abs=0.1)
+
+
+def test_ensure_backoff(mocker):
+    sleep_m = mocker.patch.object(utils.time, 'sleep', autospec=True)
+    check_cb = mocker.Mock(side_effect=[False] * 5 + [True])
+
+    stats = utils.ensure(
+        check_cb, tries=None, wait=1, backoff=2, wait_max=5
+    )
+
+    assert stats.tries == 6
+    assert stats.succeeded
+    delays = [_call[0][0] for _call in sleep_m.call_args_list]
+    assert delays == pytest.approx([1, 2, 4, 5, 5], abs=0.1)
+    assert stats.waited == pytest.approx(17, abs=0.5)
+
+
+def test_ensure_timeout(mocker):
+    with pytest.raises(errors.ProvisionerError) as excinfo:
+        utils.ensure(lambda: False, tries=None, wait=0.1, timeout=0.3)
+    assert str(excinfo.value) == 'timeout 0.3s is exceeded'
+
+    # the check time counts towards the wait interval
+    sleep_m = mocker.patch.object(utils.time, 'sleep', autospec=True)
+    with pytest.raises(errors.ProvisionerError):
+        utils.ensure(
+            lambda: threading.Event().wait(0.05), tries=2, wait=0.1
+        )
+    sleep_m.assert_called_once()
+    assert sleep_m.call_args[0][0] < 0.06
+
+    # per-try timeout
+    def check_cb():
+        threading.Event().wait(1)
+        return True
+
+    start = time.monotonic()
+    with pytest.raises(FuturesTimeoutError) as excinfo:
+        utils.ensure(check_cb, tries=2, wait=0, try_timeout=0.05)
+    assert str(excinfo.value) == 'no response in 0.05s'
+    assert time.monotonic() - start < 0.5
+
+
+def test_ensure_async(mocker):
+    _sleep = asyncio.sleep
+
+    async def sleep_side_effect(*args, **kwargs):
+        await _sleep(0)
+
+    sleep_m = mocker.patch.object(
+        asyncio, 'sleep', autospec=True,
+        side_effect=sleep_side_effect
+    )
+
+    ntries = 0
+
+    async def check_cb():
+        nonlocal ntries
+        ntries += 1
+        if ntries < 3:
+            raise TypeError('some error')
+        return True
+
+    loop = asyncio.new_event_loop()
+    stats = loop.run_until_complete(
+        utils.ensure_async(
+            check_cb, wait=1, backoff=3, expected_exc=TypeError
+        )
+    )
+    assert stats.tries == 3
+    assert stats.succeeded
+    assert [
+        _call[0][0] for _call in sleep_m.call_args_list
+    ] == pytest.approx([1, 3], abs=0.1)
+
+    # sync check callbacks are called in an executor
+    stats = loop.run_until_complete(utils.ensure_async(lambda: True))
+    assert stats.tries == 1
+
+    # timed out tries are retried
+    ntries = 0
+
+    async def slow_check_cb():
+        nonlocal ntries
+        ntries += 1
+        if ntries < 2:
+            await _sleep(1)
+        return True
+
+    stats = loop.run_until_complete(
+        utils.ensure_async(slow_check_cb, wait=0, try_timeout=0.05)
+    )
+    assert stats.tries == 2
+    assert stats.succeeded
+
+    with pytest.raises(FuturesTimeoutError) as excinfo:
+        loop.run_until_complete(
+            utils.ensure_async(
+                lambda: time.sleep(0.2), tries=1, try_timeout=0.05
+            )
+        )
+    assert str(excinfo.value) == 'no response in 0.05s'
+    loop.close()
 
 
 def test_run_subprocess_cmd_prepares_str(mocker):
@@ -201,7 +308,7 @@ def test_load_yaml_str_raises_exception(mocker, patch_logging):
     data = 'some-data'
 
     mocker.patch.object(
-        utils.yaml, 'safe_load',
+        utils.yaml, 'load',
         autospec=True, side_effect=yaml.YAMLError
     )
 
@@ -212,10 +319,10 @@ def test_load_yaml_str_raises_exception(mocker, patch_logging):
 def test_load_yaml_str_input_check(mocker):
     data = 'some-data'
 
-    run_m = mocker.patch.object(utils.yaml, 'safe_load', autospec=True)
+    run_m = mocker.patch.object(utils.yaml, 'load', autospec=True)
     utils.load_yaml_str(data)
 
-    run_m.assert_called_once_with(data)
+    run_m.assert_called_once_with(data, Loader=utils.YamlLoader)
 
 
 def test_load_yaml_str_output_check(mocker):
@@ -223,7 +330,7 @@ def test_load_yaml_str_output_check(mocker):
     out_data = 'some-out-data'
 
     mocker.patch.object(
-        utils.yaml, 'safe_load', autospec=True, return_value=out_data
+        utils.yaml, 'load', autospec=True, return_value=out_data
     )
 
     assert utils.load_yaml_str(in_data) == out_data
@@ -232,11 +339,13 @@ def test_load_yaml_str_output_check(mocker):
 def test_dump_yaml_str_input_check(mocker, dump_yaml_defaults):
     data = 'some-data'
 
-    run_m = mocker.patch.object(utils.yaml, 'safe_dump', autospec=True)
+    run_m = mocker.patch.object(utils.yaml, 'dump', autospec=True)
 
     utils.dump_yaml_str(data)
 
-    run_m.assert_called_once_with(data, **dump_yaml_defaults)
+    run_m.assert_called_once_with(
+        data, Dumper=utils.YamlDumper, **dump_yaml_defaults
+    )
 
 
 def test_dump_yaml_str_output_check(mocker):
@@ -244,7 +353,7 @@ def test_dump_yaml_str_output_check(mocker):
     out_data = 'some-out-data'
 
     mocker.patch.object(
-        utils.yaml, 'safe_dump', autospec=True, return_value=out_data
+        utils.yaml, 'dump', autospec=True, return_value=out_data
     )
 
     assert utils.dump_yaml_str(in_data) == out_data
@@ -252,45 +361,40 @@ def test_dump_yaml_str_output_check(mocker):
 
 def test_load_yaml_input_check(mocker):
     data_file = 'some-file'
-    data_file_content = 'some-file-content'
 
     path_m = mocker.patch.object(utils, 'Path', autospec=True)
-    path_m().read_text.return_value = data_file_content
+    stream = path_m().open.return_value.__enter__.return_value
     run_m = mocker.patch.object(utils, 'load_yaml_str', autospec=True)
 
-    utils.load_yaml(data_file)
-    run_m.assert_called_once_with(data_file_content)
+    utils.load_yaml(data_file, cached=False)
+    run_m.assert_called_once_with(stream)
 
 
 def test_load_yaml_output_check(mocker):
     out_data = 'some-out-data'
     data_file = 'some-file'
-    data_file_content = 'some-file-content'
 
-    path_m = mocker.patch.object(utils, 'Path', autospec=True)
-    path_m().read_text.return_value = data_file_content
+    mocker.patch.object(utils, 'Path', autospec=True)
 
     mocker.patch.object(
         utils, 'load_yaml_str', autospec=True, return_value=out_data
     )
 
-    assert utils.load_yaml(data_file) == out_data
+    assert utils.load_yaml(data_file, cached=False) == out_data
 
 
 @pytest.mark.patch_logging([(utils, ('error',))])
 def test_load_yaml_raises_exception(mocker, patch_logging):
     data_file = 'some-file'
-    data_file_content = 'some-file-content'
 
-    path_m = mocker.patch.object(utils, 'Path', autospec=True)
-    path_m().read_text.return_value = data_file_content
+    mocker.patch.object(utils, 'Path', autospec=True)
 
     mocker.patch.object(
         utils, 'load_yaml_str', autospec=True, side_effect=yaml.YAMLError
     )
 
     with pytest.raises(errors.BadPillarDataError):
-        utils.load_yaml(data_file)
+        utils.load_yaml(data_file, cached=False)
 
 
 def test_dump_yaml_input_check(mocker):
@@ -303,3 +407,57 @@ def test_dump_yaml_input_check(mocker):
 
     utils.dump_yaml(data_file, data_file_content)
     run_m.assert_called_once_with(data_file_content)
+
+
+def test_write_text_atomic(mocker, tmpdir_function):
+    path = tmpdir_function / 'some.sls'
+
+    utils.write_text_atomic(path, 'some-text')
+    assert path.read_text() == 'some-text'
+
+    path.chmod(0o600)
+    utils.write_text_atomic(path, 'other-text')
+    assert path.read_text() == 'other-text'
+    assert path.stat().st_mode & 0o777 == 0o600
+
+    # the original file is kept if the write fails
+    mocker.patch.object(
+        utils.os, 'replace', autospec=True, side_effect=OSError
+    )
+    with pytest.raises(OSError):
+        utils.write_text_atomic(path, 'new-text')
+    assert path.read_text() == 'other-text'
+    assert [p.name for p in tmpdir_function.iterdir()] == ['some.sls']
+
+
+def test_load_yaml_cached(mocker, tmpdir_function):
+    path = tmpdir_function / 'some.yaml'
+    path.write_text('1:\n    2: 3\n')
+
+    load_yaml_str_m = mocker.spy(utils, 'load_yaml_str')
+
+    data = utils.load_yaml(path)
+    assert data == {1: {2: 3}}
+    # callers get copies
+    data[1][2] = 4
+    assert utils.load_yaml(path) == {1: {2: 3}}
+    assert load_yaml_str_m.call_count == 1
+
+    path.write_text('1:\n    2: 33\n')
+    assert utils.load_yaml(path) == {1: {2: 33}}
+    assert load_yaml_str_m.call_count == 2
+
+    utils.load_yaml(path, cached=False)
+    assert load_yaml_str_m.call_count == 3
+
+
+def test_yaml_cache_maxsize(tmpdir_function):
+    cache = utils.YamlCache(maxsize=2)
+    for name in ('1', '2', '3'):
+        cache.set(tmpdir_function / name, ('some-key',), name)
+
+    assert cache.get(tmpdir_function / '1', ('some-key',)) is None
+    assert cache.get(tmpdir_function / '2', ('other-key',)) is None
+    assert cache.get(tmpdir_function / '3', ('some-key',)) == (
+        ('some-key',), '3'
+    )